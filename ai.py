@@ -25,6 +25,7 @@ try:
     from games.blueprints.ai_routes import ai_bp
     from games.blueprints.games_routes import games_bp
     from games.blueprints.translator_routes import translator_bp
+    from games.libraries import ner as ner_lib
 except Exception:
     # Fallback for direct script/module execution where package imports may not resolve
     from config.settings import Config
@@ -36,6 +37,7 @@ except Exception:
     from blueprints.ai_routes import ai_bp
     from blueprints.games_routes import games_bp
     from blueprints.translator_routes import translator_bp
+    from libraries import ner as ner_lib
 
 
 def create_app(config_class=Config):
@@ -76,7 +78,11 @@ def create_app(config_class=Config):
     # Health check endpoint
     @app.route('/health')
     def health_check():
-        return jsonify({'status': 'healthy', 'version': '2.0.0'})
+        return jsonify({
+            'status': 'healthy',
+            'version': '2.0.0',
+            'nlp_cache': ner_lib.cache_stats()
+        })
     
     # Error handlers
     @app.errorhandler(404)
@@ -8,19 +8,27 @@ from flask import Blueprint, request, jsonify, send_from_directory, current_app
 from werkzeug.utils import secure_filename
 try:
     from games.middleware.security import rate_limit, validate_json_required, sanitize_filename
+    from games.middleware.streaming import cache_enabled, stream_format, streaming_response
 
     ai_bp = Blueprint('ai', __name__, url_prefix='/')
 
     # Import AI functions
-    from games.chat import chat, generate_image, classify_image
+    from games.chat import chat, chat_stream, generate_image, classify_image
+    from games.chat import configure_model_cache, model_cache_stats, warm_up_models
+    from games.chat import configure_response_cache, response_cache_stats
+    from games.chat import SYSTEM_INSTRUCTIONS, configure_sessions, create_session, delete_session, get_session, session_chat, session_stats
     from games.genai_compat import genai as genai_module
 except Exception:
     from middleware.security import rate_limit, validate_json_required, sanitize_filename
+    from middleware.streaming import cache_enabled, stream_format, streaming_response
 
     ai_bp = Blueprint('ai', __name__, url_prefix='/')
 
     # Import AI functions (fallback)
-    from chat import chat, generate_image, classify_image
+    from chat import chat, chat_stream, generate_image, classify_image
+    from chat import configure_model_cache, model_cache_stats, warm_up_models
+    from chat import configure_response_cache, response_cache_stats
+    from chat import SYSTEM_INSTRUCTIONS, configure_sessions, create_session, delete_session, get_session, session_chat, session_stats
     from genai_compat import genai as genai_module
 
 # Allowed MIME types for additional security
@@ -31,6 +39,37 @@ ALLOWED_MIME_TYPES = {
     'image/webp': 'webp'
 }
 
+@ai_bp.record_once
+def _warm_up_chat_models(state):
+    """Build the persona model handles once so chat requests reuse them."""
+    configure_model_cache(state.app.config.get('CHAT_MODEL_CACHE_SIZE'))
+    try:
+        warm_up_models()
+    except Exception as e:
+        # models are built lazily on first use instead
+        state.app.logger.warning('Chat model warm-up failed: %s', e)
+
+@ai_bp.record_once
+def _configure_response_cache(state):
+    config = state.app.config
+    routes = config.get('CHAT_CACHE_ROUTES')
+    configure_response_cache(
+        max_entries=config.get('CHAT_CACHE_SIZE'),
+        ttl_seconds=config.get('CHAT_CACHE_TTL'),
+        disk_path=config.get('CHAT_CACHE_PATH'),
+        max_disk_mb=config.get('CHAT_CACHE_MAX_DISK_MB'),
+        routes=None if routes is None else [r.strip() for r in routes.split(',') if r.strip()],
+    )
+
+@ai_bp.record_once
+def _configure_sessions(state):
+    config = state.app.config
+    configure_sessions(
+        max_sessions=config.get('CHAT_SESSION_MAX'),
+        idle_seconds=config.get('CHAT_SESSION_IDLE_SECONDS'),
+        max_context_tokens=config.get('CHAT_SESSION_CONTEXT_TOKENS'),
+    )
+
 def allowed_file_extension(filename):
     """Check if file extension is allowed."""
     return '.' in filename and \
@@ -63,9 +102,81 @@ def chat_op():
     if custom_prompt and len(custom_prompt) > 2000:
         return jsonify({'status': 400, 'message': 'Custom prompt too long (max 2000 characters)'}), 400
     
-    resp = chat(text, character=character, custom_prompt=custom_prompt)
+    fmt = stream_format(data)
+    if fmt:
+        return streaming_response(chat_stream(text, character=character, custom_prompt=custom_prompt, use_cache=cache_enabled()), fmt)
+    
+    resp = chat(text, character=character, custom_prompt=custom_prompt, use_cache=cache_enabled())
     return jsonify({"reply": resp})
 
+@ai_bp.route('/chat/cache', methods=['GET'])
+@rate_limit(max_requests=300, window_seconds=3600)
+def chat_cache_stats():
+    """Report response-cache hit rates, saved upstream calls and latency for /chat and /classify_image."""
+    return jsonify({'status': 200, 'message': '', 'data': response_cache_stats()}), 200
+
+MAX_SESSION_MESSAGE_LENGTH = 8000
+
+@ai_bp.route('/chat/sessions', methods=['POST'])
+@rate_limit(max_requests=60, window_seconds=3600)
+def create_chat_session():
+    """Start a conversation; later messages only need the returned session_id."""
+    data = request.get_json(silent=True) or {}
+    character = data.get('character')
+    custom_prompt = data.get('custom_prompt')
+    if character is not None and character != 'custom' and character not in SYSTEM_INSTRUCTIONS:
+        return jsonify({'status': 400, 'message': f'Unknown character: {character}'}), 400
+    if character == 'custom' and not (isinstance(custom_prompt, str) and custom_prompt.strip()):
+        return jsonify({'status': 400, 'message': 'custom_prompt is required for the custom character'}), 400
+    if custom_prompt and len(custom_prompt) > 2000:
+        return jsonify({'status': 400, 'message': 'Custom prompt too long (max 2000 characters)'}), 400
+    max_tokens = data.get('max_context_tokens')
+    if max_tokens is not None and (not isinstance(max_tokens, int) or not 100 <= max_tokens <= 32000):
+        return jsonify({'status': 400, 'message': 'max_context_tokens must be an integer between 100 and 32000'}), 400
+
+    session = create_session(character, custom_prompt, max_tokens)
+    return jsonify({'status': 201, 'message': 'Session created', 'data': session.to_dict(include_turns=False)}), 201
+
+@ai_bp.route('/chat/sessions/<session_id>', methods=['GET'])
+@rate_limit(max_requests=300, window_seconds=3600)
+def get_chat_session(session_id):
+    session = get_session(session_id)
+    if session is None:
+        return jsonify({'status': 404, 'message': 'Session not found or expired'}), 404
+    with session.lock:
+        return jsonify({'status': 200, 'message': '', 'data': session.to_dict()}), 200
+
+@ai_bp.route('/chat/sessions/<session_id>', methods=['DELETE'])
+@rate_limit(max_requests=300, window_seconds=3600)
+def delete_chat_session(session_id):
+    if not delete_session(session_id):
+        return jsonify({'status': 404, 'message': 'Session not found or expired'}), 404
+    return jsonify({'status': 200, 'message': 'Session deleted'}), 200
+
+@ai_bp.route('/chat/sessions/<session_id>/messages', methods=['POST'])
+@validate_json_required
+@rate_limit(max_requests=60, window_seconds=3600)
+def post_chat_session_message(session_id):
+    data = request.get_json() or {}
+    text = data.get('text', '')
+    if not text or not isinstance(text, str):
+        return jsonify({'status': 400, 'message': 'Missing or empty text parameter'}), 400
+    if len(text) > MAX_SESSION_MESSAGE_LENGTH:
+        return jsonify({'status': 400, 'message': f'Message too long (max {MAX_SESSION_MESSAGE_LENGTH} characters)'}), 400
+    session = get_session(session_id)
+    if session is None:
+        return jsonify({'status': 404, 'message': 'Session not found or expired'}), 404
+    try:
+        result = session_chat(session, text)
+    except RuntimeError as e:
+        return jsonify({'status': 502, 'message': str(e)}), 502
+    return jsonify({'status': 200, 'message': '', 'data': result}), 200
+
+@ai_bp.route('/chat/sessions', methods=['GET'])
+@rate_limit(max_requests=300, window_seconds=3600)
+def chat_session_stats():
+    return jsonify({'status': 200, 'message': '', 'data': session_stats()}), 200
+
 @ai_bp.route('/image', methods=['POST'])
 @validate_json_required
 @rate_limit(max_requests=20, window_seconds=3600)
@@ -124,7 +235,7 @@ def classify_image_op():
             os.remove(filepath)
             return jsonify({"error": "Invalid file content type"}), 400
 
-        description = classify_image(prompt, filepath)
+        description = classify_image(prompt, filepath, use_cache=cache_enabled())
 
         # Clean up uploaded file immediately after processing
         try:
@@ -187,7 +298,10 @@ def get_provider():
         return jsonify({
             'provider': getattr(genai_compat_mod, '_sdk_name', None) or None,
             'provider_hint': os.getenv('GENAI_PROVIDER'),
-            'credential_source': getattr(genai_module, '_credential_source', lambda: None)()
+            'credential_source': getattr(genai_module, '_credential_source', lambda: None)(),
+            'pool': genai_compat_mod.pool_stats(),
+            'chain': genai_compat_mod.chain_stats(),
+            'chat_models': model_cache_stats(),
         })
     except Exception:
         return jsonify({'error': 'Could not determine provider state'}), 500
@@ -2,26 +2,31 @@
 API routes blueprint for NLP, Aksara, BMI, Morse code, and Quran API.
 Includes proper input validation and security measures.
 """
+import os
 from flask import Blueprint, request, jsonify
 import requests
 try:
-    from games.middleware.security import rate_limit, validate_json_required, validate_positive_number
+    from games.middleware.security import rate_limit, validate_json_required, validate_positive_number, validate_integer
+    from games.middleware.streaming import cache_enabled, stream_format, streaming_response
 
     api_bp = Blueprint('api', __name__, url_prefix='/')
 
     # Import library functions
     from games.libraries.ner import analyze_text, analyze_summarize, text_generator, analyze_sentiment
+    from games.libraries import ner as ner_lib
     from games.libraries.aksara_sunda import to_aksara_sunda
     from games.libraries.aksara_jawa import to_aksara_jawa
     from games.libraries.aksara_bali import to_aksara_bali
     from games.libraries.securities import decode_morse, encode_morse
 except Exception:
-    from middleware.security import rate_limit, validate_json_required, validate_positive_number
+    from middleware.security import rate_limit, validate_json_required, validate_positive_number, validate_integer
+    from middleware.streaming import cache_enabled, stream_format, streaming_response
 
     api_bp = Blueprint('api', __name__, url_prefix='/')
 
     # Import library functions (fallback)
     from libraries.ner import analyze_text, analyze_summarize, text_generator, analyze_sentiment
+    from libraries import ner as ner_lib
     from libraries.aksara_sunda import to_aksara_sunda
     from libraries.aksara_jawa import to_aksara_jawa
     from libraries.aksara_bali import to_aksara_bali
@@ -33,6 +38,36 @@ API_BASE_URL = "https://api.alquran.cloud/v1"
 api_session = requests.Session()
 api_session.headers.update({'User-Agent': 'FlaskApp/1.0'})
 
+@api_bp.record_once
+def _warm_up_nlp_models(state):
+    """Optionally preload NLP models in the background when the app starts."""
+    names = [n.strip() for n in state.app.config.get('NLP_WARMUP_MODELS', '').split(',') if n.strip()]
+    ner_lib.set_backend(state.app.config.get('NLP_BACKEND', 'torch'))
+    if names:
+        ner_lib.warm_up(names, background=True)
+    ner_lib.configure_cache(
+        max_entries=state.app.config.get('NLP_CACHE_SIZE'),
+        ttl_seconds=state.app.config.get('NLP_CACHE_TTL'),
+        disk_path=state.app.config.get('NLP_CACHE_PATH'),
+        max_disk_mb=state.app.config.get('NLP_CACHE_MAX_DISK_MB'),
+    )
+    ner_lib.configure_batching(
+        max_batch_size=state.app.config.get('NLP_BATCH_MAX_SIZE'),
+        max_wait_ms=state.app.config.get('NLP_BATCH_MAX_WAIT_MS'),
+    )
+
+@api_bp.route('/ner/models', methods=['GET'])
+@rate_limit(max_requests=300, window_seconds=3600)
+def ner_models():
+    """Report load state, load time and memory growth of the NLP models."""
+    return jsonify({'status': 200, 'message': '', 'data': ner_lib.model_stats()}), 200
+
+@api_bp.route('/ner/batching', methods=['GET'])
+@rate_limit(max_requests=300, window_seconds=3600)
+def ner_batching():
+    """Report throughput/latency metrics of the summarize/generate batchers."""
+    return jsonify({'status': 200, 'message': '', 'data': ner_lib.batching_stats()}), 200
+
 @api_bp.route('/ner/tagging', methods=['POST'])
 @validate_json_required
 @rate_limit(max_requests=100, window_seconds=3600)
@@ -49,7 +84,40 @@ def ner_tagging():
     if len(text) > 10000:
         return jsonify({'status': 400, 'message': 'Text too long (max 10000 characters)'}), 400
     
-    resp = analyze_text(text)
+    resp = analyze_text(text, use_cache=cache_enabled())
+    return jsonify(resp), resp.get('status', 200)
+
+@api_bp.route('/ner/tagging/batch', methods=['POST'])
+@validate_json_required
+@rate_limit(max_requests=50, window_seconds=3600)
+def ner_tagging_batch():
+    data = request.get_json()
+    if not data:
+        return jsonify({'status': 400, 'message': 'Invalid JSON'}), 400
+    
+    texts = data.get('texts')
+    if not texts or not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+        return jsonify({'status': 400, 'message': 'Missing or invalid texts parameter (list of strings)'}), 400
+    
+    if len(texts) > 1000:
+        return jsonify({'status': 400, 'message': 'Too many texts (max 1000)'}), 400
+    
+    if any(len(t) > 10000 for t in texts):
+        return jsonify({'status': 400, 'message': 'Text too long (max 10000 characters)'}), 400
+    
+    fields = data.get('fields', list(ner_lib.TAGGING_FIELDS))
+    if not isinstance(fields, list) or not fields or not all(isinstance(f, str) for f in fields):
+        return jsonify({'status': 400, 'message': 'Invalid fields parameter (non-empty list)'}), 400
+    
+    batch_size, error = validate_integer(data.get('batch_size', 64), 'batch_size', min_val=1, max_val=1000)
+    if error:
+        return jsonify({'status': 400, 'message': error}), 400
+    
+    n_process, error = validate_integer(data.get('n_process', 1), 'n_process', min_val=1, max_val=os.cpu_count() or 1)
+    if error:
+        return jsonify({'status': 400, 'message': error}), 400
+    
+    resp = ner_lib.analyze_text_batch(texts, fields=fields, batch_size=batch_size, n_process=n_process)
     return jsonify(resp), resp.get('status', 200)
 
 @api_bp.route('/ner/sentiment', methods=['POST'])
@@ -67,7 +135,32 @@ def ner_sentiment():
     if len(text) > 10000:
         return jsonify({'status': 400, 'message': 'Text too long (max 10000 characters)'}), 400
     
-    resp = analyze_sentiment(text)
+    resp = analyze_sentiment(text, use_cache=cache_enabled())
+    return jsonify(resp), resp.get('status', 200)
+
+@api_bp.route('/ner/sentiment/batch', methods=['POST'])
+@validate_json_required
+@rate_limit(max_requests=50, window_seconds=3600)
+def ner_sentiment_batch():
+    data = request.get_json()
+    if not data:
+        return jsonify({'status': 400, 'message': 'Invalid JSON'}), 400
+    
+    texts = data.get('texts')
+    if not texts or not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+        return jsonify({'status': 400, 'message': 'Missing or invalid texts parameter (list of strings)'}), 400
+    
+    if len(texts) > 10000:
+        return jsonify({'status': 400, 'message': 'Too many texts (max 10000)'}), 400
+    
+    if sum(len(t) for t in texts) > 1000000:
+        return jsonify({'status': 400, 'message': 'Batch too large (max 1000000 characters in total)'}), 400
+    
+    resp = ner_lib.analyze_sentiment_batch(
+        texts,
+        split=bool(data.get('split_sentences', False)),
+        include_sentences=bool(data.get('include_sentences', False)),
+    )
     return jsonify(resp), resp.get('status', 200)
 
 @api_bp.route('/ner/summarize', methods=['POST'])
@@ -85,7 +178,27 @@ def ner_summarize():
     if len(text) > 50000:
         return jsonify({'status': 400, 'message': 'Text too long (max 50000 characters)'}), 400
     
-    resp = analyze_summarize(text)
+    # Map-reduce settings for texts longer than the model's input window
+    chunk_tokens, error = validate_integer(data.get('chunk_tokens', 1000), 'chunk_tokens', min_val=64, max_val=1024)
+    if error:
+        return jsonify({'status': 400, 'message': error}), 400
+    
+    overlap, error = validate_integer(data.get('overlap', 64), 'overlap', min_val=0, max_val=512)
+    if error:
+        return jsonify({'status': 400, 'message': error}), 400
+    
+    batch_size, error = validate_integer(data.get('batch_size', 4), 'batch_size', min_val=1, max_val=16)
+    if error:
+        return jsonify({'status': 400, 'message': error}), 400
+    
+    fmt = stream_format(data)
+    if fmt:
+        return streaming_response(
+            ner_lib.iter_summarize_long(text, chunk_tokens=chunk_tokens, overlap=overlap, batch_size=batch_size),
+            fmt
+        )
+    
+    resp = analyze_summarize(text, chunk_tokens=chunk_tokens, overlap=overlap, batch_size=batch_size, use_cache=cache_enabled())
     return jsonify(resp), resp.get('status', 200)
 
 @api_bp.route('/ner/generator', methods=['POST'])
@@ -103,6 +216,10 @@ def ner_generator():
     if len(text) > 5000:
         return jsonify({'status': 400, 'message': 'Text too long (max 5000 characters)'}), 400
     
+    fmt = stream_format(data)
+    if fmt:
+        return streaming_response(ner_lib.stream_text_generator(text), fmt)
+    
     resp = text_generator(text)
     return jsonify(resp), resp.get('status', 200)
 
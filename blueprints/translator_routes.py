@@ -1,9 +1,40 @@
-from flask import Blueprint, request, jsonify
-import os
+import csv
+import json
+import re
+import shutil
+import tempfile
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+try:
+    from games.libraries import translator_models
+    from games.middleware.security import rate_limit
+except Exception:
+    from libraries import translator_models
+    from middleware.security import rate_limit
 
 translator_bp = Blueprint('translator', __name__, url_prefix='/translator')
 
 
+@translator_bp.record_once
+def _warm_up_translator_models(state):
+    """Load the seq2seq models in the background so the first request is fast."""
+    targets = [t.strip() for t in state.app.config.get('TRANSLATOR_WARMUP_TARGETS', '').split(',') if t.strip()]
+    if targets:
+        translator_models.warm_up(targets)
+
+
+@translator_bp.record_once
+def _load_translator_scripts(state):
+    """Resolve built-in and plugin scripts once, before the first request."""
+    try:
+        from games.libraries import aksara_engine, translator
+    except Exception:
+        from libraries import aksara_engine, translator
+    translator.load_scripts()
+    size = state.app.config.get('TRANSLATOR_WORD_CACHE_SIZE')
+    if size is not None:
+        aksara_engine.configure_word_cache(size)
+
+
 @translator_bp.route('/translate', methods=['POST'])
 def translate_endpoint():
     data = request.get_json(force=True)
@@ -18,21 +49,174 @@ def translate_endpoint():
     except Exception:
         from libraries import translator
 
-    model_path = os.path.join('models', 'translator.h5')
-    toks_path = os.path.join('models', 'tokenizers.pkl')
-    # If model exists, attempt model-based inference
-    if os.path.exists(model_path) and os.path.exists(toks_path):
-        try:
+    # If a model exists, attempt model-based inference (cached per process)
+    try:
+        resources = translator_models.get_resources(target)
+        if resources is not None:
             try:
-                from games.scripts.infer_translator import load_resources, greedy_decode
+                from games.scripts.infer_translator import greedy_decode
             except Exception:
-                from scripts.infer_translator import load_resources, greedy_decode
-            model, toks = load_resources(model_path, toks_path)
+                from scripts.infer_translator import greedy_decode
+            model, toks = resources
             out = greedy_decode(model, toks, text)
             return jsonify({'status': 200, 'target': target, 'input': text, 'output': out})
-        except Exception:
-            pass
+    except Exception:
+        pass
 
     # Fallback to rule-based translator
     out = translator.translate_to_script(target, text)
     return jsonify({'status': 200, 'target': target, 'input': text, 'output': out})
+
+
+@translator_bp.route('/models', methods=['GET'])
+def translator_models_endpoint():
+    """Report which translator models are cached in this process."""
+    return jsonify({'status': 200, 'data': translator_models.cache_stats()})
+
+
+@translator_bp.route('/scripts', methods=['GET'])
+def translator_scripts_endpoint():
+    """List the scripts the rule-based translator can convert to (and from)."""
+    try:
+        from games.libraries import translator
+    except Exception:
+        from libraries import translator
+    return jsonify({'status': 200, 'data': translator.script_info()})
+
+
+@translator_bp.route('/cache', methods=['GET'])
+def translator_cache_endpoint():
+    """Word cache size and hit rate per aksara script."""
+    try:
+        from games.libraries import aksara_engine
+    except Exception:
+        from libraries import aksara_engine
+    return jsonify({'status': 200, 'data': aksara_engine.word_cache_stats()})
+
+
+MAX_BATCH_LINE_LENGTH = 5000
+
+
+def _iter_uploaded_texts(name, stream):
+    """Yield texts from an uploaded file without reading it all into memory.
+
+    `.csv` files use the `text` column (or the first column), `.ndjson` /
+    `.jsonl` lines may be JSON strings or objects with a `text` key, and any
+    other file is read as one text per line.
+    """
+    name = (name or '').lower()
+    lines = (raw.decode('utf-8', errors='replace') for raw in stream)
+    if name.endswith('.csv'):
+        reader = csv.DictReader(lines)
+        column = 'text' if reader.fieldnames and 'text' in reader.fieldnames else (reader.fieldnames or [None])[0]
+        for row in reader:
+            yield row.get(column)
+    elif name.endswith(('.ndjson', '.jsonl')):
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                obj = json.loads(line)
+            except ValueError:
+                yield None
+                continue
+            yield obj.get('text') if isinstance(obj, dict) else obj
+    else:
+        for line in lines:
+            line = line.rstrip('\r\n')
+            if line:
+                yield line
+
+
+@translator_bp.route('/batch', methods=['POST'])
+@rate_limit(max_requests=50, window_seconds=3600)
+def translate_batch_endpoint():
+    """Transliterate many texts in one request, streaming NDJSON results.
+
+    Accepts either JSON `{"target": ..., "texts": [...]}` or a multipart
+    upload (`file` plus a `target` form field) of NDJSON, CSV or plain text.
+    Each output line is `{"index", "input", "output"}` or `{"index", "error"}`.
+    """
+    if request.is_json:
+        data = request.get_json(silent=True) or {}
+        target = data.get('target')
+        texts = data.get('texts')
+        if not isinstance(texts, list):
+            return jsonify({'status': 400, 'message': 'texts must be a list of strings'}), 400
+    elif 'file' in request.files:
+        target = request.form.get('target')
+        texts = None
+    else:
+        return jsonify({'status': 400, 'message': 'Provide JSON texts or an uploaded file'}), 400
+
+    if not isinstance(target, str) or not re.fullmatch(r'[a-z_]+', target.lower()):
+        return jsonify({'status': 400, 'message': 'Missing or invalid target parameter'}), 400
+
+    if texts is None:
+        upload = request.files['file']
+        # the request's own file is closed once the view returns, so keep a
+        # private spooled copy for the streaming generator
+        spool = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+        shutil.copyfileobj(upload.stream, spool)
+        spool.seek(0)
+        texts = _iter_uploaded_texts(upload.filename, spool)
+
+    try:
+        from games.libraries import translator
+    except Exception:
+        from libraries import translator
+
+    def generate():
+        try:
+            for index, text in enumerate(texts):
+                if not isinstance(text, str):
+                    record = {'index': index, 'error': 'invalid text'}
+                elif len(text) > MAX_BATCH_LINE_LENGTH:
+                    record = {'index': index, 'error': f'text too long (max {MAX_BATCH_LINE_LENGTH} characters)'}
+                else:
+                    try:
+                        record = {'index': index, 'input': text, 'output': translator.translate_to_script(target, text)}
+                    except Exception as e:
+                        record = {'index': index, 'error': str(e)}
+                yield json.dumps(record, ensure_ascii=False) + '\n'
+        finally:
+            if not isinstance(texts, list):
+                texts.close()
+                spool.close()
+
+    resp = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    resp.headers['X-Accel-Buffering'] = 'no'
+    return resp
+
+
+MAX_REVERSE_TEXTS = 1000
+
+
+@translator_bp.route('/reverse', methods=['POST'])
+@rate_limit(max_requests=200, window_seconds=3600)
+def reverse_endpoint():
+    """Convert aksara (or Morse) back to Latin.
+
+    Accepts `{"script": ..., "text": ...}` or `{"script": ..., "texts": [...]}`
+    with up to MAX_REVERSE_TEXTS entries.
+    """
+    data = request.get_json(silent=True) or {}
+    script = data.get('script')
+    if not isinstance(script, str) or not re.fullmatch(r'[a-z_]+', script.lower()):
+        return jsonify({'status': 400, 'message': 'Missing or invalid script parameter'}), 400
+    single = 'texts' not in data
+    texts = [data.get('text')] if single else data.get('texts')
+    if not isinstance(texts, list) or not texts or len(texts) > MAX_REVERSE_TEXTS:
+        return jsonify({'status': 400, 'message': f'Provide text or a list of 1-{MAX_REVERSE_TEXTS} texts'}), 400
+    if not all(isinstance(t, str) and len(t) <= MAX_BATCH_LINE_LENGTH for t in texts):
+        return jsonify({'status': 400, 'message': f'Each text must be a string of at most {MAX_BATCH_LINE_LENGTH} characters'}), 400
+
+    try:
+        from games.libraries import translator
+    except Exception:
+        from libraries import translator
+
+    outputs = [translator.translate_from_script(script, t) for t in texts]
+    if single:
+        return jsonify({'status': 200, 'script': script, 'input': texts[0], 'output': outputs[0]})
+    return jsonify({'status': 200, 'script': script, 'data': [{'input': t, 'output': o} for t, o in zip(texts, outputs)]})
@@ -1,10 +1,21 @@
 from genai_compat import genai
 
+import collections
+import hashlib
 import os
+import threading
+import time
 from dotenv import load_dotenv
 import PIL.Image
 import io
 
+try:
+  from games.libraries.chat_sessions import SessionStore, estimate_tokens
+  from games.libraries.result_cache import ResultCache, make_key, normalize_text
+except Exception:
+  from libraries.chat_sessions import SessionStore, estimate_tokens
+  from libraries.result_cache import ResultCache, make_key, normalize_text
+
 load_dotenv()
 api_key = os.getenv("GOOGLE_API_KEY")
 
@@ -14,80 +25,358 @@ except Exception:
   # ignore configure errors to preserve compatibility
   pass
 
-def chat(text, character=None, custom_prompt=None):
-  try:
-    # Character system instructions mapping
-    system_instructions = {
-        'gandalf': "You are Gandalf the Grey, a wise wizard from Middle-earth. Respond to the user with profound wisdom, mystical magic reference, poetic fantasy tones, and occasional friendly warnings. Keep your sentences atmospheric and magical. Always speak in character.",
-        'jarvis': "You are JARVIS, a highly sophisticated AI butler. Respond with absolute politeness, clean cyber and technology terminology, address the user as 'Sir' or 'Ma'am', and maintain a helpful, futuristic, and sleek intelligence-system persona. Always stay in character.",
-        'sherlock': "You are Sherlock Holmes, the brilliant Victorian consulting detective. Respond with razor-sharp analytical deduction, keen observation of minute details, classy British politeness, and intellectual eccentricity. Always stay in character.",
-        'ramsay': "You are Gordon Ramsay, the energetic, high-octane celebrity chef. Respond with intense passion, dramatic kitchen/cooking metaphors, clean but dramatic exclamation marks, and hilarious but constructive critiques of user statements. Always stay in character."
+# Character system instructions mapping
+SYSTEM_INSTRUCTIONS = {
+    'gandalf': "You are Gandalf the Grey, a wise wizard from Middle-earth. Respond to the user with profound wisdom, mystical magic reference, poetic fantasy tones, and occasional friendly warnings. Keep your sentences atmospheric and magical. Always speak in character.",
+    'jarvis': "You are JARVIS, a highly sophisticated AI butler. Respond with absolute politeness, clean cyber and technology terminology, address the user as 'Sir' or 'Ma'am', and maintain a helpful, futuristic, and sleek intelligence-system persona. Always stay in character.",
+    'sherlock': "You are Sherlock Holmes, the brilliant Victorian consulting detective. Respond with razor-sharp analytical deduction, keen observation of minute details, classy British politeness, and intellectual eccentricity. Always stay in character.",
+    'ramsay': "You are Gordon Ramsay, the energetic, high-octane celebrity chef. Respond with intense passion, dramatic kitchen/cooking metaphors, clean but dramatic exclamation marks, and hilarious but constructive critiques of user statements. Always stay in character."
+}
+
+CHAT_MODEL = 'gemini-2.5-flash'
+VISION_MODEL = 'gemini-2.5-flash'
+IMAGE_MODEL = 'gemini-2.5-pro'
+
+# Model handles are reused across requests, keyed by (provider, model name,
+# instruction hash). Built-in personas and the plain models are kept for the
+# life of the process; custom prompts share a bounded LRU.
+CHAT_MODEL_CACHE_SIZE = int(os.getenv('CHAT_MODEL_CACHE_SIZE', '128'))
+
+_models_lock = threading.Lock()
+_pinned_models = {}
+_custom_models = collections.OrderedDict()
+_model_cache_size = CHAT_MODEL_CACHE_SIZE
+_model_counts = {'hits': 0, 'misses': 0, 'evictions': 0}
+_BUILTIN_INSTRUCTIONS = frozenset(SYSTEM_INSTRUCTIONS.values())
+
+def _model_key(model_name, instruction):
+  digest = hashlib.sha256(instruction.encode('utf-8')).hexdigest() if instruction else None
+  return (getattr(genai, '_sdk_name', None), model_name, digest)
+
+def _build_model(model_name, instruction):
+  if instruction:
+    return genai.GenerativeModel(model_name, system_instruction=instruction)
+  return genai.GenerativeModel(model_name)
+
+def get_model(model_name, instruction=None):
+  """Return a shared GenerativeModel for `model_name` and `instruction`."""
+  key = _model_key(model_name, instruction)
+  pinned = not instruction or instruction in _BUILTIN_INSTRUCTIONS
+  with _models_lock:
+    model = _pinned_models.get(key) if pinned else _custom_models.get(key)
+    if model is not None:
+      if not pinned:
+        _custom_models.move_to_end(key)
+      _model_counts['hits'] += 1
+      return model
+    _model_counts['misses'] += 1
+
+  # build outside the lock; SDK constructors may be slow
+  model = _build_model(model_name, instruction)
+  with _models_lock:
+    if pinned:
+      return _pinned_models.setdefault(key, model)
+    if _model_cache_size <= 0:
+      return model
+    existing = _custom_models.get(key)
+    if existing is not None:
+      return existing
+    _custom_models[key] = model
+    while len(_custom_models) > _model_cache_size:
+      _custom_models.popitem(last=False)
+      _model_counts['evictions'] += 1
+  return model
+
+def warm_up_models():
+  """Build the plain and built-in persona models ahead of the first request."""
+  for model_name in {CHAT_MODEL, VISION_MODEL, IMAGE_MODEL}:
+    get_model(model_name)
+  for instruction in SYSTEM_INSTRUCTIONS.values():
+    get_model(CHAT_MODEL, instruction)
+
+def configure_model_cache(max_custom=None):
+  """Resize the custom-prompt LRU (0 disables caching custom prompts)."""
+  global _model_cache_size
+  with _models_lock:
+    if max_custom is not None:
+      _model_cache_size = max(0, int(max_custom))
+    while len(_custom_models) > _model_cache_size:
+      _custom_models.popitem(last=False)
+      _model_counts['evictions'] += 1
+
+def clear_model_cache():
+  with _models_lock:
+    _pinned_models.clear()
+    _custom_models.clear()
+
+def model_cache_stats():
+  with _models_lock:
+    lookups = _model_counts['hits'] + _model_counts['misses']
+    return {
+      'pinned': len(_pinned_models),
+      'custom': len(_custom_models),
+      'max_custom': _model_cache_size,
+      'hits': _model_counts['hits'],
+      'misses': _model_counts['misses'],
+      'evictions': _model_counts['evictions'],
+      'hit_rate': round(_model_counts['hits'] / lookups, 4) if lookups else 0.0,
     }
-    
-    instruction = None
-    if character == 'custom' and custom_prompt:
-        instruction = custom_prompt
-    elif character in system_instructions:
-        instruction = system_instructions[character]
-        
-    if instruction:
-        model = genai.GenerativeModel('gemini-2.5-flash', system_instruction=instruction)
-    else:
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        
-    response = model.generate_content(text)
-    return response.text
-  except Exception as e:
-    print(f"An error occurred during chat: {e}")
-    # --- MODIFIED: Return the specific error message ---
-    return f"An error occurred: {str(e)}"
 
-def classify_image(prompt, image_path):
+def _instruction(character=None, custom_prompt=None):
+  if character == 'custom' and custom_prompt:
+    return custom_prompt
+  return SYSTEM_INSTRUCTIONS.get(character)
+
+def _chat_model(character=None, custom_prompt=None):
+  return get_model(CHAT_MODEL, _instruction(character, custom_prompt))
+
+# Responses from the paid provider are cached, keyed by provider, model,
+# system instruction, normalized prompt and (for images) a hash of the image
+# bytes. Set CHAT_CACHE_PATH to a SQLite file to share them across workers.
+_responses = ResultCache(
+  max_entries=int(os.getenv('CHAT_CACHE_SIZE', '512')),
+  ttl_seconds=int(os.getenv('CHAT_CACHE_TTL', '3600')),
+  disk_path=os.getenv('CHAT_CACHE_PATH') or None,
+  max_disk_bytes=int(os.getenv('CHAT_CACHE_MAX_DISK_MB', '128')) * 1024 * 1024,
+)
+CACHED_ROUTES = ('chat', 'classify_image')
+_cached_routes = set(CACHED_ROUTES)
+_route_lock = threading.Lock()
+_route_counts = {}
+
+def configure_response_cache(max_entries=None, ttl_seconds=None, disk_path=None, max_disk_mb=None, routes=None):
+  """Resize the response cache; `routes` lists the routes that use it (others always go upstream)."""
+  global _cached_routes
+  _responses.configure(
+    max_entries=max_entries,
+    ttl_seconds=ttl_seconds,
+    disk_path=disk_path or None,
+    max_disk_bytes=int(max_disk_mb) * 1024 * 1024 if max_disk_mb else None,
+  )
+  if routes is not None:
+    _cached_routes = set(routes) & set(CACHED_ROUTES)
+
+def clear_response_cache():
+  _responses.clear()
+
+def _record(route, field, seconds=None):
+  with _route_lock:
+    counts = _route_counts.setdefault(route, {
+      'requests': 0, 'hits': 0, 'upstream_calls': 0, 'bypassed': 0,
+      'hit_seconds': 0.0, 'upstream_seconds': 0.0,
+    })
+    counts[field] += 1
+    if field == 'hits':
+      counts['requests'] += 1
+      counts['hit_seconds'] += seconds
+    elif field == 'upstream_calls':
+      counts['requests'] += 1
+      counts['upstream_seconds'] += seconds
+
+def response_cache_stats():
+  with _route_lock:
+    routes = {}
+    for route, c in _route_counts.items():
+      avg_upstream = c['upstream_seconds'] / c['upstream_calls'] if c['upstream_calls'] else 0.0
+      avg_hit = c['hit_seconds'] / c['hits'] if c['hits'] else 0.0
+      routes[route] = {
+        'enabled': route in _cached_routes,
+        'requests': c['requests'],
+        'upstream_calls': c['upstream_calls'],
+        'saved_upstream_calls': c['hits'],
+        'bypassed': c['bypassed'],
+        'avg_upstream_ms': round(avg_upstream * 1000, 2),
+        'avg_hit_ms': round(avg_hit * 1000, 3),
+        # what the hits would have cost at the average upstream latency
+        'saved_seconds': round(c['hits'] * max(avg_upstream - avg_hit, 0.0), 3),
+      }
+  return {'cache': _responses.stats(), 'routes': routes}
+
+def _response_key(route, model_name, instruction, prompt, content_hash=None):
+  provider = getattr(genai, '_sdk_name', None)
+  instruction_hash = hashlib.sha256(instruction.encode('utf-8')).hexdigest() if instruction else None
+  return make_key(route, [provider, model_name], {'instruction': instruction_hash, 'content': content_hash}, normalize_text(prompt))
+
+def _cached_call(route, key, compute, use_cache=True):
+  """Return the cached response for `key` or `compute()` it.
+
+  `compute` returns (response, cacheable) so errors and local fallbacks are
+  never stored.
+  """
+  enabled = use_cache and route in _cached_routes
+  started = time.perf_counter()
+  if enabled:
+    hit = _responses.get(key)
+    if hit is not None:
+      _record(route, 'hits', time.perf_counter() - started)
+      return hit
+  else:
+    _record(route, 'bypassed')
+  started = time.perf_counter()
+  result, cacheable = compute()
+  _record(route, 'upstream_calls', time.perf_counter() - started)
+  if enabled and cacheable:
+    _responses.put(key, result)
+  return result
+
+def _reply_text(model, prompt):
+  """The reply text, raising ProviderError when the adapter only sent back its error text."""
+  response = model.generate_content(prompt)
+  if getattr(response, 'error', False):
+    raise genai.ProviderError(response.text)
+  return response.text
+
+def chat(text, character=None, custom_prompt=None, use_cache=True):
+  instruction = _instruction(character, custom_prompt)
+
+  def compute():
+    try:
+      reply = _reply_text(get_model(CHAT_MODEL, instruction), text)
+      return reply, bool(reply)
+    except Exception as e:
+      print(f"An error occurred during chat: {e}")
+      # --- MODIFIED: Return the specific error message ---
+      return f"An error occurred: {str(e)}", False
+
+  key = _response_key('chat', CHAT_MODEL, instruction, text)
+  return _cached_call('chat', key, compute, use_cache)
+
+def chat_stream(text, character=None, custom_prompt=None, use_cache=True):
+  """Yield the chat reply in chunks as the provider streams it.
+
+  A cached reply is yielded as a single chunk; a fully streamed reply is
+  stored for later requests.
+  """
+  instruction = _instruction(character, custom_prompt)
+  enabled = use_cache and 'chat' in _cached_routes
+  key = _response_key('chat', CHAT_MODEL, instruction, text)
+  started = time.perf_counter()
+  if enabled:
+    hit = _responses.get(key)
+    if hit is not None:
+      _record('chat', 'hits', time.perf_counter() - started)
+      yield hit
+      return
+  else:
+    _record('chat', 'bypassed')
+  model = get_model(CHAT_MODEL, instruction)
+  started = time.perf_counter()
+  chunks = []
+  for chunk in model.stream_content(text):
+    chunks.append(chunk)
+    yield chunk
+  _record('chat', 'upstream_calls', time.perf_counter() - started)
+  if enabled and chunks:
+    _responses.put(key, ''.join(chunks))
+
+# Multi-turn sessions keep history server-side; each turn sends a summary of
+# older turns plus the recent ones, within the session's token budget.
+_sessions = SessionStore(
+  max_sessions=int(os.getenv('CHAT_SESSION_MAX', '1000')),
+  idle_seconds=float(os.getenv('CHAT_SESSION_IDLE_SECONDS', '1800')),
+  max_context_tokens=int(os.getenv('CHAT_SESSION_CONTEXT_TOKENS', '2000')),
+)
+
+def configure_sessions(max_sessions=None, idle_seconds=None, max_context_tokens=None):
+  _sessions.configure(max_sessions=max_sessions, idle_seconds=idle_seconds, max_context_tokens=max_context_tokens)
+
+def create_session(character=None, custom_prompt=None, max_context_tokens=None):
+  meta = {'character': character} if character else {}
+  return _sessions.create(_instruction(character, custom_prompt), max_context_tokens, meta)
+
+def get_session(session_id):
+  return _sessions.get(session_id)
+
+def delete_session(session_id):
+  return _sessions.delete(session_id)
+
+def session_stats():
+  return _sessions.stats()
+
+def session_chat(session, text):
+  """Send `text` with the session's context and record the exchange.
+
+  Turns of one session are serialized so history stays in order, but the
+  history lock is released during the provider call so reads of the
+  session do not wait on it. Raises RuntimeError if the provider fails;
+  the failed turn is not recorded.
+  """
+  with session.turn_lock:
+    with session.lock:
+      prompt = session.prompt_for(text)
+    try:
+      reply = _reply_text(get_model(CHAT_MODEL, session.instruction), prompt)
+    except Exception as e:
+      print(f"An error occurred during session chat: {e}")
+      raise RuntimeError(f"An error occurred: {str(e)}") from e
+    with session.lock:
+      session.append('user', text)
+      session.append('assistant', reply)
+      return {
+        'reply': reply,
+        'usage': {
+          'prompt_tokens': estimate_tokens(prompt),
+          'history_tokens': session.history_tokens,
+          'turns': len(session.turns),
+          'summarized_turns': session.folded,
+        },
+      }
+
+def _classify_remote(vision_model, prompt, img_bytes):
+  """Try the ways of sending an image to the API; None if all of them fail."""
+  # Try: pass a file-like object (io.BytesIO)
+  try:
+    response = vision_model.generate_content([prompt, io.BytesIO(img_bytes)])
+    if hasattr(response, 'text') and response.text and not getattr(response, 'error', False):
+      return response.text
+  except Exception:
+    pass
+
+  # Try: pass raw bytes in a dict (some SDK versions accept this)
+  try:
+    response = vision_model.generate_content([prompt, {"image": img_bytes}])
+    if hasattr(response, 'text') and response.text and not getattr(response, 'error', False):
+      return response.text
+  except Exception:
+    pass
+
+  # Try: embed base64 image data in the prompt as a fallback
+  try:
+    import base64
+    b64 = base64.b64encode(img_bytes).decode('utf-8')
+    prompt_with_b64 = f"{prompt}\n\nImage (base64): data:image/png;base64,{b64}"
+    response = vision_model.generate_content(prompt_with_b64)
+    if hasattr(response, 'text') and response.text and not getattr(response, 'error', False):
+      return response.text
+  except Exception:
+    pass
+  return None
+
+def classify_image(prompt, image_path, use_cache=True):
   """Classify an image using the configured generative model.
 
   This attempts multiple safe ways to send the image to the API (bytes, stream,
   and base64 embedded) and falls back to a minimal local description if the
-  API calls fail.
+  API calls fail. Remote answers are cached by prompt and image content.
   """
-  vision_model = genai.GenerativeModel('gemini-2.5-flash')
   try:
     # Read image bytes once
     with open(image_path, 'rb') as f:
       img_bytes = f.read()
 
-    # Try: pass a file-like object (io.BytesIO)
-    try:
-      response = vision_model.generate_content([prompt, io.BytesIO(img_bytes)])
-      if hasattr(response, 'text') and response.text:
-        return response.text
-    except Exception:
-      pass
-
-    # Try: pass raw bytes in a dict (some SDK versions accept this)
-    try:
-      response = vision_model.generate_content([prompt, {"image": img_bytes}])
-      if hasattr(response, 'text') and response.text:
-        return response.text
-    except Exception:
-      pass
+    def compute():
+      text = _classify_remote(get_model(VISION_MODEL), prompt, img_bytes)
+      if text:
+        return text, True
+      # If all remote attempts failed, provide a small local description
+      try:
+        with PIL.Image.open(image_path) as im:
+          return f"Local fallback: format={im.format}, mode={im.mode}, size={im.size}", False
+      except Exception as e:
+        return f"Image classification failed and fallback also failed: {str(e)}", False
 
-    # Try: embed base64 image data in the prompt as a fallback
-    try:
-      import base64
-      b64 = base64.b64encode(img_bytes).decode('utf-8')
-      prompt_with_b64 = f"{prompt}\n\nImage (base64): data:image/png;base64,{b64}"
-      response = vision_model.generate_content(prompt_with_b64)
-      if hasattr(response, 'text') and response.text:
-        return response.text
-    except Exception:
-      pass
-
-    # If all remote attempts failed, provide a small local description
-    try:
-      with PIL.Image.open(image_path) as im:
-        return f"Local fallback: format={im.format}, mode={im.mode}, size={im.size}"
-    except Exception as e:
-      return f"Image classification failed and fallback also failed: {str(e)}"
+    key = _response_key('classify_image', VISION_MODEL, None, prompt, hashlib.sha256(img_bytes).hexdigest())
+    return _cached_call('classify_image', key, compute, use_cache)
 
   except Exception as e:
     print(f"An error occurred during image classification: {e}")
@@ -95,7 +384,7 @@ def classify_image(prompt, image_path):
 
 def generate_image(prompt):
   try:
-    model = genai.GenerativeModel('gemini-2.5-pro')
+    model = get_model(IMAGE_MODEL)
     # Try primary image generation call (some SDK versions accept generation_config)
     try:
       response = model.generate_content(
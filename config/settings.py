@@ -31,12 +31,53 @@ class Config:
     
     # Rate Limiting
     RATELIMIT_DEFAULT = "100 per hour"
-    RATELIMIT_STORAGE_URL = os.getenv('REDIS_URL', 'memory://')
+    # memory:// (per process), sqlite:///path.db (shared by workers on one
+    # host) or redis://host:port/db (shared across hosts)
+    RATELIMIT_STORAGE_URL = os.getenv('RATELIMIT_STORAGE_URL') or os.getenv('REDIS_URL', 'memory://')
     
     # API Settings
     GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
     API_BASE_URL = "https://api.alquran.cloud/v1"
     
+    # NLP Settings
+    # Comma-separated model names (spacy, summarizer, generator, sentiment)
+    # to preload in the background at startup; empty loads on first use.
+    NLP_WARMUP_MODELS = os.getenv('NLP_WARMUP_MODELS', '')
+    # Summarizer/generator inference backend: torch, torch-int8 or onnx
+    NLP_BACKEND = os.getenv('NLP_BACKEND', 'torch')
+    # Micro-batching of concurrent /ner/summarize and /ner/generator requests
+    NLP_BATCH_MAX_SIZE = int(os.getenv('NLP_BATCH_MAX_SIZE', '8'))
+    NLP_BATCH_MAX_WAIT_MS = float(os.getenv('NLP_BATCH_MAX_WAIT_MS', '10'))
+    # Result cache for /ner/tagging, /ner/sentiment and /ner/summarize;
+    # set NLP_CACHE_PATH to a SQLite file to share results across workers
+    NLP_CACHE_SIZE = int(os.getenv('NLP_CACHE_SIZE', '1024'))
+    NLP_CACHE_TTL = int(os.getenv('NLP_CACHE_TTL', '86400'))
+    NLP_CACHE_PATH = os.getenv('NLP_CACHE_PATH', '')
+    NLP_CACHE_MAX_DISK_MB = int(os.getenv('NLP_CACHE_MAX_DISK_MB', '256'))
+    
+    # Chat Settings
+    # Custom-prompt model handles kept in the LRU (built-in personas are always kept)
+    CHAT_MODEL_CACHE_SIZE = int(os.getenv('CHAT_MODEL_CACHE_SIZE', '128'))
+    # Response cache for /chat and /classify_image; CHAT_CACHE_ROUTES lists
+    # the routes that use it, CHAT_CACHE_PATH adds a shared SQLite tier
+    CHAT_CACHE_ROUTES = os.getenv('CHAT_CACHE_ROUTES', 'chat,classify_image')
+    CHAT_CACHE_SIZE = int(os.getenv('CHAT_CACHE_SIZE', '512'))
+    CHAT_CACHE_TTL = int(os.getenv('CHAT_CACHE_TTL', '3600'))
+    CHAT_CACHE_PATH = os.getenv('CHAT_CACHE_PATH', '')
+    CHAT_CACHE_MAX_DISK_MB = int(os.getenv('CHAT_CACHE_MAX_DISK_MB', '128'))
+    # Multi-turn /chat/sessions: idle sessions expire, older turns are
+    # summarized once a session's history exceeds its token budget
+    CHAT_SESSION_MAX = int(os.getenv('CHAT_SESSION_MAX', '1000'))
+    CHAT_SESSION_IDLE_SECONDS = float(os.getenv('CHAT_SESSION_IDLE_SECONDS', '1800'))
+    CHAT_SESSION_CONTEXT_TOKENS = int(os.getenv('CHAT_SESSION_CONTEXT_TOKENS', '2000'))
+    
+    # Translator Settings
+    # Targets whose seq2seq models are loaded in the background at startup
+    # (e.g. 'jawa,sunda,bali'); empty loads each model on first use
+    TRANSLATOR_WARMUP_TARGETS = os.getenv('TRANSLATOR_WARMUP_TARGETS', '')
+    # Per-script LRU cache of converted words (0 disables it)
+    TRANSLATOR_WORD_CACHE_SIZE = int(os.getenv('TRANSLATOR_WORD_CACHE_SIZE', '4096'))
+    
     # Flask Settings
     DEBUG = os.getenv('FLASK_DEBUG', 'False').lower() in ('true', '1', 'yes')
     THREADED = True
@@ -3,13 +3,31 @@
 Provides a minimal API surface used by this project:
 - `configure(api_key=...)`
 - `GenerativeModel` class with `generate_content()` method
+  (plus `stream_content()` and `async generate_content_async()`)
+
+SDK clients are pooled: one client per (provider, credentials) is reused so
+HTTP connection pools survive between requests, and a per-provider limiter
+caps in-flight requests (`GENAI_MAX_CONCURRENCY`), queueing the rest for up
+to `GENAI_QUEUE_TIMEOUT` seconds. `pool_stats()` reports both.
+
+Optionally, `GENAI_PROVIDER_CHAIN` (e.g. `genai:10,generativeai,openai:15,mock`)
+routes `generate_content` through several providers in order, each with
+its own timeout and circuit breaker, with optional hedging
+(`GENAI_HEDGE_PERCENTILE`). `chain_stats()` reports per-provider latency
+and error histograms.
 
 The wrapper will prefer `google.genai` if available and fall back to
 `google.generativeai`. It adapts differences where possible and falls
 back to conservative behavior when an adapter path is not available.
 """
+import asyncio
+import collections
+import hashlib
 import os
+import re
 import logging
+import threading
+import time
 from types import SimpleNamespace
 
 # Provider selection: 'auto' (default) will prefer google.genai -> google.generativeai
@@ -210,6 +228,7 @@ def set_provider(provider, api_key=None):
     except Exception:
         pass
     _provider = provider
+    clear_clients()
     if api_key:
         configure(api_key=api_key)
     else:
@@ -219,6 +238,640 @@ def set_provider(provider, api_key=None):
     return _sdk_name
 
 
+def _safe_get_attr(mod, name):
+    """Read `mod.name` without tripping modules that raise on attribute access.
+
+    Some OpenAI shims raise on deprecated attributes like `ChatCompletion`;
+    checking the module dict first avoids invoking `__getattr__`.
+    """
+    d = getattr(mod, '__dict__', None)
+    if isinstance(d, dict) and name in d:
+        return d.get(name)
+    try:
+        return getattr(mod, name)
+    except Exception:
+        return None
+
+
+class QueueTimeout(RuntimeError):
+    """Raised when a request waited longer than the queue timeout for a slot."""
+
+
+class ConcurrencyLimiter:
+    """FIFO limit on in-flight requests, shared by threads and asyncio tasks.
+
+    Callers beyond `limit` wait in one queue in arrival order; a released
+    slot is handed directly to the next waiter, whether it is a thread
+    (`acquire`) or a coroutine (`acquire_async`).
+    """
+
+    def __init__(self, limit, queue_timeout=None):
+        self.limit = max(1, int(limit))
+        self.queue_timeout = queue_timeout
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._waiters = collections.deque()
+        self._acquired = 0
+        self._queued = 0
+        self._timeouts = 0
+        self._max_queue = 0
+        self._wait_seconds = 0.0
+
+    def _try_acquire(self):
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            self._acquired += 1
+            return True
+        return False
+
+    def _enqueue(self, waiter):
+        self._waiters.append(waiter)
+        self._queued += 1
+        self._max_queue = max(self._max_queue, len(self._waiters))
+
+    def _granted(self, started):
+        with self._lock:
+            self._acquired += 1
+            self._wait_seconds += time.perf_counter() - started
+
+    def acquire(self, timeout=None):
+        timeout = self.queue_timeout if timeout is None else timeout
+        with self._lock:
+            if self._try_acquire():
+                return
+            event = threading.Event()
+            self._enqueue(event)
+        started = time.perf_counter()
+        if not event.wait(timeout):
+            with self._lock:
+                if event in self._waiters:
+                    self._waiters.remove(event)
+                    self._timeouts += 1
+                    raise QueueTimeout(f'No free slot within {timeout}s ({self.limit} requests in flight)')
+            # the slot was handed over just as the wait timed out
+        self._granted(started)
+
+    async def acquire_async(self, timeout=None):
+        timeout = self.queue_timeout if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._try_acquire():
+                return
+            future = loop.create_future()
+            self._enqueue(future)
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            with self._lock:
+                if future in self._waiters:
+                    self._waiters.remove(future)
+                    if isinstance(e, asyncio.TimeoutError):
+                        self._timeouts += 1
+                    queued = True
+                else:
+                    queued = False
+            if queued:
+                if isinstance(e, asyncio.TimeoutError):
+                    raise QueueTimeout(f'No free slot within {timeout}s ({self.limit} requests in flight)') from None
+                raise
+            # a slot was handed over; give it back unless the grant is still pending
+            if not future.cancel():
+                self.release()
+            raise
+        self._granted(started)
+
+    def _grant_future(self, future):
+        if not future.done():
+            future.set_result(None)
+        else:
+            # the waiter gave up between the hand-over and this callback
+            self.release()
+
+    def release(self):
+        with self._lock:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                if isinstance(waiter, threading.Event):
+                    waiter.set()
+                    return
+                if not waiter.done():
+                    waiter.get_loop().call_soon_threadsafe(self._grant_future, waiter)
+                    return
+            self._in_flight -= 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'limit': self.limit,
+                'in_flight': self._in_flight,
+                'queued': len(self._waiters),
+                'max_queued': self._max_queue,
+                'requests': self._acquired,
+                'waited': self._queued,
+                'timeouts': self._timeouts,
+                'avg_wait_ms': round(self._wait_seconds / self._queued * 1000, 2) if self._queued else 0.0,
+            }
+
+
+_pool_lock = threading.Lock()
+_clients = {}        # (provider, kind, credential fingerprint) -> client
+_client_stats = {}   # same key -> {'created': ts, 'uses': n}
+_limiters = {}       # provider -> ConcurrencyLimiter
+_max_concurrency = int(os.getenv('GENAI_MAX_CONCURRENCY', '8'))
+_queue_timeout = float(os.getenv('GENAI_QUEUE_TIMEOUT', '30'))
+
+
+def _current_provider():
+    if _sdk_name == 'mock' or _provider in ('mock', 'local_mock'):
+        return 'mock'
+    return _sdk_name or 'none'
+
+
+def _api_key(provider=None):
+    if (provider or _sdk_name) == 'openai':
+        return os.getenv('OPENAI_API_KEY')
+    return os.getenv('GOOGLE_API_KEY') or os.getenv('GEMINI_API_KEY')
+
+
+def _get_client(kind, provider=None, sdk=None):
+    """Return the pooled SDK client of `kind` for the current credentials.
+
+    `kind` is 'openai', 'openai_async' or 'genai'. Returns None when the
+    SDK does not provide that client. `provider`/`sdk` default to the
+    active provider.
+    """
+    provider = provider or _current_provider()
+    sdk = _sdk if sdk is None else sdk
+    api_key = _api_key(provider)
+    fingerprint = hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:12] if api_key else 'default'
+    key = (provider, kind, fingerprint)
+    with _pool_lock:
+        client = _clients.get(key)
+        if client is not None:
+            _client_stats[key]['uses'] += 1
+            return client
+
+    # build outside the lock; SDK constructors may be slow
+    factory = {
+        'openai': lambda: _safe_get_attr(sdk, 'OpenAI'),
+        'openai_async': lambda: _safe_get_attr(sdk, 'AsyncOpenAI'),
+        'genai': lambda: _safe_get_attr(sdk, 'Client'),
+    }[kind]()
+    if factory is None:
+        return None
+    client = factory(api_key=api_key) if api_key else factory()
+    with _pool_lock:
+        # another thread may have built one meanwhile; keep the first
+        client = _clients.setdefault(key, client)
+        stats = _client_stats.setdefault(key, {'created': time.time(), 'uses': 0})
+        stats['uses'] += 1
+        return client
+
+
+def _limiter(provider=None):
+    provider = provider or _current_provider()
+    limiter = _limiters.get(provider)
+    if limiter is None:
+        with _pool_lock:
+            limiter = _limiters.setdefault(provider, ConcurrencyLimiter(_max_concurrency, _queue_timeout))
+    return limiter
+
+
+def configure_concurrency(max_concurrency=None, queue_timeout=None):
+    """Change the per-provider in-flight limit and queue timeout.
+
+    Limiters are rebuilt lazily, so requests already running keep their slot.
+    """
+    global _max_concurrency, _queue_timeout
+    with _pool_lock:
+        if max_concurrency is not None:
+            _max_concurrency = max(1, int(max_concurrency))
+        if queue_timeout is not None:
+            _queue_timeout = float(queue_timeout)
+        _limiters.clear()
+
+
+def clear_clients():
+    """Drop pooled clients, e.g. after credentials change."""
+    with _pool_lock:
+        _clients.clear()
+        _client_stats.clear()
+
+
+def pool_stats():
+    with _pool_lock:
+        clients = [
+            {'provider': provider, 'kind': kind, 'credentials': fingerprint,
+             'uses': st['uses'], 'age_seconds': round(time.time() - st['created'], 1)}
+            for (provider, kind, fingerprint), st in _client_stats.items()
+        ]
+        limiters = dict(_limiters)
+    return {
+        'clients': clients,
+        'concurrency': {provider: limiter.stats() for provider, limiter in limiters.items()},
+        'max_concurrency': _max_concurrency,
+        'queue_timeout': _queue_timeout,
+    }
+
+
+class ProviderError(RuntimeError):
+    """A provider failed a request, or no provider in the chain could serve it."""
+
+
+_PROVIDER_MODULES = {
+    'genai': 'google.genai',
+    'generativeai': 'google.generativeai',
+    'openai': 'openai',
+}
+
+
+def _load_sdk(name):
+    """Import the SDK module for provider `name`; None if it is not installed."""
+    import importlib
+    try:
+        return importlib.import_module(_PROVIDER_MODULES[name])
+    except Exception:
+        return None
+
+
+class CircuitBreaker:
+    """Skip a provider after `failure_threshold` consecutive failures.
+
+    Once open, the provider is skipped for `reset_seconds`; then a single
+    probe request is let through (half-open), which closes the breaker on
+    success or re-opens it on failure.
+    """
+
+    def __init__(self, failure_threshold=5, reset_seconds=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self.state = 'closed'
+        self._failures = 0
+        self._opened_at = 0.0
+        self.opened = 0
+
+    def allow(self):
+        """True to send a request, 'probe' for the single half-open probe, else False."""
+        with self._lock:
+            if self.state == 'closed':
+                return True
+            if self.state == 'open' and time.monotonic() - self._opened_at >= self.reset_seconds:
+                self.state = 'half_open'
+                return 'probe'
+            return False
+
+    def cancel_probe(self):
+        """The probe was dropped without a result; let the next request probe instead."""
+        with self._lock:
+            if self.state == 'half_open':
+                self.state = 'open'
+                self._opened_at = time.monotonic() - self.reset_seconds
+
+    def success(self):
+        with self._lock:
+            self.state = 'closed'
+            self._failures = 0
+
+    def failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == 'half_open' or self._failures >= self.failure_threshold:
+                if self.state != 'open':
+                    self.opened += 1
+                self.state = 'open'
+                self._opened_at = time.monotonic()
+
+    def stats(self):
+        with self._lock:
+            return {'state': self.state, 'consecutive_failures': self._failures, 'times_opened': self.opened}
+
+
+class LatencyHistogram:
+    """Bucketed latency counts plus a window of recent samples for percentiles."""
+
+    BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+    def __init__(self, window=512):
+        self._lock = threading.Lock()
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.total = 0
+        self.sum_seconds = 0.0
+        self._recent = collections.deque(maxlen=window)
+
+    def observe(self, seconds):
+        ms = seconds * 1000
+        i = 0
+        while i < len(self.BUCKETS_MS) and ms > self.BUCKETS_MS[i]:
+            i += 1
+        with self._lock:
+            self.counts[i] += 1
+            self.total += 1
+            self.sum_seconds += seconds
+            self._recent.append(seconds)
+
+    def percentile(self, q, min_samples=1):
+        """The `q`th percentile of recent samples in seconds, or None with too few samples."""
+        with self._lock:
+            recent = sorted(self._recent)
+        if len(recent) < max(1, min_samples):
+            return None
+        return recent[min(len(recent) - 1, int(len(recent) * q / 100))]
+
+    def snapshot(self):
+        labels = [f'le_{b}ms' for b in self.BUCKETS_MS] + ['inf']
+        with self._lock:
+            counts = dict(zip(labels, self.counts))
+            total, sum_seconds = self.total, self.sum_seconds
+        pcts = {f'p{q}_ms': (round(v * 1000, 1) if v is not None else None)
+                for q, v in ((50, self.percentile(50)), (95, self.percentile(95)), (99, self.percentile(99)))}
+        return dict({'count': total, 'avg_ms': round(sum_seconds / total * 1000, 1) if total else None,
+                     'buckets': counts}, **pcts)
+
+
+class _ChainProvider:
+    """One provider in the chain with its SDK, timeout, breaker, workers and metrics.
+
+    Each provider has its own thread pool, so calls left running after a
+    timeout only tie up that provider's workers, never its fallbacks'.
+    """
+
+    def __init__(self, name, timeout, breaker, max_workers=16):
+        from concurrent.futures import ThreadPoolExecutor
+        self.name = name
+        self.timeout = timeout
+        self.breaker = breaker
+        self.sdk = None if name == 'mock' else _load_sdk(name)
+        self.available = name == 'mock' or self.sdk is not None
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f'genai-{name}')
+        self.latency = LatencyHistogram()
+        self.errors = LatencyHistogram()
+        self._lock = threading.Lock()
+        self.counts = {'requests': 0, 'successes': 0, 'errors': 0, 'timeouts': 0,
+                       'short_circuited': 0, 'saturated': 0, 'hedges': 0, 'hedge_wins': 0}
+        self.last_error = None
+
+    def count(self, field, error=None):
+        with self._lock:
+            self.counts[field] += 1
+            if error is not None:
+                self.last_error = error
+
+    def call(self, model, args, kwargs, ticket):
+        limiter = _limiter(self.name)
+        limiter.acquire()
+        try:
+            # the timeout covers the provider call only, not waiting for a
+            # worker or a concurrency slot
+            if not ticket.begin():
+                return None
+            return model._generate_with(self.name, self.sdk, model._instance_for(self.name, self.sdk), args, kwargs, strict=True)
+        finally:
+            limiter.release()
+
+    def stats(self):
+        with self._lock:
+            data = dict(self.counts, last_error=self.last_error)
+        data.update({
+            'available': self.available,
+            'timeout_seconds': self.timeout,
+            'circuit': self.breaker.stats(),
+            'latency': self.latency.snapshot(),
+            'error_latency': self.errors.snapshot(),
+        })
+        return data
+
+
+class _ChainCall:
+    """One submitted provider call; `started` is set once the provider is actually called."""
+
+    def __init__(self, provider, probe, hedged):
+        self.provider = provider
+        self.probe = probe
+        self.hedged = hedged
+        self.submitted = time.monotonic()
+        self.started = None
+        self._abandoned = False
+        self._lock = threading.Lock()
+
+    def begin(self):
+        with self._lock:
+            if self._abandoned:
+                return False
+            self.started = time.monotonic()
+            return True
+
+    def abandon(self):
+        """Give up on a call that has not started; False if it already has."""
+        with self._lock:
+            if self.started is not None:
+                return False
+            self._abandoned = True
+            return True
+
+    def deadline(self):
+        # a call that never starts is given up after the same timeout,
+        # but as local saturation rather than a provider failure
+        return (self.started if self.started is not None else self.submitted) + self.provider.timeout
+
+
+class ProviderChain:
+    """Try providers in order with per-provider timeouts and circuit breakers.
+
+    A provider that fails, times out or has an open breaker hands the
+    request to the next one. With `hedge_percentile` set, a request still
+    running after that percentile of the provider's recent latencies
+    (once `hedge_min_samples` are known) is also sent to the next provider,
+    and whichever answers first wins. Calls run on per-provider thread
+    pools so the caller stops waiting at the timeout; the abandoned call
+    finishes in the background. Time spent waiting for a worker or a
+    concurrency slot does not count against a provider or its breaker.
+    """
+
+    def __init__(self, providers, default_timeout=20.0, failure_threshold=5, reset_seconds=30.0,
+                 hedge_percentile=None, hedge_min_samples=20, max_workers=16):
+        self.providers = [
+            _ChainProvider(name, timeout or default_timeout, CircuitBreaker(failure_threshold, reset_seconds), max_workers)
+            for name, timeout in providers
+        ]
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.exhausted = 0
+
+    def shutdown(self):
+        for provider in self.providers:
+            provider.executor.shutdown(wait=False)
+
+    def _hedge_delay(self, provider):
+        if not self.hedge_percentile:
+            return None
+        return provider.latency.percentile(self.hedge_percentile, self.hedge_min_samples)
+
+    @staticmethod
+    def _drop(future, ticket):
+        """Stop waiting for a call without recording an outcome for its provider."""
+        future.cancel()
+        ticket.abandon()
+        if ticket.probe:
+            ticket.provider.breaker.cancel_probe()
+
+    def generate(self, model, args, kwargs):
+        from concurrent.futures import FIRST_COMPLETED, wait
+        queue = iter([p for p in self.providers if p.available])
+        pending = {}   # future -> _ChainCall
+        errors = []
+
+        def launch(hedged=False):
+            for provider in queue:
+                allowed = provider.breaker.allow()
+                if not allowed:
+                    provider.count('short_circuited')
+                    errors.append(f'{provider.name}: circuit open')
+                    continue
+                provider.count('requests')
+                if hedged:
+                    provider.count('hedges')
+                ticket = _ChainCall(provider, allowed == 'probe', hedged)
+                pending[provider.executor.submit(provider.call, model, args, kwargs, ticket)] = ticket
+                return True
+            return False
+
+        launch()
+        hedge_at = None
+        while pending:
+            now = time.monotonic()
+            if hedge_at is None and self.hedge_percentile and len(pending) == 1:
+                ticket = next(iter(pending.values()))
+                if ticket.started is not None:
+                    delay = self._hedge_delay(ticket.provider)
+                    hedge_at = ticket.started + delay if delay is not None else float('inf')
+            wake = min(ticket.deadline() for ticket in pending.values())
+            if hedge_at is not None:
+                wake = min(wake, hedge_at)
+            elif self.hedge_percentile:
+                # the hedge delay counts from when the call starts
+                wake = min(wake, now + 0.01)
+            done, _ = wait(list(pending), timeout=max(0.0, wake - now), return_when=FIRST_COMPLETED)
+
+            for future in done:
+                ticket = pending.pop(future)
+                provider = ticket.provider
+                try:
+                    result = future.result()
+                except QueueTimeout as e:
+                    provider.count('saturated', str(e))
+                    self._drop(future, ticket)
+                    errors.append(f'{provider.name}: {e}')
+                    continue
+                except Exception as e:
+                    elapsed = time.monotonic() - (ticket.started or ticket.submitted)
+                    provider.errors.observe(elapsed)
+                    provider.count('errors', str(e))
+                    provider.breaker.failure()
+                    errors.append(f'{provider.name}: {e}')
+                    _logger.warning('Provider %s failed after %.2fs: %s', provider.name, elapsed, e)
+                    continue
+                provider.latency.observe(time.monotonic() - ticket.started)
+                provider.count('successes')
+                provider.breaker.success()
+                if ticket.hedged:
+                    provider.count('hedge_wins')
+                for other_future, other in pending.items():
+                    self._drop(other_future, other)
+                return result
+
+            now = time.monotonic()
+            for future, ticket in list(pending.items()):
+                provider = ticket.provider
+                if now < ticket.deadline():
+                    continue
+                if ticket.started is None:
+                    # never got a worker or slot; if it just started, check again next round
+                    if ticket.abandon():
+                        del pending[future]
+                        self._drop(future, ticket)
+                        provider.count('saturated', f'no free worker within {provider.timeout}s')
+                        errors.append(f'{provider.name}: no free worker within {provider.timeout}s')
+                else:
+                    del pending[future]
+                    future.cancel()
+                    provider.errors.observe(now - ticket.started)
+                    provider.count('timeouts', f'timed out after {provider.timeout}s')
+                    provider.breaker.failure()
+                    errors.append(f'{provider.name}: timed out after {provider.timeout}s')
+
+            if hedge_at is not None and now >= hedge_at and pending:
+                hedge_at = float('inf')   # at most one hedge per request
+                launch(hedged=True)
+            if not pending:
+                hedge_at = None
+                launch()
+
+        self.exhausted += 1
+        raise ProviderError('All providers failed: ' + ('; '.join(errors) or 'none available'))
+
+    def stats(self):
+        return {
+            'order': [p.name for p in self.providers],
+            'hedge_percentile': self.hedge_percentile,
+            'exhausted': self.exhausted,
+            'providers': {p.name: p.stats() for p in self.providers},
+        }
+
+
+def _parse_chain(spec):
+    """'genai:10,openai,mock' -> [('genai', 10.0), ('openai', None), ('mock', None)]"""
+    providers = []
+    for item in (spec or '').split(','):
+        name, _, timeout = item.strip().partition(':')
+        name = name.strip().lower()
+        if not name:
+            continue
+        if name not in _PROVIDER_MODULES and name != 'mock':
+            raise ValueError(f'Unknown provider in chain: {name}')
+        providers.append((name, float(timeout) if timeout else None))
+    return providers
+
+
+_chain = None
+
+
+def configure_chain(providers=None, timeout=None, failure_threshold=None, reset_seconds=None,
+                    hedge_percentile=None, hedge_min_samples=None, max_workers=None):
+    """Route `generate_content` through a provider chain; empty `providers` turns it off.
+
+    `providers` is a list of names or (name, timeout) pairs, or a string
+    like 'genai:10,generativeai,openai:15,mock'. Unset options come from the
+    GENAI_* environment variables.
+    """
+    global _chain
+    if isinstance(providers, str):
+        providers = _parse_chain(providers)
+    providers = [p if isinstance(p, (tuple, list)) else (p, None) for p in providers or []]
+    old, _chain = _chain, None
+    if old is not None:
+        old.shutdown()
+    if not providers:
+        return None
+    pct = float(os.getenv('GENAI_HEDGE_PERCENTILE', '0')) if hedge_percentile is None else hedge_percentile
+    _chain = ProviderChain(
+        providers,
+        default_timeout=float(os.getenv('GENAI_PROVIDER_TIMEOUT', '20')) if timeout is None else timeout,
+        failure_threshold=int(os.getenv('GENAI_BREAKER_FAILURES', '5')) if failure_threshold is None else failure_threshold,
+        reset_seconds=float(os.getenv('GENAI_BREAKER_RESET_SECONDS', '30')) if reset_seconds is None else reset_seconds,
+        hedge_percentile=pct or None,
+        hedge_min_samples=int(os.getenv('GENAI_HEDGE_MIN_SAMPLES', '20')) if hedge_min_samples is None else hedge_min_samples,
+        max_workers=int(os.getenv('GENAI_CHAIN_WORKERS', '16')) if max_workers is None else max_workers,
+    )
+    return _chain
+
+
+def chain_stats():
+    chain = _chain
+    return chain.stats() if chain is not None else None
+
+
 class GenerativeModel:
     """Adapter exposing a `generate_content` method similar to older SDKs.
 
@@ -231,6 +884,7 @@ class GenerativeModel:
         self._model_name = model_name
         self._kwargs = kwargs
         self._inst = None
+        self._chain_insts = {}
         # If user explicitly selected mock provider, don't try to bind SDK
         if _sdk_name == 'mock' or _provider in ('mock', 'local_mock'):
             # mock requires no underlying instance
@@ -244,32 +898,220 @@ class GenerativeModel:
         if _sdk is None:
             return
 
-        # Try to use an existing GenerativeModel class from the SDK
-        Under = getattr(_sdk, 'GenerativeModel', None)
+        self._inst = self._make_instance(_sdk)
+
+    def _make_instance(self, sdk):
+        """Instantiate the SDK's own GenerativeModel class, if it has one."""
+        Under = getattr(sdk, 'GenerativeModel', None)
         if Under:
             try:
                 # try passing kwargs (some variants accept system_instruction)
-                self._inst = Under(model_name, **kwargs)
+                return Under(self._model_name, **self._kwargs)
             except TypeError:
                 try:
                     # older signature may expect positional model name only
-                    self._inst = Under(model_name)
+                    return Under(self._model_name)
                 except Exception:
-                    self._inst = None
+                    return None
+        return None
+
+    def _instance_for(self, name, sdk):
+        """Wrapped SDK model for provider `name` when called through the chain."""
+        if name in ('mock', 'openai') or sdk is None:
+            return None
+        if name not in self._chain_insts:
+            self._chain_insts[name] = self._make_instance(sdk)
+        return self._chain_insts[name]
+
+    def _openai_messages(self, args, kwargs):
+        """Build the prompt and chat messages for the OpenAI adapters."""
+        if args:
+            prompt = args[0]
+        else:
+            prompt = kwargs.get('prompt') or kwargs.get('text') or ''
+
+        # If a list, assume first element is the main prompt
+        if isinstance(prompt, (list, tuple)) and prompt:
+            prompt = prompt[0]
+
+        messages = []
+        # If a system_instruction was provided in kwargs use it
+        system = self._kwargs.get('system_instruction') or self._kwargs.get('system')
+        if system:
+            messages.append({'role': 'system', 'content': system})
+        messages.append({'role': 'user', 'content': str(prompt)})
+        return prompt, messages
+
+    def _genai_call(self, args, kwargs):
+        """Arguments for `google.genai` `Client.models.generate_content`.
+
+        The older SDK's `generation_config`, `safety_settings` and `tools`
+        (and a ready-made `config`) are folded into `config` with the
+        system instruction.
+        """
+        prompt = args[0] if args else (kwargs.get('contents') or kwargs.get('prompt') or kwargs.get('text') or '')
+        call = {'model': self._model_name, 'contents': prompt}
+        config = {}
+        for name in ('config', 'generation_config'):
+            value = kwargs.get(name)
+            if hasattr(value, 'model_dump'):
+                value = value.model_dump(exclude_none=True)
+            if value:
+                config.update(value)
+        for name in ('safety_settings', 'tools'):
+            if kwargs.get(name) is not None:
+                config[name] = kwargs[name]
+        system = self._kwargs.get('system_instruction') or self._kwargs.get('system')
+        if system:
+            config['system_instruction'] = system
+        if config:
+            call['config'] = config
+        return call
+
+    def stream_content(self, *args, **kwargs):
+        """Yield response text chunks as the provider produces them.
+
+        Uses the SDK's native streaming (`stream=True`) where available and
+        falls back to yielding the full `generate_content` text as a single
+        chunk otherwise, so callers can always iterate. The request holds
+        one concurrency slot until the stream is exhausted or closed.
+        """
+        limiter = _limiter()
+        limiter.acquire()
+        try:
+            yield from self._stream(args, kwargs)
+        finally:
+            limiter.release()
 
     def generate_content(self, *args, **kwargs):
         """Delegate to the underlying instance or try top-level helpers.
 
         Returns whatever the SDK returns; callers should handle multiple
-        response shapes (text, parts, file_data, etc.).
+        response shapes (text, parts, file_data, etc.). Waits for a free
+        concurrency slot first and raises QueueTimeout if none frees up.
+        With a provider chain configured (`configure_chain`), the chain
+        picks the provider and raises ProviderError if every one fails.
         """
-        # If we have a wrapped instance delegate directly
+        chain = _chain
+        if chain is not None:
+            return chain.generate(self, args, kwargs)
+        limiter = _limiter()
+        limiter.acquire()
+        try:
+            return self._generate(args, kwargs)
+        finally:
+            limiter.release()
+
+    async def generate_content_async(self, *args, **kwargs):
+        """Async `generate_content`, queued behind the same per-provider limit.
+
+        Uses the SDK's native async client where there is one (OpenAI's
+        `AsyncOpenAI`, `google.genai`'s `client.aio`, or
+        `generate_content_async` on a wrapped model); otherwise the
+        blocking call runs in a worker thread.
+        """
+        chain = _chain
+        if chain is not None:
+            return await asyncio.get_running_loop().run_in_executor(None, lambda: chain.generate(self, args, kwargs))
+        limiter = _limiter()
+        await limiter.acquire_async()
+        try:
+            if self._inst is not None and hasattr(self._inst, 'generate_content_async'):
+                return await self._inst.generate_content_async(*args, **kwargs)
+            if _sdk_name == 'openai' and _sdk is not None:
+                client = _get_client('openai_async')
+                if client is not None:
+                    _, messages = self._openai_messages(args, kwargs)
+                    resp = await client.chat.completions.create(model=self._model_name, messages=messages)
+                    return SimpleNamespace(text=resp.choices[0].message.content, raw=resp)
+            if self._inst is None and _sdk_name == 'genai' and _sdk is not None:
+                client = _get_client('genai')
+                if client is not None and hasattr(client, 'aio'):
+                    return await client.aio.models.generate_content(**self._genai_call(args, kwargs))
+            return await asyncio.get_running_loop().run_in_executor(None, lambda: self._generate(args, kwargs))
+        finally:
+            limiter.release()
+
+    def _stream(self, args, kwargs):
         if self._inst is not None:
-            return self._inst.generate_content(*args, **kwargs)
+            try:
+                resp = self._inst.generate_content(*args, stream=True, **kwargs)
+            except TypeError:
+                resp = None
+            if resp is not None:
+                for chunk in resp:
+                    text = getattr(chunk, 'text', None)
+                    if text:
+                        yield text
+                return
 
-        if _sdk is None:
+        if _sdk is None and (_sdk_name == 'mock' or _provider in ('mock', 'local_mock')):
+            text = self._generate(args, kwargs).text
+            # emit word by word so streaming clients can be exercised offline
+            for piece in re.findall(r'\S+\s*', text):
+                yield piece
+            return
+
+        if _sdk_name == 'genai' and _sdk is not None:
+            client = None
+            try:
+                client = _get_client('genai')
+            except Exception:
+                pass
+            if client is not None:
+                for chunk in client.models.generate_content_stream(**self._genai_call(args, kwargs)):
+                    text = getattr(chunk, 'text', None)
+                    if text:
+                        yield text
+                return
+
+        if _sdk_name == 'openai' and _sdk is not None:
+            client = None
+            try:
+                client = _get_client('openai')
+            except Exception:
+                pass
+            if client is not None:
+                stream = None
+                try:
+                    _, messages = self._openai_messages(args, kwargs)
+                    stream = client.chat.completions.create(model=self._model_name, messages=messages, stream=True)
+                except Exception:
+                    # fall back to the non-streaming adapters below
+                    pass
+                if stream is not None:
+                    for chunk in stream:
+                        try:
+                            text = chunk.choices[0].delta.content
+                        except Exception:
+                            text = None
+                        if text:
+                            yield text
+                    return
+
+        resp = self._generate(args, kwargs)
+        if getattr(resp, 'error', False):
+            raise ProviderError(resp.text)
+        yield getattr(resp, 'text', None) or ''
+
+    def _generate(self, args, kwargs):
+        return self._generate_with(_current_provider(), _sdk, self._inst, args, kwargs)
+
+    def _generate_with(self, name, sdk, inst, args, kwargs, strict=False):
+        """Generate with one provider: `name` with its SDK module and wrapped model.
+
+        With `strict`, failures raise ProviderError instead of coming back as
+        explanatory response text, so a provider chain can move on. Without
+        it that text is flagged with `error=True` so callers can tell it
+        apart from a reply.
+        """
+        # If we have a wrapped instance delegate directly
+        if inst is not None:
+            return inst.generate_content(*args, **kwargs)
+
+        if sdk is None:
             # If mock provider requested, return a simple echo-like response
-            if _sdk_name == 'mock' or _provider in ('mock', 'local_mock'):
+            if name == 'mock':
                 # Build a prompt string from args/kwargs
                 try:
                     if args:
@@ -285,10 +1127,21 @@ class GenerativeModel:
                 return SimpleNamespace(text=f"[MOCK RESPONSE] model={self._model_name} prompt={preview}")
             raise RuntimeError('No genai SDK installed')
 
+        # google.genai exposes a Client instead of a GenerativeModel class
+        if name == 'genai':
+            client = None
+            try:
+                client = _get_client('genai', name, sdk)
+            except Exception:
+                pass
+            if client is not None:
+                return client.models.generate_content(**self._genai_call(args, kwargs))
+
+        last_error = None
         # Try common top-level generator functions
         candidates = ['generate_content', 'generate', 'generate_text', 'text_generate']
-        for name in candidates:
-            fn = getattr(_sdk, name, None)
+        for fn_name in candidates:
+            fn = getattr(sdk, fn_name, None)
             if callable(fn):
                 try:
                     # some functions expect model name first
@@ -296,53 +1149,25 @@ class GenerativeModel:
                         return fn(self._model_name, *args, **kwargs)
                     except TypeError:
                         return fn(*args, **kwargs)
-                except Exception:
+                except Exception as e:
                     # try next candidate
-                    pass
+                    last_error = e
 
         # If OpenAI SDK is available, adapt to it
-        if _sdk_name == 'openai' and _sdk is not None:
+        if name == 'openai':
             # Simple ChatCompletion-like call
             try:
-                # Build prompt
-                prompt = None
-                if args:
-                    prompt = args[0]
-                else:
-                    prompt = kwargs.get('prompt') or kwargs.get('text') or ''
-
-                # If a list, assume first element is the main prompt
-                if isinstance(prompt, (list, tuple)) and prompt:
-                    prompt = prompt[0]
-
-                # Build messages for chat API
-                messages = []
-                # If a system_instruction was provided in kwargs use it
-                system = self._kwargs.get('system_instruction') or self._kwargs.get('system')
-                if system:
-                    messages.append({'role': 'system', 'content': system})
-                messages.append({'role': 'user', 'content': str(prompt)})
+                prompt, messages = self._openai_messages(args, kwargs)
 
                 # Prefer ChatCompletion if present
-                # Support new OpenAI client: `openai.OpenAI()`
-                # Use safe attribute access to avoid triggering modules that
-                # raise on attribute access (e.g. OpenAI shim that errors on
-                # deprecated attributes like `ChatCompletion`). Prefer
-                # checking the module dict first so we don't invoke
-                # `__getattr__` implementations.
-                def _safe_get_attr(mod, name):
-                    d = getattr(mod, '__dict__', None)
-                    if isinstance(d, dict) and name in d:
-                        return d.get(name)
-                    try:
-                        return getattr(mod, name)
-                    except Exception:
-                        return None
-
-                OpenAI = _safe_get_attr(_sdk, 'OpenAI')
-                if OpenAI is not None:
+                # Support new OpenAI client: `openai.OpenAI()`, pooled per API key
+                client = None
+                try:
+                    client = _get_client('openai', name, sdk)
+                except Exception:
+                    pass
+                if client is not None:
                     try:
-                        client = OpenAI()
                         # new client: client.chat.completions.create(...)
                         resp = client.chat.completions.create(model=self._model_name, messages=messages)
                         try:
@@ -350,11 +1175,11 @@ class GenerativeModel:
                         except Exception:
                             text = getattr(resp, 'text', None) or getattr(resp, 'output', None) or str(resp)
                         return SimpleNamespace(text=text, raw=resp)
-                    except Exception:
+                    except Exception as e:
                         # fall through to other adapters
-                        pass
+                        last_error = e
 
-                ChatCompletion = _safe_get_attr(_sdk, 'ChatCompletion')
+                ChatCompletion = _safe_get_attr(sdk, 'ChatCompletion')
                 if ChatCompletion is not None:
                     try:
                         resp = ChatCompletion.create(model=self._model_name, messages=messages)
@@ -364,15 +1189,15 @@ class GenerativeModel:
                         except Exception:
                             text = getattr(resp, 'text', None) or getattr(resp, 'output', None) or str(resp)
                         return SimpleNamespace(text=text, raw=resp)
-                    except Exception:
+                    except Exception as e:
                         # If the underlying package raises an informative
                         # migration error when accessing deprecated attrs,
                         # fall through to next adapter instead of returning
                         # the raw error message.
-                        pass
+                        last_error = e
 
                 # Fallback to completion.create
-                Completion = _safe_get_attr(_sdk, 'Completion')
+                Completion = _safe_get_attr(sdk, 'Completion')
                 if Completion is not None:
                     try:
                         resp = Completion.create(model=self._model_name, prompt=str(prompt), max_tokens=512)
@@ -381,26 +1206,39 @@ class GenerativeModel:
                         except Exception:
                             text = getattr(resp, 'text', None) or str(resp)
                         return SimpleNamespace(text=text, raw=resp)
-                    except Exception:
-                        pass
+                    except Exception as e:
+                        last_error = e
             except Exception as e:
+                if strict:
+                    raise ProviderError(f'OpenAI adapter error: {e}') from e
                 # Return informative error text rather than raising
-                return SimpleNamespace(text=f'OpenAI adapter error: {str(e)}')
+                return SimpleNamespace(text=f'OpenAI adapter error: {str(e)}', error=True)
+            if strict:
+                raise ProviderError(f'OpenAI adapter error: {last_error}') from last_error
 
         # As a last resort return a graceful fallback response instead of
         # raising. Some installations may include the package but not expose
         # a compatible generation API; returning a small message keeps the
         # calling code (and UI) functional while providing actionable info.
+        if strict:
+            if last_error is not None:
+                raise ProviderError(f'{name}: {last_error}') from last_error
+            raise ProviderError(f'{name}: no compatible generation API found')
         return SimpleNamespace(
             text=(
                 'genai SDK present but no compatible generation API found. '
                 'This installation of the SDK does not expose a supported '
                 'generation entrypoint. Update to a supported package '
                 "(google.genai) or check SDK version / environment settings."
-            )
+            ),
+            error=True,
         )
 
 
+if os.getenv('GENAI_PROVIDER_CHAIN'):
+    configure_chain(os.getenv('GENAI_PROVIDER_CHAIN'))
+
+
 # Expose a module-like object for easier replacement in imports
 _module = SimpleNamespace()
 _module.configure = configure
@@ -409,8 +1247,17 @@ _module._sdk = _sdk
 _module._sdk_name = _sdk_name
 _module.set_provider = set_provider
 _module._credential_source = lambda: _credential_source
+_module.pool_stats = pool_stats
+_module.configure_concurrency = configure_concurrency
+_module.QueueTimeout = QueueTimeout
+_module.ProviderError = ProviderError
+_module.configure_chain = configure_chain
+_module.chain_stats = chain_stats
 
 # Keep top-level name `genai` available if this file is imported directly
 genai = _module
 
-__all__ = ['genai', 'configure', 'GenerativeModel']
+__all__ = [
+    'genai', 'configure', 'GenerativeModel', 'pool_stats', 'configure_concurrency', 'QueueTimeout',
+    'ProviderError', 'configure_chain', 'chain_stats',
+]
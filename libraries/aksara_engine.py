@@ -0,0 +1,249 @@
+"""Shared transliteration engine for the aksara modules.
+
+Each script's tables are compiled once, at import time, into a character
+trie. Transliteration is then a single left-to-right pass: at every
+position the trie gives the longest consonant key in O(key length), one
+dict lookup decides between a vowel sign and the virama, and output pieces
+are appended to a list that is joined once at the end. The cost is linear
+in the input size; nothing is re-sorted or re-scanned per character.
+
+The same tables are inverted into reverse tries for aksara to Latin.
+
+Natural text repeats a small vocabulary, so both directions also memoize
+whole words in a bounded per-script LRU cache. Splitting is safe because
+word boundaries never influence conversion: letters (Latin) or glyphs
+(aksara) only look ahead into the same run.
+"""
+import functools
+import re
+import threading
+from typing import Dict
+
+_END = None  # trie key holding the output for a complete match
+
+WORD_CACHE_SIZE = 4096
+# longer "words" (URLs, base64, ...) are converted without caching
+MAX_CACHED_WORD = 32
+
+_LATIN_WORD = re.compile(r'[^\W\d_]+')
+_SCRIPT_WORD = re.compile(r'\S+')
+
+_engines: Dict[str, 'AksaraTransliterator'] = {}
+_engines_lock = threading.Lock()
+
+
+def build_trie(mapping: Dict[str, str]) -> dict:
+    """Compile `mapping` into nested dicts keyed by character."""
+    root: dict = {}
+    for key, value in mapping.items():
+        if not key:
+            continue
+        node = root
+        for ch in key:
+            node = node.setdefault(ch, {})
+        node[_END] = value
+    return root
+
+
+def invert(mapping: Dict[str, str]) -> Dict[str, str]:
+    """Swap keys and values; when values repeat the first key wins."""
+    inverse: Dict[str, str] = {}
+    for key, value in mapping.items():
+        if value:
+            inverse.setdefault(value, key)
+    return inverse
+
+
+def _longest_match(trie: dict, text: str, i: int, n: int):
+    """Return (value, end) for the longest key of `trie` at `text[i:]`."""
+    node = trie.get(text[i])
+    if node is None:
+        return None, i
+    value = node.get(_END)
+    end = i + 1
+    j = i + 1
+    while j < n:
+        node = node.get(text[j])
+        if node is None:
+            break
+        j += 1
+        if _END in node:
+            value, end = node[_END], j
+    return value, end
+
+
+class AksaraTransliterator:
+    """Latin to aksara for abugida scripts with an inherent vowel.
+
+    A consonant followed by a vowel takes that vowel's sign (nothing for
+    the inherent vowel); a consonant followed by anything else takes the
+    virama. Vowels that do not follow a consonant use their independent
+    form, and every other character is copied unchanged.
+    """
+
+    def __init__(self, consonants: Dict[str, str], independent_vowels: Dict[str, str],
+                 vowel_signs: Dict[str, str], virama: str, inherent: str = 'a',
+                 name: str = None, cache_size: int = None):
+        self.name = name
+        self.virama = virama
+        self.inherent = inherent
+        self._consonants = build_trie(consonants)
+        self._independent = dict(independent_vowels)
+        # vowel -> sign appended after a consonant; '' for the inherent vowel
+        self._signs = {v: ('' if v == inherent else vowel_signs.get(v, '')) for v in independent_vowels}
+        # reverse tables: glyph (possibly several code points) -> Latin
+        self._rev_consonants = build_trie(invert(consonants))
+        self._rev_independent = build_trie(invert(independent_vowels))
+        self._rev_signs = build_trie(invert(vowel_signs))
+        self.configure_cache(WORD_CACHE_SIZE if cache_size is None else cache_size)
+        if name:
+            with _engines_lock:
+                _engines[name] = self
+
+    def configure_cache(self, maxsize: int) -> None:
+        """Resize (and empty) the word caches; 0 disables them."""
+        self.cache_size = max(0, int(maxsize))
+        if self.cache_size:
+            self._forward_word = functools.lru_cache(maxsize=self.cache_size)(self._transliterate)
+            self._reverse_word = functools.lru_cache(maxsize=self.cache_size)(self._to_latin)
+        else:
+            self._forward_word = self._reverse_word = None
+
+    def cache_stats(self) -> dict:
+        stats = {'capacity': self.cache_size}
+        for direction, fn in (('forward', self._forward_word), ('reverse', self._reverse_word)):
+            if fn is None:
+                continue
+            info = fn.cache_info()
+            lookups = info.hits + info.misses
+            stats[direction] = {
+                'size': info.currsize,
+                'hits': info.hits,
+                'misses': info.misses,
+                'hit_rate': round(info.hits / lookups, 4) if lookups else 0.0,
+            }
+        return stats
+
+    def transliterate(self, text: str) -> str:
+        cached = self._forward_word
+        if cached is None:
+            return self._transliterate(text)
+        convert = self._transliterate
+
+        def word(m):
+            w = m.group()
+            return cached(w) if len(w) <= MAX_CACHED_WORD else convert(w)
+        # non-letters are copied unchanged, so only letter runs need converting
+        return _LATIN_WORD.sub(word, text)
+
+    def to_latin(self, text: str) -> str:
+        """Aksara to Latin: the inverse of `transliterate` on its own output.
+
+        A consonant glyph followed by the virama is a bare consonant, one
+        followed by a vowel sign takes that vowel, and any other consonant
+        keeps the inherent vowel. Where two Latin spellings share a glyph
+        sequence (e.g. Balinese `f` is written like `pp`), the longest
+        glyph match is read back.
+        """
+        cached = self._reverse_word
+        if cached is None:
+            return self._to_latin(text)
+        convert = self._to_latin
+
+        def word(m):
+            w = m.group()
+            return cached(w) if len(w) <= MAX_CACHED_WORD else convert(w)
+        return _SCRIPT_WORD.sub(word, text)
+
+    def _transliterate(self, text: str) -> str:
+        consonants, signs, independent, virama = self._consonants, self._signs, self._independent, self.virama
+        out = []
+        append = out.append
+        i = 0
+        n = len(text)
+        while i < n:
+            value, end = _longest_match(consonants, text, i, n)
+            if value is not None:
+                append(value)
+                i = end
+                sign = signs.get(text[i]) if i < n else None
+                if sign is None:
+                    append(virama)
+                else:
+                    if sign:
+                        append(sign)
+                    i += 1
+                continue
+            ch = text[i]
+            append(independent.get(ch, ch))
+            i += 1
+        return ''.join(out)
+
+    def _to_latin(self, text: str) -> str:
+        consonants, signs, independent = self._rev_consonants, self._rev_signs, self._rev_independent
+        virama, inherent = self.virama, self.inherent
+        out = []
+        append = out.append
+        i = 0
+        n = len(text)
+        while i < n:
+            latin, end = _longest_match(consonants, text, i, n)
+            if latin is not None:
+                append(latin)
+                i = end
+                if text.startswith(virama, i):
+                    i += len(virama)
+                    continue
+                vowel, end = _longest_match(signs, text, i, n) if i < n else (None, i)
+                if vowel is not None:
+                    append(vowel)
+                    i = end
+                else:
+                    append(inherent)
+                continue
+            latin, end = _longest_match(independent, text, i, n)
+            if latin is not None:
+                append(latin)
+                i = end
+            else:
+                append(text[i])
+                i += 1
+        return ''.join(out)
+
+
+def configure_word_cache(maxsize: int) -> None:
+    """Resize the word cache of every named transliterator."""
+    with _engines_lock:
+        engines = list(_engines.values())
+    for engine in engines:
+        engine.configure_cache(maxsize)
+
+
+def word_cache_stats() -> dict:
+    with _engines_lock:
+        return {name: engine.cache_stats() for name, engine in sorted(_engines.items())}
+
+
+class MappingTransliterator:
+    """Longest-key-first substitution with a precompiled `mapping` trie."""
+
+    def __init__(self, mapping: Dict[str, str]):
+        self.mapping = mapping
+        self._trie = build_trie(mapping)
+
+    def transliterate(self, text: str) -> str:
+        trie = self._trie
+        out = []
+        append = out.append
+        i = 0
+        n = len(text)
+        while i < n:
+            value, end = _longest_match(trie, text, i, n)
+            if value is not None:
+                append(value)
+                i = end
+            else:
+                append(text[i])
+                i += 1
+        return ''.join(out)
+
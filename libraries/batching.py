@@ -0,0 +1,120 @@
+"""Micro-batching scheduler for model inference.
+
+Concurrent callers submit single items; a background worker collects them
+for up to `max_wait_ms` (or until `max_batch_size` items are queued), runs
+one batched call and hands each caller its own result. This turns many
+batch-size-1 `generate` calls into a few padded batched ones.
+"""
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List
+
+
+class MicroBatcher:
+    """Collect concurrent requests into batches for `batch_fn`.
+
+    `batch_fn` receives a list of submitted items and must return a list of
+    results of the same length and order.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[Any]], List[Any]], max_batch_size: int = 8,
+                 max_wait_ms: float = 10.0, name: str = 'batcher'):
+        self._batch_fn = batch_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait_ms = max(0.0, float(max_wait_ms))
+        self.name = name
+        self._queue = queue.Queue()
+        self._worker = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._items = 0
+        self._errors = 0
+        self._max_seen_batch = 0
+        self._queue_wait_total = 0.0
+        self._compute_total = 0.0
+        self._started_at = None
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._start_lock:
+            if self._worker is not None and self._worker.is_alive():
+                return
+            self._started_at = time.time()
+            self._worker = threading.Thread(target=self._run, name=f'{self.name}-worker', daemon=True)
+            self._worker.start()
+
+    def submit(self, item: Any) -> Future:
+        """Queue `item` for the next batch and return a Future for its result."""
+        self._ensure_worker()
+        fut = Future()
+        self._queue.put((item, fut, time.perf_counter()))
+        return fut
+
+    def __call__(self, item: Any, timeout: float = None) -> Any:
+        """Submit `item` and block until its result is ready."""
+        return self.submit(item).result(timeout=timeout)
+
+    def _collect(self):
+        first = self._queue.get()
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait_ms / 1000.0
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            items = [b[0] for b in batch]
+            futures = [b[1] for b in batch]
+            started = time.perf_counter()
+            queue_wait = sum(started - b[2] for b in batch)
+            try:
+                results = self._batch_fn(items)
+                if len(results) != len(items):
+                    raise RuntimeError(f'{self.name}: batch_fn returned {len(results)} results for {len(items)} items')
+            except Exception as e:
+                with self._stats_lock:
+                    self._errors += 1
+                for fut in futures:
+                    fut.set_exception(e)
+                continue
+            compute = time.perf_counter() - started
+            with self._stats_lock:
+                self._batches += 1
+                self._items += len(items)
+                self._max_seen_batch = max(self._max_seen_batch, len(items))
+                self._queue_wait_total += queue_wait
+                self._compute_total += compute
+            for fut, res in zip(futures, results):
+                fut.set_result(res)
+
+    def stats(self) -> dict:
+        """Throughput and latency counters for tuning batch size and wait."""
+        with self._stats_lock:
+            batches = self._batches
+            items = self._items
+            uptime = time.time() - self._started_at if self._started_at else 0.0
+            return {
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': self.max_wait_ms,
+                'batches': batches,
+                'items': items,
+                'errors': self._errors,
+                'queued': self._queue.qsize(),
+                'avg_batch_size': round(items / batches, 2) if batches else 0.0,
+                'max_seen_batch_size': self._max_seen_batch,
+                'avg_queue_wait_ms': round(self._queue_wait_total / items * 1000, 2) if items else 0.0,
+                'avg_batch_compute_ms': round(self._compute_total / batches * 1000, 2) if batches else 0.0,
+                'items_per_second': round(items / uptime, 2) if uptime else 0.0,
+            }
@@ -0,0 +1,183 @@
+"""Server-side history for multi-turn chat sessions.
+
+Each session keeps its recent turns verbatim and folds older ones into a
+short running summary, so the prompt sent upstream stays within a token
+budget however long the conversation runs. Token counts are estimates
+(about four characters per token); no tokenizer is needed.
+
+Sessions live in process memory and are evicted after `idle_seconds`
+without a request, or least recently used first once `max_sessions` is
+reached.
+"""
+import re
+import secrets
+import threading
+import time
+from collections import OrderedDict, deque
+
+CHARS_PER_TOKEN = 4
+_SENTENCE = re.compile(r'(.+?[.!?])(?:\s|$)', re.S)
+
+
+def estimate_tokens(text):
+    return -(-len(text) // CHARS_PER_TOKEN) if text else 0
+
+
+def first_sentence(text, max_chars=160):
+    """Cheap extractive summary of one turn: its first sentence, shortened."""
+    text = ' '.join(text.split())
+    m = _SENTENCE.match(text)
+    sentence = m.group(1) if m else text
+    return sentence if len(sentence) <= max_chars else sentence[:max_chars - 3].rstrip() + '...'
+
+
+class Session:
+    """One conversation: persona, running summary and recent turns."""
+
+    def __init__(self, session_id, instruction=None, max_context_tokens=2000, summarize=first_sentence, meta=None):
+        self.id = session_id
+        self.instruction = instruction
+        self.max_context_tokens = max_context_tokens
+        self.summarize = summarize
+        self.meta = meta or {}
+        self.turns = deque()      # (role, text, tokens)
+        self.summary = []         # one line per folded turn, oldest first
+        self.turn_tokens = 0
+        self.summary_tokens = 0
+        self.folded = 0
+        self.created = time.time()
+        self.last_used = time.monotonic()
+        self.lock = threading.Lock()       # guards history; held only briefly
+        self.turn_lock = threading.Lock()  # serializes exchanges, held across the provider call
+
+    @property
+    def history_tokens(self):
+        return self.turn_tokens + self.summary_tokens
+
+    def prompt_for(self, text):
+        """The prompt for the next user message: summary, recent turns, then `text`."""
+        parts = []
+        if self.summary:
+            parts.append('Summary of the earlier conversation:\n' + '\n'.join(self.summary))
+        if self.turns:
+            parts.append('\n'.join(f'{role.capitalize()}: {t}' for role, t, _ in self.turns))
+        if not parts:
+            return text
+        parts.append(f'User: {text}\nAssistant:')
+        return '\n\n'.join(parts)
+
+    def append(self, role, text):
+        tokens = estimate_tokens(text)
+        self.turns.append((role, text, tokens))
+        self.turn_tokens += tokens
+        self._compact()
+
+    def _compact(self):
+        # keep the latest exchange verbatim; fold older turns into the summary
+        while self.history_tokens > self.max_context_tokens and len(self.turns) > 2:
+            role, text, tokens = self.turns.popleft()
+            self.turn_tokens -= tokens
+            line = f'{role.capitalize()}: {self.summarize(text)}'
+            self.summary.append(line)
+            self.summary_tokens += estimate_tokens(line)
+            self.folded += 1
+        # the summary itself gets at most a quarter of the budget
+        while self.summary and self.summary_tokens > self.max_context_tokens // 4:
+            self.summary_tokens -= estimate_tokens(self.summary.pop(0))
+
+    def to_dict(self, include_turns=True):
+        data = {
+            'session_id': self.id,
+            'meta': self.meta,
+            'created': self.created,
+            'turns': len(self.turns),
+            'summarized_turns': self.folded,
+            'history_tokens': self.history_tokens,
+            'max_context_tokens': self.max_context_tokens,
+        }
+        if include_turns:
+            data['summary'] = list(self.summary)
+            data['messages'] = [{'role': role, 'text': text} for role, text, _ in self.turns]
+        return data
+
+
+class SessionStore:
+    """Thread-safe in-memory sessions with idle and size-based eviction."""
+
+    def __init__(self, max_sessions=1000, idle_seconds=1800, max_context_tokens=2000):
+        self.max_sessions = max_sessions
+        self.idle_seconds = idle_seconds
+        self.max_context_tokens = max_context_tokens
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self.created = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def configure(self, max_sessions=None, idle_seconds=None, max_context_tokens=None):
+        with self._lock:
+            if max_sessions is not None:
+                self.max_sessions = max(1, int(max_sessions))
+            if idle_seconds is not None:
+                self.idle_seconds = float(idle_seconds)
+            if max_context_tokens is not None:
+                self.max_context_tokens = max(1, int(max_context_tokens))
+            self._evict_locked(time.monotonic())
+
+    def _evict_locked(self, now):
+        if self.idle_seconds:
+            # least recently used first, so stop at the first live session
+            while self._sessions:
+                sid, session = next(iter(self._sessions.items()))
+                if now - session.last_used < self.idle_seconds:
+                    break
+                del self._sessions[sid]
+                self.expired += 1
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+            self.evicted += 1
+
+    def create(self, instruction=None, max_context_tokens=None, meta=None):
+        session = Session(
+            secrets.token_urlsafe(16),
+            instruction=instruction,
+            max_context_tokens=max_context_tokens or self.max_context_tokens,
+            meta=meta,
+        )
+        with self._lock:
+            self._sessions[session.id] = session
+            self.created += 1
+            self._evict_locked(time.monotonic())
+        return session
+
+    def get(self, session_id):
+        """Return the live session and mark it used, or None."""
+        now = time.monotonic()
+        with self._lock:
+            self._evict_locked(now)
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session.last_used = now
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def delete(self, session_id):
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def clear(self):
+        with self._lock:
+            self._sessions.clear()
+
+    def stats(self):
+        with self._lock:
+            self._evict_locked(time.monotonic())
+            return {
+                'active': len(self._sessions),
+                'max_sessions': self.max_sessions,
+                'idle_seconds': self.idle_seconds,
+                'max_context_tokens': self.max_context_tokens,
+                'created': self.created,
+                'expired': self.expired,
+                'evicted': self.evicted,
+            }
@@ -1,18 +1,334 @@
-import spacy
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM, pipeline
-from nltk.sentiment.vader import SentimentIntensityAnalyzer
+"""NLP helpers: entity tagging, summarization, sentiment and text generation.
 
-# Load spaCy model
-nlp = spacy.load("en_core_web_sm")
-# Specify the model you want, e.g., distilbart-cnn
-tokenizer = AutoTokenizer.from_pretrained("sshleifer/distilbart-cnn-12-6")
-model = AutoModelForSeq2SeqLM.from_pretrained("sshleifer/distilbart-cnn-12-6")
-generator = pipeline('text-generation', model='gpt2')
+Models are not loaded at import time. Each one is registered with a loader
+and built on first use (once per process, thread-safe), so importing this
+module and creating the Flask app stays cheap. Use `warm_up()` to preload
+models, `unload()` to release them and `model_stats()` to inspect load time
+and resident memory per model.
 
+Summarization and generation can run on one of several CPU backends
+(`NLP_BACKEND`): plain PyTorch (`torch`), PyTorch with dynamic int8
+quantization of the linear layers (`torch-int8`), or ONNX Runtime via
+`optimum` (`onnx`, exported with `scripts/export_onnx.py`).
+"""
+import os
+import queue
+import re
+import threading
+import time
+
+from .batching import MicroBatcher
+from .result_cache import ResultCache
+
+SUMMARIZER_MODEL_ID = "sshleifer/distilbart-cnn-12-6"
+GENERATOR_MODEL_ID = "gpt2"
+SPACY_MODEL_ID = "en_core_web_sm"
+
+NLP_BACKENDS = ('torch', 'torch-int8', 'onnx')
+ONNX_MODEL_DIR = os.getenv(
+  'NLP_ONNX_DIR',
+  os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models', 'onnx'),
+)
+_backend = os.getenv('NLP_BACKEND', 'torch').lower()
+
+
+def _load_spacy():
+  import spacy
+  return spacy.load(SPACY_MODEL_ID)
+
+
+def onnx_export_path(kind):
+  """Directory holding the exported ONNX `summarizer` or `generator`."""
+  return os.path.join(ONNX_MODEL_DIR, kind)
+
+
+def _quantize_dynamic(model):
+  import torch
+  return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _load_ort(ort_class, model_id, kind):
+  # Use the exported copy when present, otherwise export on the fly
+  path = onnx_export_path(kind)
+  if os.path.isdir(path):
+    return ort_class.from_pretrained(path)
+  return ort_class.from_pretrained(model_id, export=True)
+
+
+def _load_summarizer():
+  from transformers import AutoTokenizer
+  tokenizer = AutoTokenizer.from_pretrained(SUMMARIZER_MODEL_ID)
+  if _backend == 'onnx':
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    model = _load_ort(ORTModelForSeq2SeqLM, SUMMARIZER_MODEL_ID, 'summarizer')
+  else:
+    from transformers import AutoModelForSeq2SeqLM
+    model = AutoModelForSeq2SeqLM.from_pretrained(SUMMARIZER_MODEL_ID)
+    if _backend == 'torch-int8':
+      model = _quantize_dynamic(model)
+  return tokenizer, model
+
+def _load_generator():
+  from transformers import pipeline
+  if _backend == 'torch':
+    return pipeline('text-generation', model=GENERATOR_MODEL_ID)
+  from transformers import AutoTokenizer
+  tokenizer = AutoTokenizer.from_pretrained(GENERATOR_MODEL_ID)
+  if _backend == 'onnx':
+    from optimum.onnxruntime import ORTModelForCausalLM
+    model = _load_ort(ORTModelForCausalLM, GENERATOR_MODEL_ID, 'generator')
+  else:
+    from transformers import AutoModelForCausalLM
+    model = _quantize_dynamic(AutoModelForCausalLM.from_pretrained(GENERATOR_MODEL_ID))
+  return pipeline('text-generation', model=model, tokenizer=tokenizer)
+
+def _load_sentiment():
+  from nltk.sentiment.vader import SentimentIntensityAnalyzer
+  return SentimentIntensityAnalyzer()
+
+
+# name -> loader callable; loaders return the ready-to-use model object
+_LOADERS = {
+  'spacy': _load_spacy,
+  'summarizer': _load_summarizer,
+  'generator': _load_generator,
+  'sentiment': _load_sentiment,
+}
+
+_models = {}
+_stats = {}
+_locks = {name: threading.Lock() for name in _LOADERS}
+
+
+def _rss_bytes():
+  """Return the current resident set size of this process in bytes, if known."""
+  try:
+    with open('/proc/self/statm') as f:
+      return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+  except Exception:
+    pass
+  try:
+    import resource
+    import sys
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes elsewhere
+    return rss if sys.platform == 'darwin' else rss * 1024
+  except Exception:
+    return None
+
+
+def get_model(name):
+  """Return the model registered as `name`, loading it on first use."""
+  if name not in _LOADERS:
+    raise KeyError(f"Unknown model: {name}")
+  model = _models.get(name)
+  if model is not None:
+    return model
+  with _locks[name]:
+    model = _models.get(name)
+    if model is not None:
+      return model
+    rss_before = _rss_bytes()
+    started = time.perf_counter()
+    model = _LOADERS[name]()
+    load_seconds = time.perf_counter() - started
+    rss_after = _rss_bytes()
+    _stats[name] = {
+      'backend': _backend if name in ('summarizer', 'generator') else None,
+      'load_seconds': round(load_seconds, 3),
+      'rss_delta_bytes': (rss_after - rss_before) if rss_before is not None and rss_after is not None else None,
+      'loaded_at': time.time(),
+    }
+    _models[name] = model
+    return model
+
+
+def is_loaded(name):
+  return name in _models
+
+
+def warm_up(names=None, background=False):
+  """Load the given models (all registered models by default).
+
+  Models that fail to load are reported in the returned dict instead of
+  raising, so a missing optional dependency does not break app startup.
+  With `background=True` loading happens in a daemon thread and the thread
+  is returned.
+  """
+  names = list(names) if names else list(_LOADERS)
+
+  def _run():
+    errors = {}
+    for name in names:
+      try:
+        get_model(name)
+      except Exception as e:
+        errors[name] = str(e)
+    return errors
+
+  if background:
+    t = threading.Thread(target=_run, name='ner-warm-up', daemon=True)
+    t.start()
+    return t
+  return _run()
+
+
+def unload(name=None):
+  """Drop one model (or all models) so its memory can be reclaimed."""
+  names = [name] if name else list(_LOADERS)
+  for n in names:
+    if n not in _LOADERS:
+      raise KeyError(f"Unknown model: {n}")
+    with _locks[n]:
+      _models.pop(n, None)
+      _stats.pop(n, None)
+  import gc
+  gc.collect()
+
+
+def model_stats():
+  """Report load state, load time and memory growth for each registered model."""
+  return {
+    name: dict(loaded=name in _models, **_stats.get(name, {}))
+    for name in _LOADERS
+  }
+
+
+def get_backend():
+  return _backend
+
+
+def set_backend(name):
+  """Switch the summarizer/generator backend, unloading models built on the old one."""
+  global _backend
+  name = (name or 'torch').lower()
+  if name not in NLP_BACKENDS:
+    raise ValueError(f"Unknown NLP backend: {name} (expected one of {', '.join(NLP_BACKENDS)})")
+  if name != _backend:
+    _backend = name
+    unload('summarizer')
+    unload('generator')
+
+
+# Backwards compatible module attributes (`ner.nlp`, `ner.tokenizer`, ...)
+# resolve through the registry instead of being loaded at import.
+_LEGACY_ATTRS = {
+  'nlp': lambda: get_model('spacy'),
+  'tokenizer': lambda: get_model('summarizer')[0],
+  'model': lambda: get_model('summarizer')[1],
+  'generator': lambda: get_model('generator'),
+}
+
+def __getattr__(name):
+  if name in _LEGACY_ATTRS:
+    return _LEGACY_ATTRS[name]()
+  raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# ---------------------------------------------------------------------------
+# Micro-batching for summarize/generate
+# ---------------------------------------------------------------------------
+SUMMARY_KWARGS = dict(max_length=150, min_length=40, length_penalty=2.0, num_beams=4, early_stopping=True)
+GENERATOR_KWARGS = dict(max_length=999, num_return_sequences=1, truncation=True)
+# Longest wait for the next streamed piece before the stream gives up
+GENERATOR_STREAM_TIMEOUT = float(os.getenv('NLP_STREAM_TIMEOUT', '60'))
+
+_batch_config = {
+  'max_batch_size': int(os.getenv('NLP_BATCH_MAX_SIZE', '8')),
+  'max_wait_ms': float(os.getenv('NLP_BATCH_MAX_WAIT_MS', '10')),
+}
+_batchers = {}
+_batchers_lock = threading.Lock()
+
+
+def _summarize_batch(texts):
+  tokenizer, model = get_model('summarizer')
+  inputs = tokenizer(texts, return_tensors="pt", padding=True, truncation=True)
+  summary_ids = model.generate(inputs['input_ids'], attention_mask=inputs['attention_mask'], **SUMMARY_KWARGS)
+  return tokenizer.batch_decode(summary_ids, skip_special_tokens=True)
+
+def _generate_batch(texts):
+  generator = get_model('generator')
+  tok = generator.tokenizer
+  # GPT-2 has no pad token; pad on the left so generation continues the prompt
+  if tok.pad_token is None:
+    tok.pad_token = tok.eos_token
+  tok.padding_side = 'left'
+  results = generator(texts, batch_size=len(texts), pad_token_id=tok.pad_token_id, **GENERATOR_KWARGS)
+  return [r[0]['generated_text'] if r else 'No text generated' for r in results]
+
+_BATCH_FNS = {
+  'summarizer': _summarize_batch,
+  'generator': _generate_batch,
+}
+
+
+def configure_batching(max_batch_size=None, max_wait_ms=None):
+  """Change batching limits; existing batchers pick up the new values."""
+  with _batchers_lock:
+    if max_batch_size is not None:
+      _batch_config['max_batch_size'] = max(1, int(max_batch_size))
+    if max_wait_ms is not None:
+      _batch_config['max_wait_ms'] = max(0.0, float(max_wait_ms))
+    for b in _batchers.values():
+      b.max_batch_size = _batch_config['max_batch_size']
+      b.max_wait_ms = _batch_config['max_wait_ms']
+
+
+def get_batcher(name):
+  """Return the shared MicroBatcher for `summarizer` or `generator`."""
+  b = _batchers.get(name)
+  if b is not None:
+    return b
+  with _batchers_lock:
+    b = _batchers.get(name)
+    if b is None:
+      b = MicroBatcher(_BATCH_FNS[name], name=name, **_batch_config)
+      _batchers[name] = b
+    return b
+
+
+def batching_stats():
+  return {name: b.stats() for name, b in _batchers.items()}
+
+
+# ---------------------------------------------------------------------------
+# Result cache shared by the single-text endpoints
+# ---------------------------------------------------------------------------
+_cache = ResultCache(
+  max_entries=int(os.getenv('NLP_CACHE_SIZE', '1024')),
+  ttl_seconds=int(os.getenv('NLP_CACHE_TTL', '86400')),
+  disk_path=os.getenv('NLP_CACHE_PATH') or None,
+  max_disk_bytes=int(os.getenv('NLP_CACHE_MAX_DISK_MB', '256')) * 1024 * 1024,
+)
+
+def _is_success(resp):
+  return isinstance(resp, dict) and resp.get('status') == 200
+
+
+def configure_cache(max_entries=None, ttl_seconds=None, disk_path=None, max_disk_mb=None):
+  _cache.configure(
+    max_entries=max_entries,
+    ttl_seconds=ttl_seconds,
+    disk_path=disk_path or None,
+    max_disk_bytes=int(max_disk_mb) * 1024 * 1024 if max_disk_mb else None,
+  )
+
+
+def cache_stats():
+  return _cache.stats()
+
+
+def clear_cache():
+  _cache.clear()
+
+
+@_cache.cached('ner/tagging', SPACY_MODEL_ID, should_store=_is_success)
 def analyze_text(text):
   try:
+    nlp = get_model('spacy')
     doc = nlp(text)
-        
+
     # Extract basic NLP features
     entities = [{'text': ent.text, 'label': ent.label_} for ent in doc.ents]
     tokens = [{'text': token.text, 'lemma': token.lemma_, 'pos': token.pos_, 'tag': token.tag_} for token in doc]
@@ -33,12 +349,146 @@ def analyze_text(text):
     }
   else:
     return response
-  
-def analyze_summarize(text):
+
+# Fields callers can request from the tagging endpoints, and the spaCy
+# components each one needs. The parser is never required.
+TAGGING_FIELDS = ('entities', 'tokens', 'lemma', 'pos', 'tag')
+_FIELD_COMPONENTS = {
+  'entities': {'tok2vec', 'ner'},
+  'tokens': set(),
+  'lemma': {'tok2vec', 'tagger', 'attribute_ruler', 'lemmatizer'},
+  'pos': {'tok2vec', 'tagger', 'attribute_ruler'},
+  'tag': {'tok2vec', 'tagger'},
+}
+
+
+def _doc_to_dict(doc, fields):
+  data = {}
+  if 'entities' in fields:
+    data['entities'] = [{'text': ent.text, 'label': ent.label_} for ent in doc.ents]
+  token_attrs = [f for f in ('lemma', 'pos', 'tag') if f in fields]
+  if 'tokens' in fields or token_attrs:
+    data['tokens'] = [
+      dict({'text': token.text}, **{attr: getattr(token, attr + '_') for attr in token_attrs})
+      for token in doc
+    ]
+  return data
+
+
+def analyze_text_batch(texts, fields=TAGGING_FIELDS, batch_size=64, n_process=1):
+  """Tag many documents with `nlp.pipe`, returning only the requested fields.
+
+  Pipeline components not needed for `fields` are disabled, so asking for
+  entities alone skips the tagger, lemmatizer and parser.
+  """
   try:
-    inputs = tokenizer.encode(text, return_tensors="pt")
-    summary_ids = model.generate(inputs, max_length=150, min_length=40, length_penalty=2.0, num_beams=4, early_stopping=True)
-    summary = tokenizer.decode(summary_ids[0], skip_special_tokens=True)
+    fields = set(fields)
+    unknown = fields - set(TAGGING_FIELDS)
+    if unknown:
+      return {
+        'status': 400,
+        'message': f"Unknown fields: {', '.join(sorted(unknown))}",
+        'data': {}
+      }
+    nlp = get_model('spacy')
+    needed = set().union(*(_FIELD_COMPONENTS[f] for f in fields))
+    disable = [name for name in nlp.pipe_names if name not in needed]
+    docs = nlp.pipe(texts, batch_size=batch_size, n_process=n_process, disable=disable)
+    results = [_doc_to_dict(doc, fields) for doc in docs]
+
+    response = {
+      'status': 200,
+      'message': '',
+      'data': {
+        'results': results,
+        'count': len(results)
+      }
+    }
+  except Exception as e:
+    return {
+      'status': 500,
+      'message': f"An unexpected error occurred: {e}",
+      'data': {}
+    }
+  else:
+    return response
+
+# ---------------------------------------------------------------------------
+# Long-document (map-reduce) summarization
+# ---------------------------------------------------------------------------
+MAX_REDUCE_LEVELS = 5
+
+
+def _summary_window(tokenizer):
+  """Input tokens per summarizer call, leaving room for special tokens."""
+  return min(tokenizer.model_max_length, 1024) - 16
+
+def _token_count(tokenizer, text):
+  return len(tokenizer(text, add_special_tokens=False, verbose=False)['input_ids'])
+
+def _token_windows(n_tokens, size, overlap):
+  """(start, end) spans of at most `size` tokens, consecutive spans sharing `overlap`."""
+  step = max(1, size - overlap)
+  spans = []
+  start = 0
+  while True:
+    end = min(start + size, n_tokens)
+    spans.append((start, end))
+    if end >= n_tokens:
+      return spans
+    start += step
+
+
+def iter_summarize_long(text, chunk_tokens=None, overlap=64, batch_size=4):
+  """Map-reduce summarization yielding progress events and a final summary.
+
+  The text is split into overlapping token-bounded chunks, which are
+  summarized `batch_size` at a time; the joined chunk summaries are then
+  summarized again until they fit in a single pass. Only one batch of
+  decoded chunks is held at a time, so peak memory does not grow with the
+  input. Yields `{'event': 'progress', ...}` dicts and finally
+  `{'event': 'summary', 'summary': ..., 'levels': n}`.
+  """
+  tokenizer, _ = get_model('summarizer')
+  window = _summary_window(tokenizer)
+  limit = max(64, min(chunk_tokens or window, window))
+  overlap = max(0, min(overlap, limit // 2))
+  batch_size = max(1, batch_size)
+
+  level = 0
+  while True:
+    ids = tokenizer(text, add_special_tokens=False, verbose=False)['input_ids']
+    if len(ids) <= limit or level >= MAX_REDUCE_LEVELS:
+      # the final pass truncates if the reduce levels are exhausted
+      summary = _summarize_batch([text])[0]
+      yield {'event': 'summary', 'summary': summary, 'levels': level + 1}
+      return
+    spans = _token_windows(len(ids), limit, overlap)
+    summaries = []
+    for start in range(0, len(spans), batch_size):
+      chunks = [tokenizer.decode(ids[a:b], skip_special_tokens=True) for a, b in spans[start:start + batch_size]]
+      summaries.extend(_summarize_batch(chunks))
+      yield {'event': 'progress', 'level': level, 'done': len(summaries), 'total': len(spans)}
+    text = '\n'.join(summaries)
+    level += 1
+
+
+@_cache.cached('ner/summarize', lambda: f'{SUMMARIZER_MODEL_ID}@{_backend}', SUMMARY_KWARGS, should_store=_is_success)
+def analyze_summarize(text, chunk_tokens=None, overlap=64, batch_size=4):
+  try:
+    tokenizer, _ = get_model('summarizer')
+    # same bound as iter_summarize_long, so nothing longer than one window
+    # takes the single-pass path and gets truncated
+    window = _summary_window(tokenizer)
+    limit = max(64, min(chunk_tokens or window, window))
+    if _token_count(tokenizer, text) <= limit:
+      summary = get_batcher('summarizer')(text)
+    else:
+      # too long for one pass: map-reduce over token-bounded chunks
+      summary = None
+      for event in iter_summarize_long(text, chunk_tokens=limit, overlap=overlap, batch_size=batch_size):
+        if event['event'] == 'summary':
+          summary = event['summary']
 
     response = {
       'status': 200,
@@ -55,11 +505,11 @@ def analyze_summarize(text):
     }
   else:
     return response
-  
+
+@_cache.cached('ner/sentiment', 'vader', should_store=_is_success)
 def analyze_sentiment(text):
   try:
-    # Initialize the VADER sentiment analyzer
-    sia = SentimentIntensityAnalyzer()
+    sia = get_model('sentiment')
     # Perform sentiment analysis
     sentiment = sia.polarity_scores(text)
 
@@ -80,16 +530,82 @@ def analyze_sentiment(text):
   else:
     return response
 
+_SENTENCE_RE = re.compile(r'(?<=[.!?])\s+')
+_SCORE_KEYS = ('neg', 'neu', 'pos', 'compound')
+
+
+def split_sentences(text):
+  """Split on sentence-final punctuation; avoids needing nltk's punkt data."""
+  return [s for s in (part.strip() for part in _SENTENCE_RE.split(text)) if s]
+
+
+def _aggregate_scores(scores):
+  if not scores:
+    return {k: 0.0 for k in _SCORE_KEYS}
+  n = len(scores)
+  return {k: round(sum(s[k] for s in scores) / n, 4) for k in _SCORE_KEYS}
+
+
+def analyze_sentiment_batch(texts, split=False, include_sentences=False):
+  """Score many texts with the shared VADER analyzer.
+
+  With `split=True` each text is split into sentences, every sentence is
+  scored and the document score is the mean over its sentences. Identical
+  sentences within a batch are scored once.
+  """
+  try:
+    polarity_scores = get_model('sentiment').polarity_scores
+    memo = {}
+
+    def _score(s):
+      res = memo.get(s)
+      if res is None:
+        res = memo[s] = polarity_scores(s)
+      return res
+
+    results = []
+    total_sentences = 0
+    for text in texts:
+      if not split:
+        results.append({'sentiment': _score(text)})
+        total_sentences += 1
+        continue
+      sentences = split_sentences(text)
+      scores = [_score(s) for s in sentences]
+      total_sentences += len(sentences)
+      item = {'sentiment': _aggregate_scores(scores), 'sentences': len(sentences)}
+      if include_sentences:
+        item['sentence_scores'] = [{'text': s, 'sentiment': sc} for s, sc in zip(sentences, scores)]
+      results.append(item)
+
+    response = {
+      'status': 200,
+      'message': '',
+      'data': {
+        'results': results,
+        'count': len(results),
+        'sentences': total_sentences
+      }
+    }
+  except Exception as e:
+    return {
+      'status': 500,
+      'message': f"An unexpected error occurred: {e}",
+      'data': {}
+    }
+  else:
+    return response
+
 def text_generator(text):
   try:
-    # Generate the text
-    result = generator(text, max_length=999, num_return_sequences=1, truncation=True)
+    # Generate the text (batched with concurrent requests)
+    result = get_batcher('generator')(text)
 
     response = {
       'status': 200,
       'message': '',
       'data': {
-        'result': result[0]['generated_text'] if result else 'No text generated'
+        'result': result
       }
     }
   except Exception as e:
@@ -100,3 +616,54 @@ def text_generator(text):
     }
   else:
     return response
+
+def stream_text_generator(text):
+  """Yield generated text pieces as GPT-2 produces them.
+
+  Generation runs in a background thread feeding a `TextIteratorStreamer`;
+  only the continuation is streamed, not the echoed prompt. Closing the
+  iterator early stops generation.
+  """
+  from transformers import TextIteratorStreamer, StoppingCriteria, StoppingCriteriaList
+
+  cancelled = threading.Event()
+
+  class _StopWhenCancelled(StoppingCriteria):
+    def __call__(self, input_ids, scores, **kwargs):
+      return cancelled.is_set()
+
+  generator = get_model('generator')
+  tok, model = generator.tokenizer, generator.model
+  inputs = tok(text, return_tensors="pt", truncation=True)
+  streamer = TextIteratorStreamer(tok, skip_prompt=True, skip_special_tokens=True, timeout=GENERATOR_STREAM_TIMEOUT)
+  gen_kwargs = dict(
+    inputs,
+    streamer=streamer,
+    max_length=GENERATOR_KWARGS['max_length'],
+    pad_token_id=tok.eos_token_id,
+    stopping_criteria=StoppingCriteriaList([_StopWhenCancelled()]),
+  )
+  failure = []
+
+  def _generate():
+    try:
+      model.generate(**gen_kwargs)
+    except Exception as e:
+      # end the stream so the consumer wakes up and re-raises
+      failure.append(e)
+      streamer.end()
+
+  worker = threading.Thread(target=_generate, name='generator-stream', daemon=True)
+  worker.start()
+  try:
+    try:
+      for piece in streamer:
+        yield piece
+    except queue.Empty:
+      raise TimeoutError(f'No generated text for {GENERATOR_STREAM_TIMEOUT:g}s') from None
+    if failure:
+      raise failure[0]
+  finally:
+    # stop generating if the client went away before the end
+    cancelled.set()
+    worker.join(GENERATOR_STREAM_TIMEOUT)
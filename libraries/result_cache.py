@@ -0,0 +1,231 @@
+"""Content-addressed result cache with an in-process LRU and optional SQLite tier.
+
+Keys are a SHA-256 of (namespace, model id, parameters, normalized input), so
+identical requests share a result regardless of which worker computed it
+when the disk tier is enabled. Values must be JSON-serializable; they are
+stored serialized, so every lookup returns a fresh copy that callers may
+modify.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from functools import wraps
+
+
+def normalize_text(text, strip=True):
+    """Canonical form used for cache keys (NFC, surrounding whitespace removed unless `strip` is False)."""
+    if not isinstance(text, str):
+        return text
+    text = unicodedata.normalize('NFC', text)
+    return text.strip() if strip else text
+
+
+def make_key(namespace, model_id, params, payload):
+    raw = json.dumps([namespace, model_id, params, payload], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class _SQLiteTier:
+    """Size-bounded on-disk tier shared by every process using the same file."""
+
+    _EVICT_EVERY = 64
+
+    def __init__(self, path, max_bytes):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._puts = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=5)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            ' key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL,'
+            ' accessed REAL NOT NULL, size INTEGER NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS cache_accessed ON cache(accessed)')
+        self._conn.commit()
+
+    def get(self, key, now):
+        """Return (value, expires) for a live row, or None."""
+        with self._lock:
+            row = self._conn.execute('SELECT value, expires FROM cache WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            value, expires = row
+            if expires is not None and expires <= now:
+                self._conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute('UPDATE cache SET accessed = ? WHERE key = ?', (now, key))
+            self._conn.commit()
+            return value, expires
+
+    def put(self, key, value, expires, now):
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO cache (key, value, expires, accessed, size) VALUES (?, ?, ?, ?, ?)',
+                (key, value, expires, now, len(value)),
+            )
+            self._puts += 1
+            if self._puts % self._EVICT_EVERY == 0:
+                self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now):
+        self._conn.execute('DELETE FROM cache WHERE expires IS NOT NULL AND expires <= ?', (now,))
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM cache').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # drop least recently used rows until we are back under 90% of the budget
+        target = total - int(self.max_bytes * 0.9)
+        freed = 0
+        doomed = []
+        for key, size in self._conn.execute('SELECT key, size FROM cache ORDER BY accessed'):
+            doomed.append((key,))
+            freed += size
+            if freed >= target:
+                break
+        self._conn.executemany('DELETE FROM cache WHERE key = ?', doomed)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM cache')
+            self._conn.commit()
+
+    def stats(self):
+        with self._lock:
+            count, size = self._conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache').fetchone()
+        return {'path': self.path, 'entries': count, 'bytes': size, 'max_bytes': self.max_bytes}
+
+
+class ResultCache:
+    """Two-tier cache: in-process LRU in front of an optional SQLite file."""
+
+    def __init__(self, max_entries=1024, ttl_seconds=86400, disk_path=None, max_disk_bytes=256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = _SQLiteTier(disk_path, max_disk_bytes) if disk_path else None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+
+    def configure(self, max_entries=None, ttl_seconds=None, disk_path=None, max_disk_bytes=None):
+        """Update limits in place; a new `disk_path` opens (or switches) the disk tier."""
+        if max_entries is not None:
+            with self._lock:
+                self.max_entries = max(1, int(max_entries))
+                while len(self._lru) > self.max_entries:
+                    self._lru.popitem(last=False)
+        if ttl_seconds is not None:
+            self.ttl_seconds = ttl_seconds
+        if disk_path and (self._disk is None or self._disk.path != disk_path):
+            self._disk = _SQLiteTier(disk_path, max_disk_bytes or 256 * 1024 * 1024)
+        elif self._disk is not None and max_disk_bytes is not None:
+            self._disk.max_bytes = max_disk_bytes
+
+    def _expiry(self, now):
+        return now + self.ttl_seconds if self.ttl_seconds else None
+
+    def get(self, key):
+        """Return the cached value for `key` or None."""
+        now = time.time()
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None:
+                raw, expires = entry
+                if expires is None or expires > now:
+                    self._lru.move_to_end(key)
+                    self.hits += 1
+                    return json.loads(raw)
+                del self._lru[key]
+        if self._disk is not None:
+            row = self._disk.get(key, now)
+            if row is not None:
+                raw, expires = row
+                # keep the stored expiry; promotion must not extend the TTL
+                self._store_memory(key, raw, expires)
+                with self._lock:
+                    self.disk_hits += 1
+                return json.loads(raw)
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _store_memory(self, key, raw, expires):
+        with self._lock:
+            self._lru[key] = (raw, expires)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    def put(self, key, value):
+        now = time.time()
+        expires = self._expiry(now)
+        raw = json.dumps(value, ensure_ascii=False)
+        self._store_memory(key, raw, expires)
+        if self._disk is not None:
+            self._disk.put(key, raw, expires, now)
+
+    def clear(self):
+        with self._lock:
+            self._lru.clear()
+        if self._disk is not None:
+            self._disk.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            data = {
+                'entries': len(self._lru),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'bypassed': self.bypassed,
+                'hit_rate': round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            }
+        data['disk'] = self._disk.stats() if self._disk is not None else None
+        return data
+
+    def cached(self, namespace, model_id, params=None, should_store=None):
+        """Decorator caching `f(payload, **kwargs)` keyed on the NFC-normalized payload.
+
+        `f` is called with that same normalized payload, so everything sharing
+        a key gets the same answer. Surrounding whitespace is kept: it can
+        change the result (e.g. token offsets).
+
+        `model_id` may be a callable, evaluated per call, for model identities
+        that can change at runtime (e.g. a switchable backend). The wrapped
+        function gains a `use_cache` keyword (default True); pass
+        False to bypass both lookup and store. `should_store(result)` decides
+        whether a computed result is kept (e.g. only successful responses).
+        """
+        def decorator(f):
+            @wraps(f)
+            def wrapper(payload, *args, use_cache=True, **kwargs):
+                if not use_cache:
+                    with self._lock:
+                        self.bypassed += 1
+                    return f(payload, *args, **kwargs)
+                mid = model_id() if callable(model_id) else model_id
+                payload = normalize_text(payload, strip=False)
+                key = make_key(namespace, mid, dict(params or {}, **kwargs), payload)
+                hit = self.get(key)
+                if hit is not None:
+                    return hit
+                result = f(payload, *args, **kwargs)
+                if should_store is None or should_store(result):
+                    self.put(key, result)
+                return result
+            return wrapper
+        return decorator
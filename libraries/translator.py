@@ -2,30 +2,158 @@
 
 This module provides simple wrappers around existing aksara modules and the
 Morse utility. It also allows registering additional script mappings.
+
+Every script name resolves once to a `ScriptConverter` holding its
+conversion callables; later calls are a dict lookup. Sources, in order of
+precedence:
+- mappings passed to `register_mapping` at runtime
+- built-in converters (`morse` and the `libraries/aksara_<name>.py` modules)
+- plugins exposed through the `games.translator_scripts` entry point group,
+  each resolving to a `Latin -> script` callable or to a module laid out like
+  the aksara modules
 """
-from typing import Dict
+from typing import Callable, Dict, List, Optional
+import logging
+import os
+import pkgutil
+import threading
 import unicodedata
 
-from importlib import import_module
+from importlib import import_module, metadata
 
 from . import morse
+from .aksara_engine import MappingTransliterator, invert
+
+ENTRY_POINT_GROUP = 'games.translator_scripts'
+
+_logger = logging.getLogger(__name__)
+
+
+class ScriptConverter:
+    """A script name resolved to its Latin <-> script callables."""
+
+    __slots__ = ('name', 'forward', 'reverse', 'source')
+
+    def __init__(self, name: str, forward: Callable[[str], str],
+                 reverse: Optional[Callable[[str], str]] = None, source: str = 'builtin'):
+        self.name = name
+        self.forward = forward
+        self.reverse = reverse
+        self.source = source
 
-_MAPPINGS: Dict[str, Dict[str, str]] = {}
+    def info(self) -> dict:
+        return {'name': self.name, 'source': self.source, 'reversible': self.reverse is not None}
+
+
+_REGISTRY: Dict[str, ScriptConverter] = {
+    'morse': ScriptConverter('morse', morse.encode, lambda t: morse.decode(t).lower()),
+}
+_registry_lock = threading.Lock()
+_loaded = False
 
 
 def _try_load_module(name: str):
     try:
-        return import_module(f"libraries.aksara_{name}")
+        return import_module(f".aksara_{name}", __package__)
     except Exception:
         return None
 
 
+def _unwrap(func: Callable) -> Callable[[str], str]:
+    """Adapt `to_aksara_<name>`-style functions that return a JSON response dict."""
+    def convert(text: str) -> str:
+        res = func(text)
+        if isinstance(res, dict):
+            return res.get('data', {}).get('result', '')
+        return res
+    return convert
+
+
+def _mapping_converter(name: str, mapping: Dict[str, str], source: str) -> ScriptConverter:
+    # longest-key-first matching so digraphs (ng, ny) are handled
+    return ScriptConverter(name, MappingTransliterator(mapping).transliterate,
+                           MappingTransliterator(invert(mapping)).transliterate, source)
+
+
+def _converter_from_module(name: str, mod, source: str) -> Optional[ScriptConverter]:
+    """Resolve the conversion functions a module exposes, once."""
+    reverse = getattr(mod, f"from_aksara_{name}", None)
+    reverse = _unwrap(reverse) if reverse is not None else None
+    if hasattr(mod, 'latin_to_aksara'):
+        return ScriptConverter(name, mod.latin_to_aksara, reverse, source)
+    func = getattr(mod, f"to_aksara_{name}", None)
+    if func is not None:
+        return ScriptConverter(name, _unwrap(func), reverse, source)
+    if hasattr(mod, 'MAPPING'):
+        return _mapping_converter(name, mod.MAPPING, source)
+    return None
+
+
+def _load_plugin(ep) -> Optional[ScriptConverter]:
+    obj = ep.load()
+    name = ep.name.lower()
+    if isinstance(obj, ScriptConverter):
+        obj.source = 'plugin'
+        return obj
+    if callable(obj):
+        return ScriptConverter(name, obj, getattr(obj, 'reverse', None), 'plugin')
+    return _converter_from_module(name, obj, 'plugin')
+
+
+def _entry_points():
+    try:
+        return list(metadata.entry_points(group=ENTRY_POINT_GROUP))
+    except TypeError:  # Python < 3.10
+        return list(metadata.entry_points().get(ENTRY_POINT_GROUP, []))
+
+
+def load_scripts(plugins: bool = True) -> None:
+    """Resolve every built-in script (and plugin) into the registry.
+
+    Called once at startup (or on the first lookup); safe to call again,
+    already resolved names are kept.
+    """
+    global _loaded
+    with _registry_lock:
+        for info in pkgutil.iter_modules([os.path.dirname(os.path.abspath(__file__))]):
+            name = info.name[len('aksara_'):]
+            if info.name.startswith('aksara_') and name != 'engine' and name not in _REGISTRY:
+                mod = _try_load_module(name)
+                converter = _converter_from_module(name, mod, 'builtin') if mod else None
+                if converter is not None:
+                    _REGISTRY[name] = converter
+        if plugins:
+            for ep in _entry_points():
+                name = ep.name.lower()
+                if name in _REGISTRY:
+                    if _REGISTRY[name].source != 'plugin':
+                        _logger.warning('Translator plugin %s ignored: a built-in script has that name', ep.name)
+                    continue
+                try:
+                    converter = _load_plugin(ep)
+                except Exception as e:
+                    _logger.warning('Translator plugin %s failed to load: %s', ep.name, e)
+                    continue
+                if converter is not None:
+                    _REGISTRY[name] = converter
+        _loaded = True
+
+
+def get_converter(script: str) -> Optional[ScriptConverter]:
+    """Return the converter for `script` from the registry, or None."""
+    if not _loaded:
+        load_scripts()
+    return _REGISTRY.get(script.lower())
+
+
 def register_mapping(name: str, mapping: Dict[str, str]):
     """Register a character mapping for a named script.
 
     mapping should map latin characters (or strings) to target script strings.
     """
-    _MAPPINGS[name.lower()] = mapping
+    key = name.lower()
+    with _registry_lock:
+        _REGISTRY[key] = _mapping_converter(key, mapping, 'registered')
 
 
 def translate_to_script(script: str, text: str) -> str:
@@ -38,70 +166,49 @@ def translate_to_script(script: str, text: str) -> str:
     original text.
     """
     key = script.lower()
+    converter = get_converter(key)
     if key == 'morse':
-        return morse.encode(text)
+        return converter.forward(text)
 
     # normalize input
     if isinstance(text, str):
         text = unicodedata.normalize('NFKC', text).lower()
 
-    def _apply_mapping(mapping: Dict[str, str], txt: str) -> str:
-        # use longest-key-first matching so digraphs (ng, ny) are handled
-        keys = sorted(mapping.keys(), key=lambda k: -len(k))
-        i = 0
-        out = []
-        while i < len(txt):
-            matched = False
-            for k in keys:
-                if txt.startswith(k, i):
-                    out.append(mapping.get(k, k))
-                    i += len(k)
-                    matched = True
-                    break
-            if not matched:
-                out.append(txt[i])
-                i += 1
-        return ''.join(out)
-
-    # Check registered mappings
-    if key in _MAPPINGS:
-        mapping = _MAPPINGS[key]
-        return _apply_mapping(mapping, text)
-
-    # Try to load a module libraries/aksara_{script}
-    mod = _try_load_module(script)
-    if mod:
-        # support module-level conversion functions named like `to_aksara_<name>`
-        func_name = f"to_aksara_{script.lower()}"
-        if hasattr(mod, 'latin_to_aksara'):
-            try:
-                return mod.latin_to_aksara(text)
-            except Exception:
-                pass
-        if hasattr(mod, func_name):
-            try:
-                res = getattr(mod, func_name)(text)
-                if isinstance(res, dict):
-                    return res.get('data', {}).get('result', '')
-                return res
-            except Exception:
-                pass
-        if hasattr(mod, 'MAPPING'):
-            mapping = getattr(mod, 'MAPPING')
-            try:
-                return _apply_mapping(mapping, text)
-            except Exception:
-                # fallback to per-character mapping
-                return ''.join(mapping.get(ch, ch) for ch in text)
-
-    # Last-resort: return original text
-    return text
-
-
-def available_scripts():
-    names = set(_MAPPINGS.keys()) | {"morse"}
-    # scan common aksara modules
-    for name in ('bali', 'jawa', 'sunda'):
-        if _try_load_module(name):
-            names.add(name)
-    return sorted(names)
+    if converter is None:
+        # Last-resort: return original text
+        return text
+    try:
+        return converter.forward(text)
+    except Exception:
+        _logger.debug('Converter for %s failed', key, exc_info=True)
+        return text
+
+
+def translate_from_script(script: str, text: str) -> str:
+    """Inverse of `translate_to_script`: convert `text` in `script` back to Latin.
+
+    'morse' uses the morse decoder, aksara modules exposing
+    `from_aksara_<name>` (jawa, sunda, bali) use their precomputed reverse
+    tables, and registered mappings are inverted. Unknown scripts return
+    the text unchanged.
+    """
+    key = script.lower()
+    converter = get_converter(key)
+    if converter is None or converter.reverse is None:
+        return text
+    if key != 'morse' and isinstance(text, str):
+        text = unicodedata.normalize('NFC', text)
+    return converter.reverse(text)
+
+
+def available_scripts() -> List[str]:
+    if not _loaded:
+        load_scripts()
+    return sorted(_REGISTRY)
+
+
+def script_info() -> List[dict]:
+    """Describe every registered script, for `/translator/scripts`."""
+    if not _loaded:
+        load_scripts()
+    return [_REGISTRY[name].info() for name in sorted(_REGISTRY)]
@@ -0,0 +1,123 @@
+"""Process-wide cache of seq2seq translator models.
+
+Loading `models/translator.h5` with Keras and reading the vocabulary takes
+seconds, so resources are loaded once per (model path, tokenizer path) and
+reused. Each lookup compares file modification times and reloads when a
+file has been replaced, so retrained models are picked up without a
+restart.
+
+Per-target models live next to the default one as
+`models/translator_<target>.h5` and `models/tokenizers_<target>.vocab`;
+targets without their own files share the default pair. Legacy pickled
+`tokenizers*.pkl` files are still read when no `.vocab` file exists
+(convert them with `scripts/convert_tokenizers.py`).
+"""
+import logging
+import os
+import re
+import threading
+import time
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models')
+
+_logger = logging.getLogger(__name__)
+
+# (model_path, toks_path) -> {'mtimes': (...), 'model': ..., 'toks': ..., ...}
+_entries = {}
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def _load_resources(model_path, toks_path):
+    try:
+        from games.scripts.infer_translator import load_resources
+    except Exception:
+        from scripts.infer_translator import load_resources
+    return load_resources(model_path, toks_path)
+
+
+def model_paths(target=None):
+    """Return (model_path, toks_path) for `target`, or None if no model exists."""
+    suffixes = []
+    name = (target or '').lower()
+    # only plain script names may select a per-target file
+    if re.fullmatch(r'[a-z0-9_]+', name):
+        suffixes.append(f'_{name}')
+    suffixes.append('')
+    for suffix in suffixes:
+        model_path = os.path.join(MODELS_DIR, f'translator{suffix}.h5')
+        if not os.path.exists(model_path):
+            continue
+        for ext in ('vocab', 'pkl'):
+            toks_path = os.path.join(MODELS_DIR, f'tokenizers{suffix}.{ext}')
+            if os.path.exists(toks_path):
+                return model_path, toks_path
+    return None
+
+
+def _lock_for(key):
+    with _locks_guard:
+        return _locks.setdefault(key, threading.Lock())
+
+
+def get_resources(target=None):
+    """Return (model, toks) for `target`, loading or hot-reloading as needed.
+
+    Returns None when no trained model is available.
+    """
+    paths = model_paths(target)
+    if paths is None:
+        return None
+    mtimes = tuple(os.path.getmtime(p) for p in paths)
+    entry = _entries.get(paths)
+    if entry is not None and entry['mtimes'] == mtimes:
+        return entry['model'], entry['toks']
+    with _lock_for(paths):
+        entry = _entries.get(paths)
+        if entry is not None and entry['mtimes'] == mtimes:
+            return entry['model'], entry['toks']
+        started = time.perf_counter()
+        model, toks = _load_resources(*paths)
+        _entries[paths] = {
+            'mtimes': mtimes,
+            'model': model,
+            'toks': toks,
+            'load_seconds': round(time.perf_counter() - started, 3),
+            'loaded_at': time.time(),
+            'reloads': entry['reloads'] + 1 if entry is not None else 0,
+        }
+        if entry is not None:
+            _logger.info('Reloaded translator model %s (files changed)', paths[0])
+        return model, toks
+
+
+def warm_up(targets, background=True):
+    """Preload models for `targets`; failures are logged, not raised."""
+    def _run():
+        for target in targets:
+            try:
+                get_resources(target)
+            except Exception as e:
+                _logger.warning('Translator warm-up failed for %s: %s', target, e)
+
+    if background:
+        t = threading.Thread(target=_run, name='translator-warm-up', daemon=True)
+        t.start()
+        return t
+    _run()
+
+
+def clear():
+    _entries.clear()
+
+
+def cache_stats():
+    return {
+        os.path.basename(model_path): {
+            'tokenizers': os.path.basename(toks_path),
+            'load_seconds': e['load_seconds'],
+            'loaded_at': e['loaded_at'],
+            'reloads': e['reloads'],
+        }
+        for (model_path, toks_path), e in _entries.items()
+    }
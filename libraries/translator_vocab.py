@@ -0,0 +1,227 @@
+"""Compact, memory-mappable vocabulary files for the seq2seq translator.
+
+Replaces the pickled `tokenizers.pkl` dicts. A `.vocab` file is
+
+    b'TVOC' | version (u16) | reserved (u16) | header length (u32) | JSON header | arrays
+
+The JSON header holds the sequence lengths, the special tokens, where each
+array starts, and optionally a fingerprint of the model file it was saved
+with. The arrays are, for the input and the output vocabulary:
+
+- `codes`: the code points of the single-character tokens, sorted (uint32)
+- `ids`: the token id of each entry in `codes` (int32)
+- `itos`: the code point of each token id, 0 for padding and specials (uint32)
+
+Files are opened with `mmap`, so the arrays live in the page cache and are
+shared by every worker process instead of being unpickled into each one.
+Nothing is executed on load, unlike pickle.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+
+MAGIC = b'TVOC'
+VERSION = 1
+SPECIAL_TOKENS = ('<s>', '</s>')
+
+_PREAMBLE = struct.Struct('<4sHHI')
+_ALIGN = 8
+
+
+class VocabError(ValueError):
+    """Raised for unreadable vocab files or ones that do not fit the model."""
+
+
+def model_fingerprint(model_path):
+    """sha256 of the model file, recorded so mismatched pairs are caught on load."""
+    h = hashlib.sha256()
+    with open(model_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+class Vocab:
+    """One direction's token table, backed by (memory-mapped) arrays."""
+
+    def __init__(self, codes, ids, itos, specials):
+        self.codes = codes
+        self.ids = ids
+        self.itos_codes = itos
+        self.specials = specials
+        self._stoi = None
+        self._itos = None
+
+    def __len__(self):
+        return len(self.codes) + len(self.specials)
+
+    @property
+    def size(self):
+        """Embedding input dimension: tokens plus the padding id 0."""
+        return len(self.itos_codes)
+
+    def encode(self, text, maxlen=None):
+        """Token ids for `text` (0 for unknown characters), as an int32 array."""
+        if maxlen is not None:
+            text = text[:maxlen]
+        chars = np.frombuffer(text.encode('utf-32-le'), dtype='<u4')
+        pos = np.searchsorted(self.codes, chars)
+        pos = np.minimum(pos, max(len(self.codes) - 1, 0))
+        found = self.codes[pos] == chars if len(self.codes) else np.zeros(len(chars), dtype=bool)
+        return np.where(found, self.ids[pos], 0).astype('int32')
+
+    def decode(self, ids):
+        """Text for `ids`, skipping padding and special tokens."""
+        codes = self.itos_codes[np.asarray(ids, dtype='int64')]
+        return ''.join(map(chr, codes[codes != 0]))
+
+    # dict views for code written against the pickled tokenizers
+
+    @property
+    def stoi(self):
+        if self._stoi is None:
+            stoi = {chr(c): int(i) for c, i in zip(self.codes.tolist(), self.ids.tolist())}
+            stoi.update(self.specials)
+            self._stoi = stoi
+        return self._stoi
+
+    @property
+    def itos(self):
+        if self._itos is None:
+            self._itos = {i: c for c, i in self.stoi.items()}
+        return self._itos
+
+
+class VocabFile:
+    """A loaded `.vocab` file; also readable as the old tokenizers dict."""
+
+    def __init__(self, header, inp, out, path=None):
+        self.header = header
+        self.inp = inp
+        self.out = out
+        self.path = path
+        self.max_in = header['max_in']
+        self.max_out = header['max_out']
+
+    def __getitem__(self, key):
+        if key in ('max_in', 'max_out'):
+            return getattr(self, key)
+        side, _, kind = key.partition('_')
+        if side in ('inp', 'out') and kind in ('stoi', 'itos'):
+            return getattr(getattr(self, side), kind)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def check_model(self, model):
+        """Raise VocabError unless `model`'s embeddings and output layer fit these vocabularies."""
+        dims = sorted(getattr(l, 'input_dim', 0) for l in model.layers if type(l).__name__ == 'Embedding')
+        expected = sorted((self.inp.size, self.out.size))
+        if dims != expected:
+            raise VocabError(f'Vocabulary sizes {expected} do not match the model embeddings {dims}')
+        heads = [l for l in model.layers if type(l).__name__ == 'TimeDistributed']
+        if heads and getattr(heads[0].layer, 'units', self.out.size) != self.out.size:
+            raise VocabError(f'Output vocabulary has {self.out.size} ids but the model predicts {heads[0].layer.units}')
+
+
+def _table(stoi):
+    specials = {t: int(stoi[t]) for t in SPECIAL_TOKENS if t in stoi}
+    singles = sorted((ord(t), int(i)) for t, i in stoi.items() if t not in specials)
+    if any(len(t) != 1 for t, _ in stoi.items() if t not in specials):
+        raise VocabError('Only single characters and <s>/</s> are supported as tokens')
+    size = max([0] + [int(i) for i in stoi.values()]) + 1
+    itos = np.zeros(size, dtype='<u4')
+    for code, i in singles:
+        itos[i] = code
+    codes = np.array([c for c, _ in singles], dtype='<u4')
+    ids = np.array([i for _, i in singles], dtype='<i4')
+    return codes, ids, itos, specials
+
+
+def save_vocab(path, toks, model_path=None):
+    """Write `toks` (a tokenizers dict with inp_stoi/out_stoi/max_in/max_out) to `path`."""
+    arrays = []
+    header = {'version': VERSION, 'max_in': int(toks['max_in']), 'max_out': int(toks['max_out']), 'tables': {}}
+    for side in ('inp', 'out'):
+        codes, ids, itos, specials = _table(toks[f'{side}_stoi'])
+        header['tables'][side] = {'specials': specials}
+        arrays.extend(((side, 'codes', codes), (side, 'ids', ids), (side, 'itos', itos)))
+    if model_path:
+        header['model_sha256'] = model_fingerprint(model_path)
+
+    # offsets are relative to the start of the array section
+    offset = 0
+    for side, name, arr in arrays:
+        header['tables'][side][name] = {'offset': offset, 'count': int(arr.size), 'dtype': arr.dtype.str}
+        offset += -(-arr.nbytes // _ALIGN) * _ALIGN
+
+    raw = json.dumps(header, ensure_ascii=False, sort_keys=True).encode('utf-8')
+    start = _PREAMBLE.size + len(raw)
+    pad = -start % _ALIGN
+    tmp = f'{path}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(_PREAMBLE.pack(MAGIC, VERSION, 0, len(raw) + pad))
+        f.write(raw + b' ' * pad)
+        for _, _, arr in arrays:
+            f.write(arr.tobytes())
+            f.write(b'\0' * (-arr.nbytes % _ALIGN))
+    os.replace(tmp, path)
+
+
+def load_vocab(path, model_path=None):
+    """Memory-map a `.vocab` file, checking its format and, if recorded, the model fingerprint."""
+    with open(path, 'rb') as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as e:  # empty file
+            raise VocabError(f'{path} is not a vocab file') from e
+    if len(buf) < _PREAMBLE.size:
+        raise VocabError(f'{path} is not a vocab file')
+    magic, version, _, header_len = _PREAMBLE.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise VocabError(f'{path} is not a vocab file')
+    if version > VERSION:
+        raise VocabError(f'{path} uses vocab format {version}; this code reads up to {VERSION}')
+    try:
+        header = json.loads(bytes(buf[_PREAMBLE.size:_PREAMBLE.size + header_len]))
+    except ValueError as e:
+        raise VocabError(f'{path} has a corrupt header') from e
+    base = _PREAMBLE.size + header_len
+
+    if model_path and header.get('model_sha256') and header['model_sha256'] != model_fingerprint(model_path):
+        raise VocabError(f'{path} was saved with a different model than {model_path}')
+
+    def array(spec):
+        start = base + spec['offset']
+        dtype = np.dtype(spec['dtype'])
+        if start + spec['count'] * dtype.itemsize > len(buf):
+            raise VocabError(f'{path} is truncated')
+        return np.frombuffer(buf, dtype=dtype, count=spec['count'], offset=start)
+
+    sides = []
+    for side in ('inp', 'out'):
+        table = header['tables'][side]
+        sides.append(Vocab(array(table['codes']), array(table['ids']), array(table['itos']), table['specials']))
+    return VocabFile(header, *sides, path=path)
+
+
+def load_pickle(path):
+    """Read a legacy `tokenizers.pkl` (only for conversion and old deployments)."""
+    import pickle
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def load_tokenizers(path, model_path=None):
+    """Load tokenizers from a `.vocab` file, or a legacy pickle by extension."""
+    if path.endswith('.pkl'):
+        return load_pickle(path)
+    return load_vocab(path, model_path)
@@ -0,0 +1,225 @@
+"""
+Rate limit storage backends.
+
+All backends implement a sliding-window counter: each key keeps only the
+request count of the current and the previous fixed window, and the
+effective count is `previous * (1 - elapsed_fraction) + current`. That is
+O(1) work and memory per key regardless of traffic, unlike keeping a list
+of timestamps.
+
+Backends are selected by `RATELIMIT_STORAGE_URL`:
+- `memory://`                 in-process dict with periodic eviction of idle keys
+- `sqlite:///path/to/file.db` shared by all workers on one host
+- `redis://host:port/0`       shared across hosts (needs the `redis` package)
+"""
+import math
+import os
+import sqlite3
+import threading
+import time
+
+
+class RateLimitResult:
+    """Outcome of one rate limit check."""
+
+    __slots__ = ('allowed', 'limit', 'remaining', 'reset_at')
+
+    def __init__(self, allowed, limit, remaining, reset_at):
+        self.allowed = allowed
+        self.limit = limit
+        self.remaining = remaining
+        self.reset_at = reset_at
+
+    @property
+    def retry_after(self):
+        """Seconds until the next request could succeed (0 when allowed)."""
+        if self.allowed:
+            return 0
+        return max(1, int(math.ceil(self.reset_at - time.time())))
+
+
+def _window_state(now, window):
+    idx = int(now // window)
+    elapsed = (now - idx * window) / window
+    return idx, elapsed
+
+
+def _decide(current, previous, limit, window, idx, elapsed):
+    """Apply the sliding-window estimate; returns (allowed, remaining, reset_at).
+
+    `reset_at` is the end of the current window for allowed requests and
+    the earliest time another request would be accepted for rejected ones.
+    """
+    weighted = previous * (1.0 - elapsed) + current
+    allowed = weighted + 1 <= limit
+    if allowed:
+        weighted += 1
+        return True, max(0, int(limit - weighted)), (idx + 1) * window
+    if current + 1 <= limit and previous > 0:
+        # the previous window's share decays enough later in this window
+        frac = 1.0 - (limit - 1 - current) / previous
+        return False, 0, (idx + frac) * window
+    # wait for the next window, where this window's count decays instead
+    frac = 1.0 - (limit - 1) / current if current else 0.0
+    return False, 0, (idx + 1 + max(0.0, frac)) * window
+
+
+class MemoryStorage:
+    """Per-process storage; idle keys are swept every `sweep_interval` seconds."""
+
+    def __init__(self, sweep_interval=60.0):
+        self._data = {}
+        self._lock = threading.Lock()
+        self.sweep_interval = sweep_interval
+        self._next_sweep = time.time() + sweep_interval
+
+    def hit(self, key, limit, window, now=None):
+        now = time.time() if now is None else now
+        idx, elapsed = _window_state(now, window)
+        with self._lock:
+            if now >= self._next_sweep:
+                self._sweep(now)
+            entry = self._data.get((key, window))
+            if entry is None:
+                current, previous = 0, 0
+            elif entry[0] == idx:
+                current, previous = entry[1], entry[2]
+            elif entry[0] == idx - 1:
+                current, previous = 0, entry[1]
+            else:
+                current, previous = 0, 0
+            allowed, remaining, reset_at = _decide(current, previous, limit, window, idx, elapsed)
+            if allowed:
+                current += 1
+            self._data[(key, window)] = (idx, current, previous, now + 2 * window)
+        return RateLimitResult(allowed, limit, remaining, reset_at)
+
+    def _sweep(self, now):
+        expired = [k for k, v in self._data.items() if v[3] <= now]
+        for k in expired:
+            del self._data[k]
+        self._next_sweep = now + self.sweep_interval
+
+    def __len__(self):
+        return len(self._data)
+
+    def reset(self):
+        with self._lock:
+            self._data.clear()
+
+
+class SQLiteStorage:
+    """File-backed storage shared by every worker process on the host."""
+
+    _SWEEP_EVERY = 1000
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self._hits = 0
+
+    def _connection(self):
+        # connections must not be shared across fork (e.g. gunicorn --preload)
+        if self._conn is None or self._pid != os.getpid():
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS ratelimit ('
+                ' key TEXT NOT NULL, window INTEGER NOT NULL, idx INTEGER NOT NULL,'
+                ' count INTEGER NOT NULL, expires REAL NOT NULL,'
+                ' PRIMARY KEY (key, window, idx))'
+            )
+            self._pid = os.getpid()
+        return self._conn
+
+    def hit(self, key, limit, window, now=None):
+        now = time.time() if now is None else now
+        idx, elapsed = _window_state(now, window)
+        with self._lock:
+            conn = self._connection()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                rows = dict(conn.execute(
+                    'SELECT idx, count FROM ratelimit WHERE key = ? AND window = ? AND idx IN (?, ?)',
+                    (key, window, idx, idx - 1),
+                ).fetchall())
+                allowed, remaining, reset_at = _decide(rows.get(idx, 0), rows.get(idx - 1, 0), limit, window, idx, elapsed)
+                if allowed:
+                    conn.execute(
+                        'INSERT INTO ratelimit (key, window, idx, count, expires) VALUES (?, ?, ?, 1, ?)'
+                        ' ON CONFLICT(key, window, idx) DO UPDATE SET count = count + 1',
+                        (key, window, idx, (idx + 2) * window),
+                    )
+                self._hits += 1
+                if self._hits % self._SWEEP_EVERY == 0:
+                    conn.execute('DELETE FROM ratelimit WHERE expires <= ?', (now,))
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        return RateLimitResult(allowed, limit, remaining, reset_at)
+
+    def reset(self):
+        with self._lock:
+            self._connection().execute('DELETE FROM ratelimit')
+
+
+class RedisStorage:
+    """Storage on a Redis server (or anything speaking its commands).
+
+    `client` must provide `pipeline()` with `incr`, `expire`, `get` and
+    `execute`, plus `decr`; `redis.Redis` does, and tests can pass a
+    small stand-in.
+    """
+
+    def __init__(self, client, prefix='ratelimit'):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError('RATELIMIT_STORAGE_URL uses redis:// but the redis package is not installed') from e
+        return cls(redis.Redis.from_url(url))
+
+    def hit(self, key, limit, window, now=None):
+        now = time.time() if now is None else now
+        idx, elapsed = _window_state(now, window)
+        cur_key = f'{self.prefix}:{key}:{window}:{idx}'
+        prev_key = f'{self.prefix}:{key}:{window}:{idx - 1}'
+        pipe = self.client.pipeline()
+        pipe.incr(cur_key)
+        pipe.expire(cur_key, 2 * window)
+        pipe.get(prev_key)
+        current, _, previous = pipe.execute()
+        current = int(current)
+        previous = int(previous or 0)
+        # the increment already happened; judge the request as if it had not
+        allowed, remaining, reset_at = _decide(current - 1, previous, limit, window, idx, elapsed)
+        if not allowed:
+            self.client.decr(cur_key)
+        return RateLimitResult(allowed, limit, remaining, reset_at)
+
+    def reset(self):
+        for k in self.client.scan_iter(f'{self.prefix}:*'):
+            self.client.delete(k)
+
+
+def storage_from_url(url):
+    """Build a storage backend from a `RATELIMIT_STORAGE_URL` value."""
+    url = (url or 'memory://').strip()
+    if url.startswith('memory://'):
+        return MemoryStorage()
+    if url.startswith('sqlite://'):
+        # sqlite:///relative.db or sqlite:////absolute/path.db
+        path = url[len('sqlite:///'):] if url.startswith('sqlite:///') else url[len('sqlite://'):]
+        return SQLiteStorage(path or 'ratelimit.db')
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisStorage.from_url(url)
+    raise ValueError(f'Unsupported RATELIMIT_STORAGE_URL: {url}')
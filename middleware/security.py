@@ -3,13 +3,40 @@ Security middleware for Flask application.
 Provides rate limiting, input validation, and security headers.
 """
 from functools import wraps
-from flask import request, jsonify, g
-import time
+from flask import request, jsonify, g, current_app, has_app_context, make_response
+import math
+import os
 import re
-from collections import defaultdict
+import threading
 
-# In-memory rate limiting storage (use Redis in production)
-rate_limit_storage = defaultdict(list)
+from .rate_limit_storage import storage_from_url
+
+# Rate limit storage, built on first use from RATELIMIT_STORAGE_URL
+_rate_limit_storage = None
+_rate_limit_storage_lock = threading.Lock()
+
+def get_rate_limit_storage():
+    """Return the configured rate limit backend, creating it on first use."""
+    global _rate_limit_storage
+    if _rate_limit_storage is None:
+        with _rate_limit_storage_lock:
+            if _rate_limit_storage is None:
+                if has_app_context():
+                    url = current_app.config.get('RATELIMIT_STORAGE_URL')
+                else:
+                    url = os.getenv('RATELIMIT_STORAGE_URL') or os.getenv('REDIS_URL')
+                _rate_limit_storage = storage_from_url(url)
+    return _rate_limit_storage
+
+def set_rate_limit_storage(storage):
+    """Replace the rate limit backend (a storage object or a storage URL).
+
+    Passing None drops the current backend so the next request rebuilds it
+    from configuration.
+    """
+    global _rate_limit_storage
+    with _rate_limit_storage_lock:
+        _rate_limit_storage = storage_from_url(storage) if isinstance(storage, str) else storage
 
 def get_client_ip():
     """Get client IP address, handling proxies."""
@@ -17,38 +44,42 @@ def get_client_ip():
         return request.headers.get('X-Forwarded-For').split(',')[0].strip()
     return request.remote_addr or '127.0.0.1'
 
-def rate_limit(max_requests=100, window_seconds=3600):
+def rate_limit(max_requests=100, window_seconds=3600, scope=None):
     """
     Rate limiting decorator.
     
+    Limits are tracked per (route, client), so traffic on one endpoint does
+    not consume another endpoint's budget. Responses carry
+    X-RateLimit-Limit/Remaining/Reset headers, plus Retry-After when the
+    limit is exceeded.
+    
     Args:
         max_requests: Maximum number of requests allowed in the window
         window_seconds: Time window in seconds
+        scope: Bucket name; defaults to the route's endpoint. Routes sharing
+            a scope share a budget.
     """
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            client_ip = get_client_ip()
-            current_time = time.time()
-            window_start = current_time - window_seconds
-            
-            # Clean old entries
-            rate_limit_storage[client_ip] = [
-                t for t in rate_limit_storage[client_ip] 
-                if t > window_start
-            ]
+            bucket = scope or request.endpoint or f.__name__
+            key = f"{bucket}:{get_client_ip()}"
+            result = get_rate_limit_storage().hit(key, max_requests, window_seconds)
             
             # Check rate limit
-            if len(rate_limit_storage[client_ip]) >= max_requests:
-                return jsonify({
+            if not result.allowed:
+                response = make_response(jsonify({
                     'status': 429,
                     'message': 'Rate limit exceeded. Please try again later.'
-                }), 429
-            
-            # Record this request
-            rate_limit_storage[client_ip].append(current_time)
+                }), 429)
+                response.headers['Retry-After'] = str(result.retry_after)
+            else:
+                response = make_response(f(*args, **kwargs))
             
-            return f(*args, **kwargs)
+            response.headers['X-RateLimit-Limit'] = str(result.limit)
+            response.headers['X-RateLimit-Remaining'] = str(result.remaining)
+            response.headers['X-RateLimit-Reset'] = str(int(math.ceil(result.reset_at)))
+            return response
         return decorated_function
     return decorator
 
@@ -0,0 +1,66 @@
+"""
+Streaming response helpers.
+Turns an iterator of text chunks into Server-Sent Events or NDJSON responses,
+and parses the per-request stream and cache options.
+"""
+import json
+from flask import Response, request, stream_with_context
+
+SSE_MIMETYPE = 'text/event-stream'
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+def stream_format(data=None):
+    """Return 'sse', 'ndjson' or None depending on what the client asked for.
+
+    Clients opt in with `"stream": true` (SSE by default, or
+    `"stream": "ndjson"`) in the JSON body, or via the Accept header.
+    """
+    accept = request.headers.get('Accept', '')
+    if NDJSON_MIMETYPE in accept:
+        return 'ndjson'
+    if SSE_MIMETYPE in accept:
+        return 'sse'
+    flag = (data or {}).get('stream')
+    if flag == 'ndjson':
+        return 'ndjson'
+    if flag in (True, 'sse', 'true', 1):
+        return 'sse'
+    return None
+
+def cache_enabled():
+    """False when the client sent `X-Cache-Bypass: 1` or `Cache-Control: no-cache`."""
+    if request.headers.get('X-Cache-Bypass', '').lower() in ('1', 'true', 'yes'):
+        return False
+    return 'no-cache' not in request.headers.get('Cache-Control', '').lower()
+
+def _encode(event, fmt):
+    if fmt == 'ndjson':
+        return json.dumps(event, ensure_ascii=False) + '\n'
+    name = event.get('event', 'message')
+    return f"event: {name}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+def streaming_response(chunks, fmt='sse'):
+    """Stream text `chunks` as token events followed by a final `done` event.
+
+    Dict chunks are sent as-is (they should carry an `event` key), which
+    lets producers interleave progress or result events. Errors raised
+    while iterating are reported as an `error` event, since the status line
+    has already been sent.
+    """
+    def generate():
+        try:
+            for chunk in chunks:
+                if isinstance(chunk, dict):
+                    yield _encode(chunk, fmt)
+                elif chunk:
+                    yield _encode({'event': 'token', 'text': chunk}, fmt)
+        except Exception as e:
+            yield _encode({'event': 'error', 'message': str(e)}, fmt)
+            return
+        yield _encode({'event': 'done'}, fmt)
+
+    resp = Response(stream_with_context(generate()), mimetype=SSE_MIMETYPE if fmt == 'sse' else NDJSON_MIMETYPE)
+    resp.headers['Cache-Control'] = 'no-cache'
+    # Disable proxy buffering (nginx) so tokens reach the client immediately
+    resp.headers['X-Accel-Buffering'] = 'no'
+    return resp
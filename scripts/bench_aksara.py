@@ -0,0 +1,52 @@
+"""Measure Latin to aksara (and aksara to Latin) throughput as the input grows.
+
+The compiled engine does constant work per character in both directions,
+so MB/s should stay flat from 1 MB to many MB. Reverse sizes refer to the
+Latin input the aksara text was generated from.
+
+Usage:
+  python -m games.scripts.bench_aksara --sizes 1 2 4 8
+"""
+import argparse
+import time
+
+try:
+    from games.libraries import aksara_bali, aksara_jawa, aksara_sunda
+except Exception:
+    from libraries import aksara_bali, aksara_jawa, aksara_sunda
+
+SCRIPTS = {
+    'jawa': (aksara_jawa.to_aksara_jawa, aksara_jawa.from_aksara_jawa),
+    'sunda': (aksara_sunda.to_aksara_sunda, aksara_sunda.from_aksara_sunda),
+    'bali': (aksara_bali.to_aksara_bali, aksara_bali.from_aksara_bali),
+}
+SAMPLE = 'aku cinta kamu, nyanyian ngarep bahasa daerah 2024. thukul dhahar khas '
+
+
+def make_text(megabytes):
+    n = int(megabytes * 1024 * 1024)
+    return (SAMPLE * (n // len(SAMPLE) + 1))[:n]
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument('--sizes', type=float, nargs='+', default=[1, 2, 4, 8], help='input sizes in MB')
+    p.add_argument('--scripts', nargs='+', default=list(SCRIPTS), choices=list(SCRIPTS))
+    args = p.parse_args()
+
+    print(f"{'script':>8}{'MB':>8}{'fwd MB/s':>10}{'rev MB/s':>10}")
+    for name in args.scripts:
+        forward, backward = SCRIPTS[name]
+        for size in args.sizes:
+            text = make_text(size)
+            t = time.perf_counter()
+            script = forward(text)['data']['result']
+            fwd = time.perf_counter() - t
+            t = time.perf_counter()
+            backward(script)
+            rev = time.perf_counter() - t
+            print(f'{name:>8}{size:>8g}{size / fwd:>10.2f}{size / rev:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Compare summarization/generation latency and memory across NLP backends.
+
+Each backend is measured in a fresh subprocess so resident memory numbers
+are not polluted by models loaded for another backend.
+
+Usage:
+  python -m games.scripts.bench_nlp_backends --backends torch torch-int8 onnx
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+TEXT = (
+    "The city council met on Tuesday to discuss the new public transport plan. "
+    "Officials said the proposal would add three bus lines and extend the tram "
+    "network to the northern districts by next year. Residents raised concerns "
+    "about construction noise and the cost of the project, which is estimated at "
+    "forty million dollars. The mayor promised a public consultation before the "
+    "final vote, scheduled for the end of the month."
+)
+
+
+def _measure(backend, runs):
+    try:
+        from games.libraries import ner
+    except Exception:
+        from libraries import ner
+
+    ner.set_backend(backend)
+    result = {'backend': backend}
+    for kind, fn in (('summarizer', ner._summarize_batch), ('generator', ner._generate_batch)):
+        ner.get_model(kind)
+        fn([TEXT])  # warm-up run
+        t = time.perf_counter()
+        for _ in range(runs):
+            fn([TEXT])
+        result[kind] = {
+            'load_seconds': ner.model_stats()[kind]['load_seconds'],
+            'rss_delta_mb': round((ner.model_stats()[kind]['rss_delta_bytes'] or 0) / 2 ** 20, 1),
+            'latency_ms': round((time.perf_counter() - t) / runs * 1000, 1),
+        }
+    return result
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument('--backends', nargs='+', default=['torch', 'torch-int8', 'onnx'])
+    p.add_argument('--runs', type=int, default=5)
+    p.add_argument('--worker', help=argparse.SUPPRESS)
+    args = p.parse_args()
+
+    if args.worker:
+        print(json.dumps(_measure(args.worker, args.runs)))
+        return
+
+    print(f"{'backend':<12}{'model':<12}{'load s':>8}{'rss MB':>9}{'latency ms':>12}")
+    for backend in args.backends:
+        proc = subprocess.run(
+            [sys.executable, '-m', __spec__.name if __spec__ else 'scripts.bench_nlp_backends',
+             '--worker', backend, '--runs', str(args.runs)],
+            capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            print(f'{backend:<12}failed: {proc.stderr.strip().splitlines()[-1] if proc.stderr else "unknown error"}')
+            continue
+        res = json.loads(proc.stdout.strip().splitlines()[-1])
+        for kind in ('summarizer', 'generator'):
+            r = res[kind]
+            print(f"{backend:<12}{kind:<12}{r['load_seconds']:>8}{r['rss_delta_mb']:>9}{r['latency_ms']:>12}")
+
+
+if __name__ == '__main__':
+    main()
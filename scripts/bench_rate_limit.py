@@ -0,0 +1,51 @@
+"""Measure per-request rate limit overhead as the number of tracked clients grows.
+
+With the sliding-window counter the cost per check should stay flat
+whether 100 or 100k (route, client) buckets are being tracked.
+
+Usage:
+  python -m games.scripts.bench_rate_limit --clients 100 10000 100000
+  python -m games.scripts.bench_rate_limit --storage sqlite:///ratelimit-bench.db
+"""
+import argparse
+import random
+import time
+
+try:
+    from games.middleware.rate_limit_storage import storage_from_url
+except Exception:
+    from middleware.rate_limit_storage import storage_from_url
+
+ROUTES = ('math.add', 'api.ner_tagging', 'ai.image_route', 'api.bmi')
+
+
+def bench(storage_url, n_clients, checks):
+    storage = storage_from_url(storage_url)
+    keys = [f'{ROUTES[i % len(ROUTES)]}:10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}' for i in range(n_clients)]
+    # register every client once so the storage tracks n_clients buckets
+    for k in keys:
+        storage.hit(k, 1000, 3600)
+    rnd = random.Random(0)
+    sample = [keys[rnd.randrange(n_clients)] for _ in range(checks)]
+    t = time.perf_counter()
+    for k in sample:
+        storage.hit(k, 1000, 3600)
+    return (time.perf_counter() - t) / checks
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument('--storage', default='memory://')
+    p.add_argument('--clients', type=int, nargs='+', default=[100, 10000, 100000])
+    p.add_argument('--checks', type=int, default=20000)
+    args = p.parse_args()
+
+    print(f'storage: {args.storage}')
+    print(f"{'clients':>10}{'us/check':>12}")
+    for n in args.clients:
+        per_check = bench(args.storage, n, args.checks)
+        print(f'{n:>10}{per_check * 1e6:>12.2f}')
+
+
+if __name__ == '__main__':
+    main()
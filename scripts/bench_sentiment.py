@@ -0,0 +1,60 @@
+"""Benchmark per-sentence sentiment throughput.
+
+Compares constructing a new VADER analyzer per text (the old behaviour)
+against the shared analyzer used by `analyze_sentiment_batch`.
+
+Usage:
+  python -m games.scripts.bench_sentiment --sentences 5000
+"""
+import argparse
+import random
+import time
+
+try:
+    from games.libraries import ner
+except Exception:
+    from libraries import ner
+
+_WORDS = ("good great awful bad happy sad love hate movie food service terrible "
+          "excellent boring fun slow fast nice ugly wonderful poor").split()
+
+
+def make_sentences(n, seed=0):
+    rnd = random.Random(seed)
+    return [' '.join(rnd.choice(_WORDS) for _ in range(rnd.randint(5, 20))) + '.' for _ in range(n)]
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument('--sentences', type=int, default=5000)
+    p.add_argument('--per-call-sample', type=int, default=200,
+                   help='texts to score with a fresh analyzer per call (slow path)')
+    args = p.parse_args()
+
+    sentences = make_sentences(args.sentences)
+
+    from nltk.sentiment.vader import SentimentIntensityAnalyzer
+    sample = sentences[:args.per_call_sample]
+    t = time.perf_counter()
+    for s in sample:
+        SentimentIntensityAnalyzer().polarity_scores(s)
+    per_call = (time.perf_counter() - t) / len(sample)
+
+    ner.get_model('sentiment')  # exclude one-off lexicon load from the timing
+    t = time.perf_counter()
+    resp = ner.analyze_sentiment_batch(sentences)
+    batch = (time.perf_counter() - t) / len(sentences)
+    assert resp['status'] == 200, resp['message']
+
+    doc = ' '.join(sentences)
+    t = time.perf_counter()
+    ner.analyze_sentiment_batch([doc], split=True)
+    split = time.perf_counter() - t
+
+    print(f'new analyzer per call : {1 / per_call:10.0f} sentences/s ({per_call * 1e6:.0f} us each)')
+    print(f'shared analyzer batch : {1 / batch:10.0f} sentences/s ({batch * 1e6:.0f} us each)')
+    print(f'split {len(sentences)}-sentence document: {split * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""Compare aksara conversion with and without the per-word LRU cache.
+
+By default the corpus is sampled from frequent Indonesian words with a
+Zipf distribution, which is roughly how word frequencies behave in real
+text; pass `--corpus FILE` to use your own.
+
+Usage:
+  python -m games.scripts.bench_word_cache --words 500000
+  python -m games.scripts.bench_word_cache --corpus data/id_news.txt --cache-size 1024 8192
+"""
+import argparse
+import random
+import time
+
+try:
+    from games.libraries import aksara_bali, aksara_jawa, aksara_sunda
+except Exception:
+    from libraries import aksara_bali, aksara_jawa, aksara_sunda
+
+ENGINES = {
+    'jawa': aksara_jawa._ENGINE,
+    'sunda': aksara_sunda._ENGINE,
+    'bali': aksara_bali._ENGINE,
+}
+
+# most frequent first
+VOCABULARY = (
+    'yang dan di itu dengan untuk tidak ini dari dalam akan pada juga saya ke '
+    'karena tersebut bisa ada mereka lebih kata tahun sudah atau saat oleh '
+    'menjadi orang kami telah hanya namun lain dia kita seperti jika masih '
+    'sebagai hal banyak harus baru satu dapat mengatakan setelah ia semua '
+    'pemerintah indonesia sangat bahwa hari masyarakat kepada tetapi para '
+    'jakarta kembali dua bagi antara sedang cukup paling besar sendiri '
+    'memiliki kemudian terjadi tanpa sekarang daerah rumah anak waktu '
+    'bekerja makan minum pasar sekolah guru murid jalan kota desa sawah '
+    'gunung laut sungai hujan panas dingin malam pagi siang sore senang '
+    'sedih cinta keluarga teman bapak ibu kakak adik nenek kakek bahasa '
+    'budaya tradisi upacara gamelan wayang batik tari lagu cerita sejarah '
+    'kerajaan candi pulau jawa sunda bali aksara tulisan membaca menulis '
+    'belajar mengajar bertanya menjawab berjalan berlari bermain tidur '
+    'bangun datang pergi pulang membeli menjual membuat memasak mencuci '
+    'nyanyian ngarep dhahar thukul nyuwun ngapunten matur nuwun sugeng'
+).split()
+
+
+def make_corpus(n_words, seed=0):
+    rnd = random.Random(seed)
+    weights = [1.0 / rank for rank in range(1, len(VOCABULARY) + 1)]
+    words = rnd.choices(VOCABULARY, weights=weights, k=n_words)
+    # sentence punctuation every dozen words or so
+    lines = [' '.join(words[i:i + 12]) + '.' for i in range(0, n_words, 12)]
+    return '\n'.join(lines)
+
+
+def timed(fn, text):
+    t = time.perf_counter()
+    out = fn(text)
+    return out, time.perf_counter() - t
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument('--corpus', help='UTF-8 text file to convert instead of the generated corpus')
+    p.add_argument('--words', type=int, default=300000)
+    p.add_argument('--cache-size', type=int, nargs='+', default=[256, 4096])
+    p.add_argument('--scripts', nargs='+', default=list(ENGINES), choices=list(ENGINES))
+    args = p.parse_args()
+
+    if args.corpus:
+        with open(args.corpus, encoding='utf-8') as f:
+            text = f.read().lower()
+    else:
+        text = make_corpus(args.words)
+    print(f'corpus: {len(text) / 1e6:.1f} MB, {len(text.split())} words')
+    print(f"{'script':>8}{'cache':>8}{'seconds':>10}{'speedup':>9}{'hit rate':>10}")
+    for name in args.scripts:
+        engine = ENGINES[name]
+        baseline, base_s = timed(engine._transliterate, text)
+        print(f'{name:>8}{"off":>8}{base_s:>10.2f}{1.0:>9.2f}{"-":>10}')
+        for size in args.cache_size:
+            engine.configure_cache(size)
+            out, elapsed = timed(engine.transliterate, text)
+            assert out == baseline
+            hit_rate = engine.cache_stats()['forward']['hit_rate']
+            print(f'{name:>8}{size:>8}{elapsed:>10.2f}{base_s / elapsed:>9.2f}{hit_rate:>10.1%}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""Convert pickled translator tokenizers to the `.vocab` format.
+
+Each `tokenizers*.pkl` is written next to itself as `tokenizers*.vocab`,
+fingerprinted with the matching `translator*.h5` when it exists, and read
+back to check that every table survived unchanged.
+
+Usage:
+  python -m games.scripts.convert_tokenizers models/tokenizers.pkl
+  python -m games.scripts.convert_tokenizers models/*.pkl --delete
+"""
+import argparse
+import os
+import sys
+
+try:
+    from games.libraries.translator_vocab import load_pickle, load_vocab, save_vocab
+except Exception:
+    from libraries.translator_vocab import load_pickle, load_vocab, save_vocab
+
+KEYS = ('inp_stoi', 'inp_itos', 'out_stoi', 'out_itos', 'max_in', 'max_out')
+
+
+def matching_model(pkl_path):
+    directory, name = os.path.split(pkl_path)
+    model_path = os.path.join(directory, name.replace('tokenizers', 'translator', 1)[:-len('.pkl')] + '.h5')
+    return model_path if os.path.exists(model_path) else None
+
+
+def convert(pkl_path, out_path=None, model_path=None):
+    toks = load_pickle(pkl_path)
+    out_path = out_path or pkl_path[:-len('.pkl')] + '.vocab'
+    save_vocab(out_path, toks, model_path)
+    loaded = load_vocab(out_path, model_path)
+    mismatched = [k for k in KEYS if loaded[k] != toks[k]]
+    if mismatched:
+        os.remove(out_path)
+        raise SystemExit(f'{pkl_path}: converted tables differ ({", ".join(mismatched)}); nothing written')
+    return out_path
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument('pickles', nargs='+')
+    p.add_argument('--model', help='model file to fingerprint (default: the matching translator*.h5)')
+    p.add_argument('-o', '--output', help='output path (only with a single input)')
+    p.add_argument('--delete', action='store_true', help='remove each pickle after a successful conversion')
+    args = p.parse_args()
+    if args.output and len(args.pickles) > 1:
+        p.error('--output needs a single input file')
+
+    for path in args.pickles:
+        if not path.endswith('.pkl'):
+            print(f'skipping {path}: not a .pkl file', file=sys.stderr)
+            continue
+        model_path = args.model or matching_model(path)
+        out = convert(path, args.output, model_path)
+        print(f'{path} -> {out}' + (f' (model {model_path})' if model_path else ''))
+        if args.delete:
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Export the summarizer and generator models to ONNX for the `onnx` backend.
+
+Requires `optimum[onnxruntime]`. Models are written under `models/onnx/`
+(or `NLP_ONNX_DIR`) where `libraries/ner.py` picks them up when
+`NLP_BACKEND=onnx`. With `--quantize` the exported graphs are additionally
+dynamically quantized to int8 for faster CPU inference.
+
+Usage:
+  python -m games.scripts.export_onnx
+  python -m games.scripts.export_onnx --models summarizer --quantize
+"""
+import argparse
+import os
+import shutil
+import tempfile
+
+try:
+    from games.libraries import ner
+except Exception:
+    from libraries import ner
+
+
+def _quantize(path):
+    from optimum.onnxruntime import ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+    qconfig = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in sorted(os.listdir(path)):
+            if not name.endswith('.onnx'):
+                continue
+            quantizer = ORTQuantizer.from_pretrained(path, file_name=name)
+            quantizer.quantize(save_dir=tmp, quantization_config=qconfig)
+            # optimum appends `_quantized`; keep the original file names so
+            # ORTModel.from_pretrained finds them
+            os.replace(os.path.join(tmp, name.replace('.onnx', '_quantized.onnx')), os.path.join(path, name))
+
+
+def export(kind, quantize=False):
+    from transformers import AutoTokenizer
+    from optimum.onnxruntime import ORTModelForCausalLM, ORTModelForSeq2SeqLM
+
+    model_id, ort_class = {
+        'summarizer': (ner.SUMMARIZER_MODEL_ID, ORTModelForSeq2SeqLM),
+        'generator': (ner.GENERATOR_MODEL_ID, ORTModelForCausalLM),
+    }[kind]
+    out = ner.onnx_export_path(kind)
+    if os.path.isdir(out):
+        shutil.rmtree(out)
+    os.makedirs(out)
+
+    model = ort_class.from_pretrained(model_id, export=True)
+    model.save_pretrained(out)
+    AutoTokenizer.from_pretrained(model_id).save_pretrained(out)
+    if quantize:
+        _quantize(out)
+    return out
+
+
+def main():
+    p = argparse.ArgumentParser()
+    p.add_argument('--models', nargs='+', choices=['summarizer', 'generator'], default=['summarizer', 'generator'])
+    p.add_argument('--quantize', action='store_true', help='apply dynamic int8 quantization to the exported graphs')
+    args = p.parse_args()
+
+    for kind in args.models:
+        out = export(kind, quantize=args.quantize)
+        print(f'Exported {kind} to {out}')
+
+
+if __name__ == '__main__':
+    main()
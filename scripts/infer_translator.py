@@ -1,59 +1,208 @@
-"""Run inference with the trained translator model."""
+"""Run inference with the trained translator model.
+
+Decoding is genuinely autoregressive: the trained model is split into an
+encoder graph (input characters -> LSTM state) and a single decoder step
+(previous character + state -> next-character distribution + new state),
+both compiled with `tf.function`. Many input strings are decoded together
+as one padded batch, with greedy or beam search.
+"""
 import argparse
 import os
 import sys
-import pickle
+import time
+import weakref
 import numpy as np
+import tensorflow as tf
 from tensorflow import keras
 
+try:
+    from games.libraries.translator_vocab import load_tokenizers
+except Exception:
+    from libraries.translator_vocab import load_tokenizers
 
 
-def load_resources(model_path='models/translator.h5', toks_path='models/tokenizers.pkl'):
+def load_resources(model_path='models/translator.h5', toks_path='models/tokenizers.vocab'):
+    """Load the model and its vocabulary, refusing pairs that do not fit together."""
     model = keras.models.load_model(model_path)
-    with open(toks_path, 'rb') as f:
-        toks = pickle.load(f)
+    toks = load_tokenizers(toks_path, model_path)
+    if hasattr(toks, 'check_model'):
+        toks.check_model(model)
     return model, toks
 
 
+def _find_layers(model, toks):
+    """Locate encoder/decoder embeddings, LSTMs and the output Dense."""
+    embeddings = [l for l in model.layers if isinstance(l, keras.layers.Embedding)]
+    lstms = [l for l in model.layers if isinstance(l, keras.layers.LSTM)]
+    heads = [l for l in model.layers if isinstance(l, keras.layers.TimeDistributed)]
+    if len(embeddings) != 2 or len(lstms) != 2 or len(heads) != 1:
+        raise ValueError('Unexpected translator model structure')
+
+    # the encoder LSTM returns its state, the decoder LSTM returns sequences
+    enc_lstm = next(l for l in lstms if l.return_state)
+    dec_lstm = next(l for l in lstms if l is not enc_lstm)
+
+    # embeddings are sized by their vocabularies; fall back to layer order
+    inp_size = len(toks['inp_stoi']) + 1
+    out_size = len(toks['out_stoi']) + 1
+    if inp_size != out_size:
+        enc_emb = next(l for l in embeddings if l.input_dim == inp_size)
+        dec_emb = next(l for l in embeddings if l.input_dim == out_size)
+    else:
+        enc_emb, dec_emb = embeddings
+    return enc_emb, enc_lstm, dec_emb, dec_lstm.cell, heads[0].layer
+
+
+class Seq2SeqDecoder:
+    """Step-wise, batched decoder built from a trained translator model."""
+
+    def __init__(self, model, toks):
+        self.toks = toks
+        self.enc_emb, self.enc_lstm, self.dec_emb, self.dec_cell, self.dense = _find_layers(model, toks)
+        self.max_in = toks['max_in']
+        self.max_out = toks['max_out']
+        self.inp_stoi = toks['inp_stoi']
+        self.out_itos = toks['out_itos']
+        self.start_id = toks['out_stoi'].get('<s>', 0)
+        self.end_id = toks['out_stoi'].get('</s>', 0)
+        units = self.enc_lstm.units
+
+        self.encode = tf.function(self._encode, input_signature=[tf.TensorSpec([None, None], tf.int32)])
+        self.step = tf.function(self._step, input_signature=[
+            tf.TensorSpec([None], tf.int32),
+            tf.TensorSpec([None, units], tf.float32),
+            tf.TensorSpec([None, units], tf.float32),
+        ])
+
+    def _encode(self, enc_ids):
+        x = self.enc_emb(enc_ids)
+        # padding (id 0) is masked so shorter strings in a batch are unaffected
+        _, h, c = self.enc_lstm(x, mask=tf.not_equal(enc_ids, 0))
+        return h, c
+
+    def _step(self, tokens, h, c):
+        y = self.dec_emb(tokens)
+        out, (h, c) = self.dec_cell(y, [h, c])
+        return tf.math.log(self.dense(out) + 1e-9), h, c
+
+    def _encode_inputs(self, texts):
+        longest = max(1, min(self.max_in, max(len(t) for t in texts)))
+        enc = np.zeros((len(texts), longest), dtype='int32')
+        for i, text in enumerate(texts):
+            for j, ch in enumerate(text[:longest]):
+                enc[i, j] = self.inp_stoi.get(ch, 0)
+        return enc
+
+    def _to_text(self, ids):
+        out_chars = []
+        for token_id in ids:
+            if token_id == self.end_id:
+                break
+            ch = self.out_itos.get(int(token_id), '')
+            if ch not in ('<s>', '</s>', ''):
+                out_chars.append(ch)
+        return ''.join(out_chars)
+
+    def greedy(self, texts):
+        h, c = self.encode(self._encode_inputs(texts))
+        tokens = np.full((len(texts),), self.start_id, dtype='int32')
+        finished = np.zeros((len(texts),), dtype=bool)
+        steps = []
+        for _ in range(self.max_out):
+            logp, h, c = self.step(tokens, h, c)
+            tokens = np.argmax(logp.numpy(), axis=-1).astype('int32')
+            steps.append(tokens)
+            finished |= tokens == self.end_id
+            if finished.all():
+                break
+        seqs = np.stack(steps, axis=1) if steps else np.zeros((len(texts), 0), dtype='int32')
+        return [self._to_text(row) for row in seqs]
+
+    def beam(self, texts, beam_width=4):
+        n, k = len(texts), beam_width
+        h, c = self.encode(self._encode_inputs(texts))
+        h = tf.repeat(h, k, axis=0)
+        c = tf.repeat(c, k, axis=0)
+        tokens = np.full((n * k,), self.start_id, dtype='int32')
+        scores = np.full((n, k), -np.inf, dtype='float32')
+        scores[:, 0] = 0.0  # all beams start identical; keep just one alive
+        finished = np.zeros((n, k), dtype=bool)
+        seqs = np.zeros((n, k, 0), dtype='int32')
+        rows = np.arange(n)[:, None]
+        for _ in range(self.max_out):
+            logp, h_new, c_new = self.step(tokens, h, c)
+            logp = logp.numpy().reshape(n, k, -1)
+            vocab = logp.shape[-1]
+            # finished beams may only extend with </s> at no cost
+            logp[finished] = -np.inf
+            logp[finished, self.end_id] = 0.0
+            cand = (scores[:, :, None] + logp).reshape(n, k * vocab)
+            top = np.argpartition(-cand, k - 1, axis=1)[:, :k]
+            scores = np.take_along_axis(cand, top, axis=1)
+            beam_idx, tok = top // vocab, (top % vocab).astype('int32')
+            seqs = np.concatenate([seqs[rows, beam_idx], tok[:, :, None]], axis=2)
+            finished = finished[rows, beam_idx] | (tok == self.end_id)
+            flat = (rows * k + beam_idx).reshape(-1)
+            h = tf.gather(h_new, flat)
+            c = tf.gather(c_new, flat)
+            tokens = tok.reshape(-1)
+            if finished.all():
+                break
+        best = np.argmax(scores, axis=1)
+        return [self._to_text(seqs[i, best[i]]) for i in range(n)]
+
+    def decode(self, texts, beam_width=1, batch_size=256):
+        out = []
+        for start in range(0, len(texts), batch_size):
+            chunk = texts[start:start + batch_size]
+            out.extend(self.greedy(chunk) if beam_width <= 1 else self.beam(chunk, beam_width))
+        return out
+
+
+_decoders = weakref.WeakKeyDictionary()
+
+
+def get_decoder(model, toks):
+    """Return the (cached) step-wise decoder for `model`."""
+    dec = _decoders.get(model)
+    if dec is None or dec.toks is not toks:
+        dec = _decoders[model] = Seq2SeqDecoder(model, toks)
+    return dec
+
+
+def decode_batch(model, toks, texts, beam_width=1, batch_size=256):
+    return get_decoder(model, toks).decode(list(texts), beam_width=beam_width, batch_size=batch_size)
+
+
 def greedy_decode(model, toks, inp_text):
-    inp_stoi = toks['inp_stoi']
-    out_stoi = toks['out_stoi']
-    out_itos = toks['out_itos']
-    max_in = toks['max_in']
-    max_out = toks['max_out']
-
-    # encode input
-    enc = np.zeros((1, max_in), dtype='int32')
-    for i, ch in enumerate(inp_text[:max_in]):
-        enc[0, i] = inp_stoi.get(ch, 0)
-
-    # start token
-    dec_in = np.zeros((1, max_out), dtype='int32')
-    dec_in[0, 0] = out_stoi.get('<s>', 0)
-
-    preds = model.predict([enc, dec_in])
-    # greedy read
-    out_chars = []
-    for t in range(preds.shape[1]):
-        token_id = int(preds[0, t].argmax())
-        ch = out_itos.get(token_id, '')
-        if ch == '</s>':
-            break
-        if ch not in ('<s>', ''):
-            out_chars.append(ch)
-    return ''.join(out_chars)
+    return decode_batch(model, toks, [inp_text])[0]
 
 
 def main():
     p = argparse.ArgumentParser()
     p.add_argument('--model', default='models/translator.h5')
-    p.add_argument('--toks', default='models/tokenizers.pkl')
-    p.add_argument('text')
+    p.add_argument('--toks', default='models/tokenizers.vocab')
+    p.add_argument('--file', help='decode every line of this file (one word per line)')
+    p.add_argument('--beam', type=int, default=1, help='beam width (1 = greedy)')
+    p.add_argument('--batch-size', type=int, default=256)
+    p.add_argument('text', nargs='*')
     args = p.parse_args()
 
+    texts = list(args.text)
+    if args.file:
+        with open(args.file, encoding='utf-8') as f:
+            texts.extend(line.strip() for line in f if line.strip())
+    if not texts:
+        p.error('provide text arguments or --file')
+
     model, toks = load_resources(args.model, args.toks)
-    out = greedy_decode(model, toks, args.text)
-    print(out)
+    get_decoder(model, toks).decode(texts[:1])  # trace the graphs outside the timing
+    t = time.perf_counter()
+    outputs = decode_batch(model, toks, texts, beam_width=args.beam, batch_size=args.batch_size)
+    elapsed = time.perf_counter() - t
+    for out in outputs:
+        print(out)
+    print(f'{len(texts)} words in {elapsed:.2f}s ({len(texts) / elapsed:.0f} words/s)', file=sys.stderr)
 
 
 if __name__ == '__main__':
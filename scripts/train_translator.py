@@ -2,19 +2,34 @@
 
 Usage examples:
   python scripts/train_translator.py --dataset data/pairs.csv --target aksara_name
+  python scripts/train_translator.py --words data/wordlist.txt --target jawa --cache-dir /tmp/tfcache
+  python scripts/train_translator.py --synthetic 200000 --target bali --epochs 5
 
-If no dataset provided the script will create a tiny sample using available
-aksara modules. The script saves a model under `models/translator.h5` and
-tokenizers under `models/tokenizers.pkl`.
+Training pairs are streamed through a `tf.data` pipeline instead of being
+built in memory: words come from a word list (`--words`), a CSV of
+`latin,target` pairs, or generated Indonesian-like words (`--synthetic`),
+and targets are produced on the fly by the rule-based converters. Pairs
+are bucketed by length so each batch is padded only to its own longest
+sequence, optionally cached to disk after the first epoch, and
+prefetched while the model trains.
+
+If no dataset is provided the script generates a sample using the
+available aksara modules. The script saves a model under
+`models/translator.h5` and its vocabulary under `models/tokenizers.vocab`.
+Set TF_CONFIG and pass `--strategy multiworker` to train on several CPU
+hosts.
 """
 import argparse
+import hashlib
+import json
 import os
+import random
+import re
 import sys
-import pickle
-from typing import List, Tuple
-
-import numpy as np
+import time
+from typing import Callable, Iterator, List, Tuple
 
+import tensorflow as tf
 from tensorflow import keras
 from tensorflow.keras.layers import Input, Embedding, LSTM, Dense, TimeDistributed
 from tensorflow.keras.models import Model
@@ -24,25 +39,75 @@ try:
 except Exception:
     pd = None
 
-from games.libraries import translator
-from games.libraries import ner as ner_lib
+try:
+    from games.libraries import translator
+    from games.libraries import ner as ner_lib
+    from games.libraries.translator_vocab import save_vocab
+except Exception:
+    from libraries import translator
+    from libraries import ner as ner_lib
+    from libraries.translator_vocab import save_vocab
+
+# called as source(shard, shards) -> the (latin, target) pairs of that shard
+PairSource = Callable[..., Iterator[Tuple[str, str]]]
+
+SAMPLE_WORDS = ["satu", "dua", "tiga", "rumah", "air", "mata", "api"]
+_ONSETS = ['', 'b', 'c', 'd', 'g', 'h', 'j', 'k', 'l', 'm', 'n', 'p', 'r', 's', 't', 'w', 'y', 'ng', 'ny']
+_VOWELS = ['a', 'a', 'i', 'u', 'e', 'o']
+_CODAS = ['', '', '', 'n', 'ng', 'r', 's', 't', 'k', 'h', 'l', 'm']
+_WORD = re.compile(r'[^\W\d_]+')
+
+# decoder sequences are bucketed by length so short words are not padded to the longest one
+BUCKET_BOUNDARIES = [6, 9, 12, 16, 24, 32]
+
+
+def synthetic_words(n: int, seed: int = 0) -> Iterator[str]:
+    """Yield `n` Indonesian-like words built from common syllables."""
+    rnd = random.Random(seed)
+    for _ in range(n):
+        syllables = rnd.choice((1, 2, 2, 3, 3, 4))
+        yield ''.join(rnd.choice(_ONSETS) + rnd.choice(_VOWELS) for _ in range(syllables)) + rnd.choice(_CODAS)
 
 
-def sample_pairs(target: str) -> List[Tuple[str, str]]:
-    # fallback sample words
-    words = ["satu", "dua", "tiga", "rumah", "air", "mata", "api"]
-    pairs = []
-    for w in words:
-        pairs.append((w, translator.translate_to_script(target, w)))
-    return pairs
+def sample_pairs(target: str, n: int = 2000) -> List[Tuple[str, str]]:
+    # fallback sample words plus generated ones, so the model sees more than a handful
+    words = SAMPLE_WORDS + list(synthetic_words(n))
+    return [(w, translator.translate_to_script(target, w)) for w in words]
 
 
-def load_dataset(path: str, target: str):
+def iter_words(path: str) -> Iterator[str]:
+    """Stream lowercase words from a text file or word list, one line at a time."""
+    with open(path, encoding='utf-8', errors='replace') as f:
+        for line in f:
+            for w in _WORD.findall(line.lower()):
+                yield w
+
+
+def _sharded(items: Callable[[], Iterator], convert: Callable = None) -> PairSource:
+    """Turn an item iterator factory into a PairSource; only the shard's items are converted."""
+    def source(shard: int = 0, shards: int = 1):
+        for i, item in enumerate(items()):
+            if i % shards == shard:
+                yield convert(item) if convert else item
+    return source
+
+
+def _to_target(target: str) -> Callable[[str], Tuple[str, str]]:
+    return lambda w: (w, translator.translate_to_script(target, w))
+
+
+def load_dataset(path: str, target: str) -> PairSource:
     # If dataset is a CSV with latin,target columns
     if path and os.path.exists(path) and pd is not None:
-        df = pd.read_csv(path)
-        if 'latin' in df.columns and 'target' in df.columns:
-            return list(zip(df['latin'].astype(str), df['target'].astype(str)))
+        try:
+            header = pd.read_csv(path, nrows=0)
+        except Exception:
+            header = None
+        if header is not None and 'latin' in header.columns and 'target' in header.columns:
+            def csv_pairs():
+                for chunk in pd.read_csv(path, usecols=['latin', 'target'], chunksize=100000):
+                    yield from zip(chunk['latin'].astype(str), chunk['target'].astype(str))
+            return _sharded(csv_pairs)
     # If path is a text file, use NER to extract words
     if path and os.path.exists(path):
         try:
@@ -55,12 +120,23 @@ def load_dataset(path: str, target: str):
             # fallback to tokenization if no entities
             if not ents:
                 ents = [w for w in txt.split() if len(w) > 1][:200]
-            return [(w, translator.translate_to_script(target, w)) for w in ents]
+            pairs = [(w, translator.translate_to_script(target, w)) for w in ents]
+            return _sharded(lambda: iter(pairs))
         except Exception:
             pass
 
     # fallback sample pairs
-    return sample_pairs(target)
+    pairs = sample_pairs(target)
+    return _sharded(lambda: iter(pairs))
+
+
+def pair_source(args) -> PairSource:
+    """Return a callable giving a fresh iterator of (latin, target) pairs per epoch."""
+    if args.words:
+        return _sharded(lambda: iter_words(args.words), _to_target(args.target))
+    if args.synthetic:
+        return _sharded(lambda: synthetic_words(args.synthetic), _to_target(args.target))
+    return load_dataset(args.dataset, args.target)
 
 
 def build_vocab(sequences):
@@ -72,12 +148,62 @@ def build_vocab(sequences):
     return stoi, itos
 
 
-def encode_sequences(seqs, stoi, maxlen):
-    arr = np.zeros((len(seqs), maxlen), dtype='int32')
-    for i, s in enumerate(seqs):
-        for j, ch in enumerate(s[:maxlen]):
-            arr[i, j] = stoi.get(ch, 0)
-    return arr
+def scan_pairs(pairs: PairSource) -> dict:
+    """One streaming pass to collect vocabularies, maximum lengths and the pair count."""
+    inp_chars, out_chars = set(), set()
+    max_in = max_out = count = 0
+    for latin, target in pairs():
+        inp_chars.update(latin)
+        out_chars.update(target)
+        max_in = max(max_in, len(latin))
+        max_out = max(max_out, len(target))
+        count += 1
+    if not count:
+        raise SystemExit('No training pairs found')
+    inp_stoi, inp_itos = build_vocab(inp_chars)
+    out_stoi, out_itos = build_vocab(out_chars)
+    return {'inp_stoi': inp_stoi, 'inp_itos': inp_itos, 'out_stoi': out_stoi, 'out_itos': out_itos,
+            'max_in': max_in + 1, 'max_out': max_out + 2, 'count': count}
+
+
+def make_dataset(pairs: PairSource, toks: dict, batch_size: int = 64, shards: int = 4,
+                 cache_path: str = None, shuffle_buffer: int = 10000) -> tf.data.Dataset:
+    """Stream encoded, length-bucketed, prefetched training batches.
+
+    Pair generation (the rule-based conversion) is split into `shards`
+    interleaved generators; each one walks the source but only converts
+    and encodes every `shards`-th item.
+    """
+    inp_stoi, out_stoi = toks['inp_stoi'], toks['out_stoi']
+    max_in, max_out = toks['max_in'], toks['max_out'] - 1
+    start, end = out_stoi['<s>'], out_stoi['</s>']
+
+    def generate(shard):
+        for latin, target in pairs(int(shard), shards):
+            out_ids = [out_stoi.get(ch, 0) for ch in target[:max_out - 1]]
+            yield ([inp_stoi.get(ch, 0) for ch in latin[:max_in]],
+                   [start] + out_ids,
+                   out_ids + [end])
+
+    signature = (tf.TensorSpec([None], tf.int32),) * 3
+    ds = tf.data.Dataset.range(shards).interleave(
+        lambda shard: tf.data.Dataset.from_generator(generate, output_signature=signature, args=(shard,)),
+        cycle_length=shards, num_parallel_calls=tf.data.AUTOTUNE, deterministic=False)
+    if cache_path:
+        os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+        ds = ds.cache(cache_path)
+    ds = ds.shuffle(shuffle_buffer)
+    ds = ds.bucket_by_sequence_length(
+        element_length_func=lambda enc, dec_in, dec_out: tf.shape(dec_in)[0],
+        bucket_boundaries=BUCKET_BOUNDARIES,
+        bucket_batch_sizes=[batch_size] * (len(BUCKET_BOUNDARIES) + 1),
+        padded_shapes=([None], [None], [None]),
+    )
+    ds = ds.map(lambda enc, dec_in, dec_out: ((enc, dec_in), dec_out), num_parallel_calls=tf.data.AUTOTUNE)
+    options = tf.data.Options()
+    # generator input cannot be split by file; let each worker take every n-th batch
+    options.experimental_distribute.auto_shard_policy = tf.data.experimental.AutoShardPolicy.DATA
+    return ds.with_options(options).prefetch(tf.data.AUTOTUNE)
 
 
 def make_model(inp_vocab, out_vocab, embed=64, latent=128):
@@ -96,44 +222,97 @@ def make_model(inp_vocab, out_vocab, embed=64, latent=128):
     return model
 
 
-def prepare_training(pairs):
-    inputs = [p[0] for p in pairs]
-    outputs = [p[1] for p in pairs]
-    inp_stoi, inp_itos = build_vocab(inputs)
-    out_stoi, out_itos = build_vocab(outputs)
-    max_in = max(len(s) for s in inputs) + 1
-    max_out = max(len(s) for s in outputs) + 2
+def make_strategy(name: str):
+    if name == 'multiworker':
+        # workers are described by the TF_CONFIG environment variable
+        if 'TF_CONFIG' not in os.environ:
+            raise SystemExit('--strategy multiworker needs TF_CONFIG to be set')
+        return tf.distribute.MultiWorkerMirroredStrategy()
+    if name == 'mirrored':
+        return tf.distribute.MirroredStrategy()
+    return tf.distribute.get_strategy()
+
+
+def cache_path_for(cache_dir: str, args, toks: dict, count: int) -> str:
+    """Cache file name keyed on everything that changes the encoded pairs."""
+    key = json.dumps([args.target, args.words, args.dataset, args.synthetic, count,
+                      toks['max_in'], toks['max_out'], sorted(toks['inp_stoi'].items()),
+                      sorted(toks['out_stoi'].items())], ensure_ascii=False)
+    return os.path.join(cache_dir, 'pairs-' + hashlib.sha1(key.encode('utf-8')).hexdigest()[:16])
 
-    enc_seq = encode_sequences(inputs, inp_stoi, max_in)
-    # decoder input includes start token
-    dec_in = [('<s>' + s) for s in outputs]
-    dec_out = [(s + '</s>') for s in outputs]
-    dec_in_seq = encode_sequences(dec_in, out_stoi, max_out)
-    dec_out_seq = encode_sequences(dec_out, out_stoi, max_out)
-    # expand dims for sparse categorical crossentropy
-    dec_out_seq = np.expand_dims(dec_out_seq, -1)
-    return (enc_seq, dec_in_seq, dec_out_seq, inp_stoi, inp_itos, out_stoi, out_itos, max_in, max_out)
+
+def is_chief() -> bool:
+    """True unless TF_CONFIG names this process as a non-chief worker."""
+    config = json.loads(os.environ.get('TF_CONFIG', '{}'))
+    task = config.get('task', {})
+    if not task or task.get('type') == 'chief':
+        return True
+    return task.get('type') == 'worker' and task.get('index') == 0 and 'chief' not in config.get('cluster', {})
+
+
+class Throughput(keras.callbacks.Callback):
+    """Report training samples per second after every epoch."""
+
+    def __init__(self, samples_per_epoch):
+        super().__init__()
+        self.samples = samples_per_epoch
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._started = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        elapsed = time.perf_counter() - self._started
+        rate = self.samples / elapsed if elapsed else 0.0
+        if logs is not None:
+            logs['samples_per_sec'] = rate
+        print(f'epoch {epoch + 1}: {self.samples} samples in {elapsed:.1f}s ({rate:.0f} samples/s)', file=sys.stderr)
 
 
 def main():
     p = argparse.ArgumentParser()
     p.add_argument('--dataset', default=None)
+    p.add_argument('--words', default=None, help='word list or text file; targets come from the rule-based converter')
+    p.add_argument('--synthetic', type=int, default=0, help='train on N generated words')
     p.add_argument('--target', default='jawa')
     p.add_argument('--epochs', type=int, default=10)
+    p.add_argument('--batch-size', type=int, default=64)
+    p.add_argument('--shards', type=int, default=4, help='parallel pair generators')
+    p.add_argument('--cache-dir', default=None, help='cache encoded pairs on disk after the first epoch')
+    p.add_argument('--shuffle-buffer', type=int, default=10000)
+    p.add_argument('--strategy', choices=('default', 'mirrored', 'multiworker'), default='default')
+    p.add_argument('--threads', type=int, default=0, help='intra-op CPU threads (0 = TensorFlow default)')
+    p.add_argument('--per-target', action='store_true',
+                   help='save as models/translator_<target>.h5 so several targets can coexist')
     args = p.parse_args()
 
-    pairs = load_dataset(args.dataset, args.target)
-    enc_seq, dec_in_seq, dec_out_seq, inp_stoi, inp_itos, out_stoi, out_itos, max_in, max_out = prepare_training(pairs)
+    if args.threads:
+        tf.config.threading.set_intra_op_parallelism_threads(args.threads)
 
-    model = make_model(len(inp_stoi), len(out_stoi))
+    pairs = pair_source(args)
+    toks = scan_pairs(pairs)
+    count = toks.pop('count')
+    print(f"{count} pairs, input vocab {len(toks['inp_stoi'])}, output vocab {len(toks['out_stoi'])}", file=sys.stderr)
+
+    strategy = make_strategy(args.strategy)
+    batch_size = args.batch_size * strategy.num_replicas_in_sync
+    cache_path = cache_path_for(args.cache_dir, args, toks, count) if args.cache_dir else None
+    dataset = make_dataset(pairs, toks, batch_size, max(1, args.shards), cache_path, args.shuffle_buffer)
+    with strategy.scope():
+        model = make_model(len(toks['inp_stoi']), len(toks['out_stoi']))
     model.summary()
-    model.fit([enc_seq, dec_in_seq], dec_out_seq, epochs=args.epochs, batch_size=16)
+    model.fit(dataset, epochs=args.epochs, callbacks=[Throughput(count)])
+
+    # with several workers only the chief writes the artifacts
+    if not is_chief():
+        return
 
+    suffix = f'_{args.target.lower()}' if args.per_target else ''
+    model_path = f'models/translator{suffix}.h5'
+    toks_path = f'models/tokenizers{suffix}.vocab'
     os.makedirs('models', exist_ok=True)
-    model.save('models/translator.h5')
-    with open('models/tokenizers.pkl', 'wb') as f:
-        pickle.dump({'inp_stoi': inp_stoi, 'inp_itos': inp_itos, 'out_stoi': out_stoi, 'out_itos': out_itos, 'max_in': max_in, 'max_out': max_out}, f)
-    print('Saved model to models/translator.h5 and tokenizers to models/tokenizers.pkl')
+    model.save(model_path)
+    save_vocab(toks_path, toks, model_path)
+    print(f'Saved model to {model_path} and vocabulary to {toks_path}')
 
 
 if __name__ == '__main__':
@@ -0,0 +1,114 @@
+"""Transliterate large text files offline, using every CPU core.
+
+The input (a file or stdin) is read in chunks of lines, chunks are
+converted in a process pool, and results are written in input order as
+soon as they are ready. Only a few chunks per worker are in flight at a
+time, so memory use stays flat however large the corpus is.
+
+Usage:
+  python -m games.scripts.transliterate jawa corpus.txt -o corpus.jawa.txt
+  cat aksara.txt | python -m games.scripts.transliterate sunda --reverse > latin.txt
+  python -m games.scripts.transliterate bali big.txt -o out.txt --workers 8 --chunk-lines 5000
+"""
+import argparse
+import collections
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from games.libraries import translator
+except Exception:
+    from libraries import translator
+
+
+def convert_lines(script, reverse, lines):
+    """Convert each line independently (runs in the worker processes)."""
+    convert = translator.translate_from_script if reverse else translator.translate_to_script
+    return [convert(script, line) for line in lines]
+
+
+def read_chunks(stream, chunk_lines):
+    lines = (line.rstrip('\r\n') for line in stream)
+    while True:
+        chunk = list(itertools.islice(lines, chunk_lines))
+        if not chunk:
+            return
+        yield chunk
+
+
+def transliterate_stream(script, src, dst, reverse=False, workers=None, chunk_lines=2000, progress=None):
+    """Convert `src` to `dst` line by line; returns the number of lines written.
+
+    With `workers` <= 1 everything runs in this process. `progress`, if
+    given, is called with the running line count after each chunk.
+    """
+    total = 0
+
+    def write(out_lines):
+        nonlocal total
+        dst.write('\n'.join(out_lines))
+        dst.write('\n')
+        total += len(out_lines)
+        if progress:
+            progress(total)
+
+    chunks = read_chunks(src, chunk_lines)
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        for chunk in chunks:
+            write(convert_lines(script, reverse, chunk))
+        return total
+
+    max_pending = workers * 2
+    pending = collections.deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in chunks:
+            pending.append(pool.submit(convert_lines, script, reverse, chunk))
+            if len(pending) >= max_pending:
+                write(pending.popleft().result())
+        while pending:
+            write(pending.popleft().result())
+    return total
+
+
+def main():
+    p = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    p.add_argument('script', help='target script, e.g. jawa, sunda, bali (see /translator/scripts)')
+    p.add_argument('input', nargs='?', default='-', help='input file (default: stdin)')
+    p.add_argument('-o', '--output', default='-', help='output file (default: stdout)')
+    p.add_argument('--reverse', action='store_true', help='convert from the script back to Latin')
+    p.add_argument('--workers', type=int, default=os.cpu_count(), help='worker processes (1 = no pool)')
+    p.add_argument('--chunk-lines', type=int, default=2000)
+    p.add_argument('--encoding', default='utf-8')
+    args = p.parse_args()
+
+    if translator.get_converter(args.script) is None:
+        p.error(f'unknown script {args.script!r}; available: {", ".join(translator.available_scripts())}')
+    if args.chunk_lines < 1:
+        p.error('--chunk-lines must be positive')
+
+    src = sys.stdin if args.input == '-' else open(args.input, encoding=args.encoding, errors='replace')
+    dst = sys.stdout if args.output == '-' else open(args.output, 'w', encoding=args.encoding)
+    started = time.perf_counter()
+
+    def progress(n):
+        if args.output != '-' and sys.stderr.isatty():
+            elapsed = time.perf_counter() - started
+            print(f'\r{n} lines ({n / elapsed:.0f} lines/s)', end='', file=sys.stderr)
+
+    try:
+        n = transliterate_stream(args.script, src, dst, args.reverse, args.workers, args.chunk_lines, progress)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if dst is not sys.stdout:
+            dst.close()
+    elapsed = time.perf_counter() - started
+    print(f'\r{n} lines in {elapsed:.2f}s ({n / elapsed if elapsed else 0:.0f} lines/s)', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+import random
+import unittest
+
+try:
+    from games.libraries import aksara_bali, aksara_jawa, aksara_sunda, translator
+    from games.libraries.aksara_engine import AksaraTransliterator, MappingTransliterator
+except Exception:
+    from libraries import aksara_bali, aksara_jawa, aksara_sunda, translator
+    from libraries.aksara_engine import AksaraTransliterator, MappingTransliterator
+
+
+class TestAksaraEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = AksaraTransliterator(
+            {'k': 'K', 'n': 'N', 'ng': 'G'}, {'a': 'A', 'i': 'I'}, {'i': '-i'}, '~')
+
+    def test_syllables(self):
+        self.assertEqual(self.engine.transliterate('ka'), 'K')
+        self.assertEqual(self.engine.transliterate('ki'), 'K-i')
+        self.assertEqual(self.engine.transliterate('k'), 'K~')
+        self.assertEqual(self.engine.transliterate('ai'), 'AI')
+
+    def test_longest_consonant_wins(self):
+        self.assertEqual(self.engine.transliterate('nga'), 'G')
+        self.assertEqual(self.engine.transliterate('nka'), 'N~K')
+
+    def test_other_characters_are_copied(self):
+        self.assertEqual(self.engine.transliterate('ka, 12 ki!'), 'K, 12 K-i!')
+
+    def test_word_cache(self):
+        engine = AksaraTransliterator({'k': 'K'}, {'a': 'A', 'i': 'I'}, {'i': '-i'}, '~', cache_size=2)
+        self.assertEqual(engine.transliterate('ki ka, ki!'), 'K-i K, K-i!')
+        stats = engine.cache_stats()['forward']
+        self.assertEqual((stats['hits'], stats['misses'], stats['size']), (1, 2, 2))
+        self.assertEqual(engine.to_latin('K-i K~'), 'ki k')
+        engine.configure_cache(0)
+        self.assertEqual(engine.transliterate('ki ka'), 'K-i K')
+        self.assertNotIn('forward', engine.cache_stats())
+
+    def test_mapping_prefers_longest_key(self):
+        m = MappingTransliterator({'n': 'N', 'ng': 'G', 'nga': 'X'})
+        self.assertEqual(m.transliterate('ngang n'), 'XG N')
+
+
+class TestAksaraModules(unittest.TestCase):
+    def test_known_words(self):
+        self.assertEqual(aksara_jawa.to_aksara_jawa('aku cinta')['data']['result'], 'ꦄꦏꦸ ꦕꦶꦤ꧀ꦠ')
+        self.assertEqual(aksara_sunda.to_aksara_sunda('rumah')['data']['result'], 'ᮛᮥᮙᮠ᮪')
+        self.assertEqual(aksara_bali.to_aksara_bali('nyanyi')['data']['result'], 'ᬜᬜᬶ')
+
+    def test_none(self):
+        self.assertEqual(aksara_jawa.to_aksara_jawa(None)['status'], 400)
+
+    def test_registered_mapping_recompiles(self):
+        self.addCleanup(translator._REGISTRY.pop, 'test_script', None)
+        translator.register_mapping('test_script', {'a': '1'})
+        self.assertEqual(translator.translate_to_script('test_script', 'aba'), '1b1')
+        translator.register_mapping('test_script', {'b': '2'})
+        self.assertEqual(translator.translate_to_script('test_script', 'aba'), 'a2a')
+
+
+def _random_text(rnd, module):
+    """Words of consonant-vowel syllables, optionally ending in a bare consonant.
+
+    Clusters are left out: a virama-joined pair can spell another consonant
+    (Balinese `pp` vs `f`), so only these inputs have a unique reading.
+    """
+    consonants = sorted(module.consonants)
+    vowels = sorted(module.vowel_signs.keys() & module.independent_vowels.keys() | {'a'})
+    words = []
+    for _ in range(rnd.randint(1, 6)):
+        word = rnd.choice(vowels) if rnd.random() < 0.3 else ''
+        for _ in range(rnd.randint(1, 4)):
+            word += rnd.choice(consonants) + rnd.choice(vowels)
+        if rnd.random() < 0.3:
+            word += rnd.choice(consonants)
+        words.append(word)
+    return rnd.choice([' ', ', ', ' 12 ']).join(words)
+
+
+class TestReverseTransliteration(unittest.TestCase):
+    MODULES = (
+        (aksara_jawa, aksara_jawa.to_aksara_jawa, aksara_jawa.from_aksara_jawa),
+        (aksara_sunda, aksara_sunda.to_aksara_sunda, aksara_sunda.from_aksara_sunda),
+        (aksara_bali, aksara_bali.to_aksara_bali, aksara_bali.from_aksara_bali),
+    )
+
+    def test_round_trip(self):
+        rnd = random.Random(0)
+        for module, forward, backward in self.MODULES:
+            for _ in range(500):
+                text = _random_text(rnd, module)
+                script = forward(text)['data']['result']
+                self.assertEqual(backward(script)['data']['result'], text, (module.__name__, script))
+
+    def test_translator_inverse(self):
+        for script in ('jawa', 'sunda', 'bali', 'morse'):
+            out = translator.translate_to_script(script, 'aku cinta kamu')
+            self.assertEqual(translator.translate_from_script(script, out), 'aku cinta kamu')
+
+    def test_registered_mapping_inverse(self):
+        self.addCleanup(translator._REGISTRY.pop, 'test_reverse', None)
+        translator.register_mapping('test_reverse', {'a': '1', 'ng': '2'})
+        self.assertEqual(translator.translate_from_script('test_reverse', '21b'), 'ngab')
+
+    def test_unknown_script(self):
+        self.assertEqual(translator.translate_from_script('klingon', 'abc'), 'abc')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import threading
+import unittest
+
+try:
+    from games.libraries.batching import MicroBatcher
+except Exception:
+    from libraries.batching import MicroBatcher
+
+
+class TestMicroBatcher(unittest.TestCase):
+    def test_concurrent_requests_share_batches(self):
+        seen = []
+
+        def batch_fn(items):
+            seen.append(len(items))
+            return [s.upper() for s in items]
+
+        batcher = MicroBatcher(batch_fn, max_batch_size=4, max_wait_ms=50)
+        results = {}
+
+        def worker(i):
+            results[i] = batcher(f'text {i}', timeout=5)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(results, {i: f'TEXT {i}' for i in range(8)})
+        self.assertTrue(all(n <= 4 for n in seen))
+        self.assertLess(len(seen), 8)
+        stats = batcher.stats()
+        self.assertEqual(stats['items'], 8)
+        self.assertEqual(stats['batches'], len(seen))
+
+    def test_errors_propagate_to_callers(self):
+        def batch_fn(items):
+            raise ValueError('boom')
+
+        batcher = MicroBatcher(batch_fn, max_wait_ms=1)
+        with self.assertRaises(ValueError):
+            batcher('x', timeout=5)
+        self.assertEqual(batcher.stats()['errors'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
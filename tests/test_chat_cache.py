@@ -0,0 +1,138 @@
+import importlib
+import os
+import sys
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from PIL import Image
+
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+try:
+    from games import chat as chat_mod
+except Exception:
+    import chat as chat_mod
+
+
+class FakeModel:
+    def __init__(self, instruction=None, fail=False):
+        self.instruction = instruction
+        self.fail = fail
+        self.calls = []
+
+    def generate_content(self, prompt):
+        self.calls.append(prompt)
+        if self.fail:
+            raise RuntimeError('quota exceeded')
+        if isinstance(prompt, list):
+            return SimpleNamespace(text=f'image #{len(self.calls)}')
+        return SimpleNamespace(text=f'{self.instruction}: {prompt} #{len(self.calls)}')
+
+    def stream_content(self, prompt):
+        self.calls.append(prompt)
+        yield 'streamed '
+        yield 'reply'
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def setUp(self):
+        chat_mod.clear_response_cache()
+        chat_mod.configure_response_cache(routes=chat_mod.CACHED_ROUTES)
+        chat_mod._route_counts.clear()
+        self.models = {}
+
+        def get_model(model_name, instruction=None):
+            return self.models.setdefault((model_name, instruction), FakeModel(instruction))
+
+        patcher = mock.patch.object(chat_mod, 'get_model', get_model)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(chat_mod.clear_response_cache)
+
+    def upstream_calls(self):
+        return sum(len(m.calls) for m in self.models.values())
+
+    def test_identical_chat_requests_hit_the_cache(self):
+        first = chat_mod.chat('Hello there', character='gandalf')
+        self.assertEqual(chat_mod.chat('  Hello there ', character='gandalf'), first)
+        self.assertEqual(self.upstream_calls(), 1)
+
+        chat_mod.chat('Hello there', character='jarvis')
+        chat_mod.chat('Hello there', character='custom', custom_prompt='Be brief.')
+        self.assertEqual(self.upstream_calls(), 3)
+
+        stats = chat_mod.response_cache_stats()['routes']['chat']
+        self.assertEqual(stats['saved_upstream_calls'], 1)
+        self.assertEqual(stats['upstream_calls'], 3)
+
+    def test_opt_out_and_disabled_route_go_upstream(self):
+        chat_mod.chat('same', use_cache=False)
+        chat_mod.chat('same', use_cache=False)
+        self.assertEqual(self.upstream_calls(), 2)
+
+        chat_mod.configure_response_cache(routes=['classify_image'])
+        chat_mod.chat('again')
+        chat_mod.chat('again')
+        self.assertEqual(self.upstream_calls(), 4)
+        self.assertEqual(chat_mod.response_cache_stats()['routes']['chat']['bypassed'], 4)
+
+    def test_errors_are_not_cached(self):
+        self.models[(chat_mod.CHAT_MODEL, None)] = FakeModel(fail=True)
+        self.assertTrue(chat_mod.chat('hi').startswith('An error occurred'))
+        self.models[(chat_mod.CHAT_MODEL, None)] = FakeModel()
+        self.assertIn('#1', chat_mod.chat('hi'))
+
+    def test_adapter_fallback_text_is_not_cached(self):
+        class FailingCompletions:
+            def create(self, model, messages, stream=False):
+                raise RuntimeError('upstream 500')
+
+        class FailingOpenAI:
+            def __init__(self, api_key=None):
+                self.chat = SimpleNamespace(completions=FailingCompletions())
+
+        with mock.patch.dict(sys.modules, {'openai': SimpleNamespace(OpenAI=FailingOpenAI)}), \
+                mock.patch.dict(os.environ, {'GENAI_PROVIDER': 'openai', 'OPENAI_API_KEY': 'key'}):
+            sys.modules.pop('genai_compat', None)
+            import genai_compat
+            genai_compat = importlib.reload(genai_compat)
+            self.models[(chat_mod.CHAT_MODEL, None)] = genai_compat.GenerativeModel(chat_mod.CHAT_MODEL)
+            self.assertTrue(chat_mod.chat('hi').startswith('An error occurred'))
+
+        self.assertEqual(chat_mod.response_cache_stats()['cache']['entries'], 0)
+        self.models[(chat_mod.CHAT_MODEL, None)] = FakeModel()
+        self.assertEqual(chat_mod.chat('hi'), 'None: hi #1')
+        self.assertEqual(chat_mod.chat('hi'), 'None: hi #1')
+
+    def test_stream_is_stored_and_replayed(self):
+        self.assertEqual(list(chat_mod.chat_stream('tell me')), ['streamed ', 'reply'])
+        self.assertEqual(list(chat_mod.chat_stream('tell me')), ['streamed reply'])
+        self.assertEqual(chat_mod.chat('tell me'), 'streamed reply')
+        self.assertEqual(self.upstream_calls(), 1)
+
+    def test_classify_image_keys_on_image_content(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = []
+            for name, color in (('a.png', 'red'), ('b.png', 'red'), ('c.png', 'blue')):
+                path = os.path.join(tmp, name)
+                Image.new('RGB', (4, 4), color).save(path)
+                paths.append(path)
+
+            first = chat_mod.classify_image('Describe', paths[0])
+            self.assertEqual(chat_mod.classify_image('Describe', paths[1]), first)
+            self.assertNotEqual(chat_mod.classify_image('Describe', paths[2]), first)
+            chat_mod.classify_image('Describe briefly', paths[0])
+            self.assertEqual(self.upstream_calls(), 3)
+
+            self.models[(chat_mod.VISION_MODEL, None)] = FakeModel(fail=True)
+            chat_mod.clear_response_cache()
+            self.assertTrue(chat_mod.classify_image('Describe', paths[0]).startswith('Local fallback'))
+            self.assertEqual(chat_mod.response_cache_stats()['cache']['entries'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
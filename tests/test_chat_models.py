@@ -0,0 +1,58 @@
+import os
+import sys
+import unittest
+
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+try:
+    from games import chat as chat_mod
+except Exception:
+    import chat as chat_mod
+
+
+class ChatModelCacheTest(unittest.TestCase):
+    def setUp(self):
+        chat_mod.clear_model_cache()
+        chat_mod.configure_model_cache(2)
+
+    def tearDown(self):
+        chat_mod.clear_model_cache()
+        chat_mod.configure_model_cache(chat_mod.CHAT_MODEL_CACHE_SIZE)
+
+    def test_personas_are_built_once(self):
+        chat_mod.warm_up_models()
+        before = chat_mod.model_cache_stats()
+        self.assertEqual(before['pinned'], 2 + len(chat_mod.SYSTEM_INSTRUCTIONS))
+        for character in list(chat_mod.SYSTEM_INSTRUCTIONS) + [None, 'unknown']:
+            self.assertIs(chat_mod._chat_model(character), chat_mod._chat_model(character))
+        after = chat_mod.model_cache_stats()
+        self.assertEqual(after['misses'], before['misses'])
+        self.assertEqual(after['pinned'], before['pinned'])
+
+    def test_persona_keeps_its_instruction(self):
+        model = chat_mod._chat_model('gandalf')
+        self.assertEqual(model._kwargs['system_instruction'], chat_mod.SYSTEM_INSTRUCTIONS['gandalf'])
+        self.assertNotIn('system_instruction', chat_mod._chat_model(None)._kwargs)
+
+    def test_custom_prompts_are_evicted_lru(self):
+        a = chat_mod._chat_model('custom', 'prompt a')
+        b = chat_mod._chat_model('custom', 'prompt b')
+        self.assertIs(chat_mod._chat_model('custom', 'prompt a'), a)
+        chat_mod._chat_model('custom', 'prompt c')  # evicts b, the least recently used
+        self.assertIs(chat_mod._chat_model('custom', 'prompt a'), a)
+        self.assertIsNot(chat_mod._chat_model('custom', 'prompt b'), b)
+        stats = chat_mod.model_cache_stats()
+        self.assertEqual(stats['custom'], 2)
+        self.assertEqual(stats['evictions'], 2)
+
+    def test_custom_cache_can_be_disabled(self):
+        chat_mod.configure_model_cache(0)
+        first = chat_mod._chat_model('custom', 'uncached')
+        self.assertIsNot(chat_mod._chat_model('custom', 'uncached'), first)
+        self.assertEqual(chat_mod.model_cache_stats()['custom'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
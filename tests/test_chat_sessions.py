@@ -0,0 +1,160 @@
+import os
+import sys
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+try:
+    from games.ai import create_app
+    from games.blueprints import ai_routes
+    from games.config.settings import Config
+    from games.libraries.chat_sessions import SessionStore, estimate_tokens
+except Exception:
+    from ai import create_app
+    from blueprints import ai_routes
+    from config.settings import Config
+    from libraries.chat_sessions import SessionStore, estimate_tokens
+
+
+class SessionStoreTest(unittest.TestCase):
+    def test_history_stays_within_budget(self):
+        store = SessionStore(max_context_tokens=200)
+        session = store.create()
+        for i in range(40):
+            session.append('user', f'Question number {i}. ' + 'padding ' * 20)
+            session.append('assistant', f'Answer number {i}. ' + 'detail ' * 20)
+            self.assertLessEqual(session.history_tokens, 200)
+        self.assertEqual(len(session.turns) + session.folded, 80)
+        self.assertIn('Answer number 39.', session.turns[-1][1])
+        self.assertGreater(session.folded, 70)
+        # summary keeps the most recent folded turns, first sentence only
+        self.assertIn('User: Question number 38.', session.summary)
+        self.assertNotIn('User: Question number 0.', session.summary)
+
+    def test_prompt_includes_summary_and_recent_turns(self):
+        session = SessionStore().create()
+        self.assertEqual(session.prompt_for('hi'), 'hi')
+        session.summary.append('User: My name is Sari.')
+        session.append('user', 'What is batik?')
+        session.append('assistant', 'A wax-resist dyeing technique.')
+        prompt = session.prompt_for('Where is it from?')
+        self.assertTrue(prompt.startswith('Summary of the earlier conversation:\nUser: My name is Sari.'))
+        self.assertIn('User: What is batik?\nAssistant: A wax-resist dyeing technique.', prompt)
+        self.assertTrue(prompt.endswith('User: Where is it from?\nAssistant:'))
+
+    def test_idle_and_lru_eviction(self):
+        store = SessionStore(max_sessions=2, idle_seconds=60)
+        a, b = store.create(), store.create()
+        store.get(a.id)
+        c = store.create()  # evicts b, the least recently used
+        self.assertIsNone(store.get(b.id))
+        self.assertIs(store.get(c.id), c)
+
+        a.last_used -= 120
+        self.assertIsNone(store.get(a.id))
+        stats = store.stats()
+        self.assertEqual((stats['active'], stats['expired'], stats['evicted']), (1, 1, 1))
+
+    def test_estimate_tokens(self):
+        self.assertEqual(estimate_tokens(''), 0)
+        self.assertEqual(estimate_tokens('abcde'), 2)
+
+
+class SessionRoutesTest(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(Config)
+        self.client = self.app.test_client()
+        self.prompts = []
+        self.fail = False
+        self.blocked = None
+        self.entered = threading.Event()
+        test = self
+
+        class FakeModel:
+            def __init__(self, instruction):
+                self.instruction = instruction
+
+            def generate_content(self, prompt):
+                test.prompts.append((self.instruction, prompt))
+                if test.blocked is not None:
+                    test.entered.set()
+                    test.blocked.wait(5)
+                if test.fail:
+                    return SimpleNamespace(text='OpenAI adapter error: upstream 500', error=True)
+                return SimpleNamespace(text=f'reply {len(test.prompts)}')
+
+        chat_module = sys.modules[ai_routes.session_chat.__module__]
+        patcher = mock.patch.object(chat_module, 'get_model', lambda name, instruction=None: FakeModel(instruction))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_conversation_round_trip(self):
+        resp = self.client.post('/chat/sessions', json={'character': 'sherlock'})
+        self.assertEqual(resp.status_code, 201)
+        sid = resp.get_json()['data']['session_id']
+
+        first = self.client.post(f'/chat/sessions/{sid}/messages', json={'text': 'My name is Sari.'})
+        self.assertEqual(first.get_json()['data']['reply'], 'reply 1')
+        second = self.client.post(f'/chat/sessions/{sid}/messages', json={'text': 'What is my name?'})
+        usage = second.get_json()['data']['usage']
+        self.assertEqual(usage['turns'], 4)
+
+        instruction, prompt = self.prompts[-1]
+        self.assertIn('Sherlock Holmes', instruction)
+        self.assertIn('User: My name is Sari.\nAssistant: reply 1', prompt)
+        self.assertEqual(usage['prompt_tokens'], estimate_tokens(prompt))
+
+        history = self.client.get(f'/chat/sessions/{sid}').get_json()['data']
+        self.assertEqual([m['role'] for m in history['messages']], ['user', 'assistant'] * 2)
+
+        self.assertEqual(self.client.delete(f'/chat/sessions/{sid}').status_code, 200)
+        self.assertEqual(self.client.post(f'/chat/sessions/{sid}/messages', json={'text': 'hi'}).status_code, 404)
+
+    def test_failed_provider_call_is_not_recorded(self):
+        sid = self.client.post('/chat/sessions', json={}).get_json()['data']['session_id']
+        self.fail = True
+        resp = self.client.post(f'/chat/sessions/{sid}/messages', json={'text': 'hello'})
+        self.assertEqual(resp.status_code, 502)
+        self.assertIn('upstream 500', resp.get_json()['message'])
+        self.assertEqual(self.client.get(f'/chat/sessions/{sid}').get_json()['data']['messages'], [])
+
+        self.fail = False
+        resp = self.client.post(f'/chat/sessions/{sid}/messages', json={'text': 'hello'})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.get_json()['data']['usage']['turns'], 2)
+
+    def test_reading_a_busy_session_does_not_wait_for_the_provider(self):
+        sid = self.client.post('/chat/sessions', json={}).get_json()['data']['session_id']
+        self.blocked = threading.Event()
+        self.addCleanup(self.blocked.set)
+        results = []
+        worker = threading.Thread(target=lambda: results.append(
+            self.client.post(f'/chat/sessions/{sid}/messages', json={'text': 'hello'}).status_code))
+        worker.start()
+        self.assertTrue(self.entered.wait(5))
+
+        started = time.monotonic()
+        resp = self.client.get(f'/chat/sessions/{sid}')
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(resp.get_json()['data']['messages'], [])
+
+        self.blocked.set()
+        worker.join(5)
+        self.assertEqual(results, [200])
+        self.assertEqual(len(self.client.get(f'/chat/sessions/{sid}').get_json()['data']['messages']), 2)
+
+    def test_validation(self):
+        self.assertEqual(self.client.post('/chat/sessions', json={'character': 'nobody'}).status_code, 400)
+        self.assertEqual(self.client.post('/chat/sessions', json={'character': 'custom'}).status_code, 400)
+        self.assertEqual(self.client.post('/chat/sessions', json={'max_context_tokens': 5}).status_code, 400)
+        self.assertEqual(self.client.get('/chat/sessions/missing').status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
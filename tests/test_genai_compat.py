@@ -1,7 +1,11 @@
 import importlib
 import os
 import sys
+import threading
+import time
 import types
+import unittest
+from unittest import mock
 from types import SimpleNamespace
 
 
@@ -48,4 +52,309 @@ def test_openai_adapter_with_fake_module(monkeypatch):
     assert hasattr(resp, 'text')
     assert resp.text == 'fake reply'
     # credential source should mention OPENAI
-    assert genai_compat._credential_source and 'OPENAI' in genai_compat._credential_source
\ No newline at end of file
+    assert genai_compat._credential_source and 'OPENAI' in genai_compat._credential_source
+
+
+class _FreshModuleTest(unittest.TestCase):
+    """Reloads genai_compat with `provider` so module state starts clean."""
+
+    provider = 'mock'
+
+    def setUp(self):
+        env = mock.patch.dict(os.environ, {'GENAI_PROVIDER': self.provider})
+        env.start()
+        self.addCleanup(env.stop)
+        if 'genai_compat' in sys.modules:
+            del sys.modules['genai_compat']
+        import genai_compat
+        self.genai_compat = importlib.reload(genai_compat)
+
+    def patch(self, target, name, value):
+        patcher = mock.patch.object(target, name, value)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class MockStreamingTest(_FreshModuleTest):
+    def test_mock_provider_streams_chunks(self):
+        model = self.genai_compat.GenerativeModel('test-model')
+        chunks = list(model.stream_content('hello streaming world'))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(''.join(chunks), model.generate_content('hello streaming world').text)
+
+
+class ConcurrencyLimiterTest(_FreshModuleTest):
+    def test_queues_in_order_and_times_out(self):
+        limiter = self.genai_compat.ConcurrencyLimiter(1, queue_timeout=0.05)
+        limiter.acquire()
+        order = []
+
+        def worker(n):
+            limiter.acquire(timeout=5)
+            order.append(n)
+            limiter.release()
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(3)]
+        for t in threads:
+            t.start()
+            while limiter.stats()['queued'] <= threads.index(t):
+                time.sleep(0.001)
+        limiter.release()
+        for t in threads:
+            t.join()
+        self.assertEqual(order, [0, 1, 2])
+
+        limiter.acquire()
+        with self.assertRaises(self.genai_compat.QueueTimeout):
+            limiter.acquire()
+        stats = limiter.stats()
+        self.assertEqual((stats['timeouts'], stats['in_flight'], stats['waited']), (1, 1, 4))
+
+    def test_async_generate_respects_limit(self):
+        import asyncio
+        genai_compat = self.genai_compat
+        genai_compat.configure_concurrency(max_concurrency=2)
+        model = genai_compat.GenerativeModel('test-model')
+        peak = 0
+        slow = model._generate
+
+        def generate(args, kwargs):
+            nonlocal peak
+            peak = max(peak, genai_compat._limiter().stats()['in_flight'])
+            time.sleep(0.01)
+            return slow(args, kwargs)
+
+        model._generate = generate
+
+        async def run():
+            return await asyncio.gather(*(model.generate_content_async(f'q{i}') for i in range(6)))
+
+        replies = asyncio.run(run())
+        self.assertEqual([r.text.rsplit('=', 1)[1] for r in replies], [f'q{i}' for i in range(6)])
+        self.assertEqual(peak, 2)
+        stats = genai_compat.pool_stats()['concurrency']['mock']
+        self.assertEqual((stats['requests'], stats['in_flight']), (6, 0))
+
+
+class ClientPoolTest(unittest.TestCase):
+    def test_openai_client_is_reused(self):
+        created = []
+
+        class FakeCompletions:
+            def create(self, model, messages, stream=False):
+                return types.SimpleNamespace(choices=[types.SimpleNamespace(message=types.SimpleNamespace(content='pooled'))])
+
+        class FakeOpenAI:
+            def __init__(self, api_key=None):
+                created.append(api_key)
+                self.chat = types.SimpleNamespace(completions=FakeCompletions())
+
+        with mock.patch.dict(sys.modules, {'openai': types.SimpleNamespace(OpenAI=FakeOpenAI)}), \
+                mock.patch.dict(os.environ, {'GENAI_PROVIDER': 'openai', 'OPENAI_API_KEY': 'key-one'}):
+            sys.modules.pop('genai_compat', None)
+            import genai_compat
+            genai_compat = importlib.reload(genai_compat)
+
+            model = genai_compat.GenerativeModel('gpt-test')
+            self.assertEqual([model.generate_content('hi').text for _ in range(3)], ['pooled'] * 3)
+            self.assertEqual(genai_compat.GenerativeModel('other').generate_content('hi').text, 'pooled')
+            self.assertEqual(created, ['key-one'])
+
+            os.environ['OPENAI_API_KEY'] = 'key-two'
+            model.generate_content('hi')
+            self.assertEqual(created, ['key-one', 'key-two'])
+            clients = genai_compat.pool_stats()['clients']
+            self.assertEqual(sorted(c['uses'] for c in clients), [1, 4])
+            self.assertTrue(all('key-' not in c['credentials'] for c in clients))
+
+    def test_slow_client_construction_does_not_block_the_pool(self):
+        release = threading.Event()
+        building = threading.Event()
+
+        class SlowOpenAI:
+            def __init__(self, api_key=None):
+                building.set()
+                release.wait(5)
+
+        class AsyncOpenAI:
+            def __init__(self, api_key=None):
+                pass
+
+        fake = types.SimpleNamespace(OpenAI=SlowOpenAI, AsyncOpenAI=AsyncOpenAI)
+        with mock.patch.dict(sys.modules, {'openai': fake}), \
+                mock.patch.dict(os.environ, {'GENAI_PROVIDER': 'openai', 'OPENAI_API_KEY': 'key-one'}):
+            sys.modules.pop('genai_compat', None)
+            import genai_compat
+            genai_compat = importlib.reload(genai_compat)
+
+            clients = []
+            worker = threading.Thread(target=lambda: clients.append(genai_compat._get_client('openai')))
+            worker.start()
+            self.assertTrue(building.wait(5))
+            self.assertIsInstance(genai_compat._get_client('openai_async'), AsyncOpenAI)
+            self.assertEqual(len(genai_compat.pool_stats()['clients']), 1)
+            release.set()
+            worker.join(5)
+            self.assertIs(genai_compat._get_client('openai'), clients[0])
+            self.assertEqual(sorted(c['uses'] for c in genai_compat.pool_stats()['clients']), [1, 2])
+
+    def test_genai_client_gets_generation_config(self):
+        calls = []
+
+        class FakeModels:
+            def generate_content(self, **call):
+                calls.append(call)
+                return types.SimpleNamespace(text='ok')
+
+        class FakeClient:
+            def __init__(self, api_key=None):
+                self.models = FakeModels()
+
+        fake_genai = types.SimpleNamespace(Client=FakeClient)
+        fake_google = types.SimpleNamespace(genai=fake_genai)
+        with mock.patch.dict(sys.modules, {'google': fake_google, 'google.genai': fake_genai}), \
+                mock.patch.dict(os.environ, {'GENAI_PROVIDER': 'genai', 'GOOGLE_API_KEY': 'key'}):
+            sys.modules.pop('genai_compat', None)
+            import genai_compat
+            genai_compat = importlib.reload(genai_compat)
+
+            model = genai_compat.GenerativeModel('gemini-test', system_instruction='Be brief.')
+            model.generate_content('draw a cat', generation_config={'response_mime_type': 'image/png', 'temperature': 0.2})
+            genai_compat.GenerativeModel('gemini-test').generate_content('hi')
+
+        self.assertEqual(calls, [
+            {'model': 'gemini-test', 'contents': 'draw a cat', 'config': {
+                'response_mime_type': 'image/png', 'temperature': 0.2, 'system_instruction': 'Be brief.'}},
+            {'model': 'gemini-test', 'contents': 'hi'},
+        ])
+
+
+def _fail(prompt):
+    raise RuntimeError('upstream 500')
+
+
+def _slow(seconds, text):
+    def reply(prompt):
+        time.sleep(seconds)
+        return text
+    return reply
+
+
+class ProviderChainTest(_FreshModuleTest):
+    def chain_with(self, behaviour, **options):
+        """A chain over fake providers; `behaviour[name]` is a callable(prompt) -> text."""
+        genai_compat = self.genai_compat
+        self.patch(genai_compat, '_load_sdk', lambda name: types.SimpleNamespace(name=name))
+
+        def generate_with(model, name, sdk, inst, args, kwargs, strict=False):
+            return types.SimpleNamespace(text=behaviour[name](args[0]))
+
+        self.patch(genai_compat.GenerativeModel, '_generate_with', generate_with)
+        chain = genai_compat.configure_chain(list(behaviour), **options)
+        self.addCleanup(genai_compat.configure_chain, None)
+        return chain
+
+    def generate(self, prompt='hi'):
+        return self.genai_compat.GenerativeModel('m').generate_content(prompt).text
+
+    def test_falls_back_and_opens_circuit(self):
+        self.chain_with({'genai': _fail, 'openai': lambda p: 'from openai'}, failure_threshold=2, reset_seconds=60)
+        for _ in range(4):
+            self.assertEqual(self.generate(), 'from openai')
+        stats = self.genai_compat.chain_stats()['providers']['genai']
+        self.assertEqual((stats['errors'], stats['short_circuited']), (2, 2))
+        self.assertEqual(stats['circuit']['state'], 'open')
+        self.assertEqual(stats['last_error'], 'upstream 500')
+
+    def test_half_open_probe(self):
+        calls = []
+
+        def flaky(prompt):
+            calls.append(prompt)
+            if len(calls) <= 1:
+                raise RuntimeError('down')
+            return 'recovered'
+
+        chain = self.chain_with({'genai': flaky, 'mock': lambda p: 'mock'}, failure_threshold=1, reset_seconds=0.05)
+        self.assertEqual(self.generate('a'), 'mock')
+        self.assertEqual(self.generate('b'), 'mock')   # skipped: circuit open
+        self.assertEqual(calls, ['a'])
+        time.sleep(0.06)
+        self.assertEqual(self.generate('c'), 'recovered')
+        self.assertEqual(chain.providers[0].breaker.state, 'closed')
+
+    def test_timeout_moves_on(self):
+        self.chain_with({'genai': _slow(0.5, 'too late'), 'mock': lambda p: 'fast'}, timeout=0.05)
+        started = time.monotonic()
+        self.assertEqual(self.generate(), 'fast')
+        self.assertLess(time.monotonic() - started, 0.4)
+        stats = self.genai_compat.chain_stats()['providers']['genai']
+        self.assertEqual((stats['timeouts'], stats['error_latency']['count']), (1, 1))
+
+    def test_hung_provider_does_not_starve_fallbacks(self):
+        # a hung provider fills its own workers; the fallback keeps its own
+        # and must never be charged for waiting
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def hang(prompt):
+            release.wait(5)
+            return 'too late'
+
+        self.chain_with({'genai': hang, 'openai': lambda p: 'fallback'},
+                        timeout=0.1, failure_threshold=100, max_workers=2)
+        for _ in range(4):
+            self.assertEqual(self.generate(), 'fallback')
+        stats = self.genai_compat.chain_stats()['providers']
+        self.assertEqual((stats['genai']['timeouts'], stats['genai']['saturated']), (2, 2))
+        self.assertEqual(stats['genai']['circuit']['consecutive_failures'], 2)
+        self.assertEqual(stats['openai']['successes'], 4)
+        self.assertEqual(stats['openai']['circuit']['consecutive_failures'], 0)
+
+    def test_concurrency_wait_does_not_trip_breaker(self):
+        genai_compat = self.genai_compat
+        genai_compat.configure_concurrency(max_concurrency=1, queue_timeout=5)
+        calls = []
+        self.chain_with({'genai': lambda p: calls.append(p) or 'genai', 'mock': lambda p: 'mock'},
+                        timeout=0.05, failure_threshold=1)
+        slot = genai_compat._limiter('genai')
+        slot.acquire()
+        try:
+            self.assertEqual(self.generate(), 'mock')
+        finally:
+            slot.release()
+        stats = genai_compat.chain_stats()['providers']['genai']
+        self.assertEqual((stats['saturated'], stats['timeouts'], stats['errors']), (1, 0, 0))
+        self.assertEqual(stats['circuit']['state'], 'closed')
+        self.assertEqual(self.generate(), 'genai')
+        self.assertEqual(calls, ['hi'])   # the abandoned call never reached the provider
+
+    def test_hedges_slow_requests(self):
+        chain = self.chain_with({'genai': _slow(0.5, 'primary'), 'openai': _slow(0.01, 'hedge')},
+                                timeout=5, hedge_percentile=90, hedge_min_samples=5)
+        for _ in range(5):
+            chain.providers[0].latency.observe(0.02)
+        started = time.monotonic()
+        self.assertEqual(self.generate(), 'hedge')
+        self.assertLess(time.monotonic() - started, 0.4)
+        stats = self.genai_compat.chain_stats()['providers']
+        self.assertEqual((stats['openai']['hedges'], stats['openai']['hedge_wins']), (1, 1))
+        self.assertEqual((stats['genai']['errors'], stats['genai']['timeouts']), (0, 0))
+
+    def test_exhausted_raises(self):
+        self.chain_with({'genai': _fail, 'openai': _fail})
+        with self.assertRaises(self.genai_compat.ProviderError) as ctx:
+            self.generate()
+        self.assertIn('genai: upstream 500', str(ctx.exception))
+        self.assertIn('openai: upstream 500', str(ctx.exception))
+        self.assertEqual(self.genai_compat.chain_stats()['exhausted'], 1)
+
+    def test_parse_chain(self):
+        self.assertEqual(self.genai_compat._parse_chain('genai:10, openai ,mock'),
+                         [('genai', 10.0), ('openai', None), ('mock', None)])
+        with self.assertRaises(ValueError):
+            self.genai_compat._parse_chain('genai,bogus')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import threading
+import unittest
+
+try:
+    from games.libraries import ner
+except Exception:
+    from libraries import ner
+
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        self.calls = 0
+
+        def _fake_loader():
+            self.calls += 1
+            return object()
+
+        ner._LOADERS['fake'] = _fake_loader
+        ner._locks['fake'] = threading.Lock()
+
+    def tearDown(self):
+        ner.unload('fake')
+        ner._LOADERS.pop('fake', None)
+        ner._locks.pop('fake', None)
+
+    def test_import_does_not_load_models(self):
+        for name in ('spacy', 'summarizer', 'generator'):
+            self.assertFalse(ner.is_loaded(name))
+
+    def test_loads_once_across_threads(self):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(ner.get_model('fake'))) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(len({id(r) for r in results}), 1)
+
+    def test_stats_and_unload(self):
+        self.assertFalse(ner.model_stats()['fake']['loaded'])
+        ner.warm_up(['fake'])
+        stats = ner.model_stats()['fake']
+        self.assertTrue(stats['loaded'])
+        self.assertIn('load_seconds', stats)
+        ner.unload('fake')
+        self.assertFalse(ner.is_loaded('fake'))
+
+    def test_warm_up_reports_errors(self):
+        def _broken():
+            raise ImportError('missing dependency')
+        ner._LOADERS['fake'] = _broken
+        errors = ner.warm_up(['fake'])
+        self.assertIn('fake', errors)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import sys
+import unittest
+from unittest import mock
+
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+try:
+    from games.ai import create_app
+    from games.blueprints import api_routes
+    from games.config.settings import Config
+except Exception:
+    from ai import create_app
+    from blueprints import api_routes
+    from config.settings import Config
+
+ner = api_routes.ner_lib
+
+
+class StubAnalyzer:
+    """Scores 'good' as positive and 'bad' as negative, recording every call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def polarity_scores(self, text):
+        self.calls.append(text)
+        pos = 1.0 if 'good' in text.lower() else 0.0
+        neg = 1.0 if 'bad' in text.lower() else 0.0
+        return {'neg': neg, 'neu': 1.0 - max(pos, neg), 'pos': pos, 'compound': pos - neg}
+
+
+class _StubbedSentiment(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = StubAnalyzer()
+        patcher = mock.patch.object(ner, 'get_model', lambda name: self.analyzer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class SplitSentencesTest(unittest.TestCase):
+    def test_splits_on_final_punctuation(self):
+        self.assertEqual(ner.split_sentences('One. Two!  Three? Four'), ['One.', 'Two!', 'Three?', 'Four'])
+
+    def test_ignores_blank_and_inner_punctuation(self):
+        self.assertEqual(ner.split_sentences('   '), [])
+        self.assertEqual(ner.split_sentences('Pi is 3.14 roughly.'), ['Pi is 3.14 roughly.'])
+
+
+class SentimentBatchTest(_StubbedSentiment):
+    def test_scores_each_text_in_order(self):
+        resp = ner.analyze_sentiment_batch(['good day', 'bad day', 'a day'])
+        self.assertEqual(resp['status'], 200)
+        self.assertEqual([r['sentiment']['compound'] for r in resp['data']['results']], [1.0, -1.0, 0.0])
+        self.assertEqual((resp['data']['count'], resp['data']['sentences']), (3, 3))
+
+    def test_split_averages_sentences(self):
+        resp = ner.analyze_sentiment_batch(['Good food. Bad service. Fine place.'], split=True, include_sentences=True)
+        item = resp['data']['results'][0]
+        self.assertEqual(item['sentences'], 3)
+        self.assertEqual(item['sentiment'], {'neg': 0.3333, 'neu': 0.3333, 'pos': 0.3333, 'compound': 0.0})
+        self.assertEqual([s['text'] for s in item['sentence_scores']], ['Good food.', 'Bad service.', 'Fine place.'])
+        self.assertEqual(item['sentence_scores'][1]['sentiment']['compound'], -1.0)
+
+    def test_duplicate_sentences_are_scored_once(self):
+        resp = ner.analyze_sentiment_batch(['So good. So good.', 'So good.'], split=True)
+        self.assertEqual(self.analyzer.calls, ['So good.'])
+        self.assertEqual(resp['data']['sentences'], 3)
+        self.assertNotIn('sentence_scores', resp['data']['results'][0])
+
+    def test_empty_text_gets_neutral_zero_scores(self):
+        item = ner.analyze_sentiment_batch(['  '], split=True)['data']['results'][0]
+        self.assertEqual(item, {'sentiment': {'neg': 0.0, 'neu': 0.0, 'pos': 0.0, 'compound': 0.0}, 'sentences': 0})
+
+    def test_analyzer_errors_become_500(self):
+        self.analyzer.polarity_scores = mock.Mock(side_effect=RuntimeError('lexicon missing'))
+        resp = ner.analyze_sentiment_batch(['x'])
+        self.assertEqual(resp['status'], 500)
+        self.assertIn('lexicon missing', resp['message'])
+
+
+class SentimentBatchRouteTest(_StubbedSentiment):
+    def setUp(self):
+        super().setUp()
+        self.client = create_app(Config).test_client()
+
+    def post(self, body):
+        return self.client.post('/ner/sentiment/batch', json=body)
+
+    def test_batch_route(self):
+        resp = self.post({'texts': ['good. bad.'], 'split_sentences': True})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.get_json()['data']['results'][0]['sentences'], 2)
+
+    def test_validation(self):
+        for body in ({}, {'texts': []}, {'texts': 'good'}, {'texts': ['ok', 3]}):
+            self.assertEqual(self.post(body).status_code, 400, body)
+        self.assertIn('Too many texts', self.post({'texts': ['a'] * 10001}).get_json()['message'])
+        self.assertIn('Batch too large', self.post({'texts': ['a' * 500001] * 2}).get_json()['message'])
+        self.assertEqual(self.analyzer.calls, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
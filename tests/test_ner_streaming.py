@@ -0,0 +1,105 @@
+import json
+import queue
+import sys
+import threading
+import types
+import unittest
+from unittest import mock
+
+from flask import Flask
+
+try:
+    from games.libraries import ner
+    from games.middleware.streaming import streaming_response
+except Exception:
+    from libraries import ner
+    from middleware.streaming import streaming_response
+
+
+class FakeStreamer:
+    """Same contract as transformers.TextIteratorStreamer."""
+
+    def __init__(self, tokenizer, skip_prompt=False, skip_special_tokens=False, timeout=None):
+        self.queue = queue.Queue()
+        self.timeout = timeout
+
+    def put_text(self, text):
+        self.queue.put(text)
+
+    def end(self):
+        self.queue.put(None)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        value = self.queue.get(timeout=self.timeout)
+        if value is None:
+            raise StopIteration
+        return value
+
+
+class FakeTokenizer:
+    eos_token_id = 0
+
+    def __call__(self, text, **kwargs):
+        return {'input_ids': [text]}
+
+
+class FakeGenerator:
+    def __init__(self, pieces, error=None, hang=None):
+        self.pieces = pieces
+        self.error = error
+        self.hang = hang
+        self.tokenizer = FakeTokenizer()
+        self.model = self
+
+    def generate(self, streamer, **kwargs):
+        for piece in self.pieces:
+            streamer.put_text(piece)
+        if self.hang is not None:
+            self.hang.wait(5)
+        if self.error is not None:
+            raise self.error
+        streamer.end()
+
+
+class StreamTextGeneratorTest(unittest.TestCase):
+    def setUp(self):
+        fake = types.ModuleType('transformers')
+        fake.TextIteratorStreamer = FakeStreamer
+        fake.StoppingCriteria = object
+        fake.StoppingCriteriaList = list
+        for patcher in (mock.patch.dict(sys.modules, {'transformers': fake}),
+                        mock.patch.object(ner, 'GENERATOR_STREAM_TIMEOUT', 0.1)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def stream(self, generator):
+        with mock.patch.object(ner, 'get_model', lambda name: generator):
+            return list(ner.stream_text_generator('Once upon'))
+
+    def test_streams_pieces(self):
+        self.assertEqual(self.stream(FakeGenerator(['a ', 'time'])), ['a ', 'time'])
+
+    def test_generation_error_is_reraised(self):
+        with self.assertRaisesRegex(RuntimeError, 'out of memory'):
+            self.stream(FakeGenerator(['a '], error=RuntimeError('out of memory')))
+
+    def test_stalled_generation_times_out(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        with self.assertRaises(TimeoutError):
+            self.stream(FakeGenerator([], hang=release))
+
+    def test_error_becomes_error_event(self):
+        generator = FakeGenerator(['a '], error=RuntimeError('bad kwargs'))
+        app = Flask(__name__)
+        with mock.patch.object(ner, 'get_model', lambda name: generator), app.test_request_context():
+            body = ''.join(streaming_response(ner.stream_text_generator('x'), 'ndjson').response)
+        events = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(events, [{'event': 'token', 'text': 'a '}, {'event': 'error', 'message': 'bad kwargs'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
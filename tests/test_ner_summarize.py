@@ -0,0 +1,90 @@
+import unittest
+from unittest import mock
+
+try:
+    from games.libraries import ner
+except Exception:
+    from libraries import ner
+
+
+class WordTokenizer:
+    """One token per whitespace-separated word."""
+
+    model_max_length = 1024
+
+    def __call__(self, text, add_special_tokens=True, verbose=True):
+        return {'input_ids': text.split()}
+
+    def decode(self, ids, skip_special_tokens=False):
+        return ' '.join(ids)
+
+
+class TokenWindowsTest(unittest.TestCase):
+    def test_spans_overlap_and_cover_the_input(self):
+        self.assertEqual(ner._token_windows(10, 4, 1), [(0, 4), (3, 7), (6, 10)])
+        self.assertEqual(ner._token_windows(8, 4, 0), [(0, 4), (4, 8)])
+
+    def test_short_input_is_one_span(self):
+        self.assertEqual(ner._token_windows(3, 4, 2), [(0, 3)])
+
+    def test_overlap_at_least_size_still_advances(self):
+        self.assertEqual(ner._token_windows(3, 2, 5), [(0, 2), (1, 3)])
+
+
+class MapReduceSummaryTest(unittest.TestCase):
+    def setUp(self):
+        self.tokenizer = WordTokenizer()
+        self.calls = []
+        self.keep_words = 10
+
+        def summarize_batch(texts):
+            self.calls.append(texts)
+            return [' '.join(t.split()[:self.keep_words]) for t in texts]
+
+        patchers = [
+            mock.patch.object(ner, 'get_model', lambda name: (self.tokenizer, None)),
+            mock.patch.object(ner, '_summarize_batch', summarize_batch),
+            mock.patch.object(ner, 'get_batcher', lambda name: lambda text: summarize_batch([text])[0]),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def words(self, n):
+        return ' '.join(f'w{i}' for i in range(n))
+
+    def inputs(self):
+        return [t for batch in self.calls for t in batch]
+
+    def test_levels_and_progress(self):
+        events = list(ner.iter_summarize_long(self.words(300), chunk_tokens=100, overlap=10, batch_size=2))
+        progress = [e for e in events if e['event'] == 'progress']
+        # 300 tokens in windows of 100 sharing 10: 4 chunks, summarized two at a time
+        self.assertEqual([(e['level'], e['done'], e['total']) for e in progress], [(0, 2, 4), (0, 4, 4)])
+        self.assertEqual(events[-1]['levels'], 2)
+        self.assertEqual([len(batch) for batch in self.calls], [2, 2, 1])
+        first_chunks = self.calls[0]
+        self.assertEqual(first_chunks[0].split()[-10:], first_chunks[1].split()[:10])
+
+    def test_reduce_levels_are_capped(self):
+        self.keep_words = 10 ** 6   # summaries never get shorter
+        events = list(ner.iter_summarize_long(self.words(200), chunk_tokens=100, overlap=0))
+        self.assertEqual(events[-1]['levels'], ner.MAX_REDUCE_LEVELS + 1)
+        levels = {e['level'] for e in events if e['event'] == 'progress'}
+        self.assertEqual(levels, set(range(ner.MAX_REDUCE_LEVELS)))
+
+    def test_chunk_tokens_above_the_window_are_clamped(self):
+        window = ner._summary_window(self.tokenizer)
+        resp = ner.analyze_summarize(self.words(window + 8), chunk_tokens=1024, use_cache=False)
+        self.assertEqual(resp['status'], 200)
+        self.assertGreater(len(self.calls), 1)   # map-reduce, not one truncated pass
+        self.assertTrue(all(len(t.split()) <= window for t in self.inputs()))
+
+    def test_short_text_is_a_single_pass(self):
+        resp = ner.analyze_summarize(self.words(50), chunk_tokens=1024, use_cache=False)
+        self.assertEqual(resp['data']['summary'], self.words(10))
+        self.assertEqual(len(self.calls), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+try:
+    from games.ai import create_app
+    from games.blueprints import api_routes
+    from games.config.settings import Config
+except Exception:
+    from ai import create_app
+    from blueprints import api_routes
+    from config.settings import Config
+
+ner = api_routes.ner_lib
+
+
+class FakeDoc:
+    def __init__(self, text):
+        words = text.split()
+        self.ents = [SimpleNamespace(text=w, label_='PERSON') for w in words if w[:1].isupper()]
+        self._tokens = [SimpleNamespace(text=w, lemma_=w.lower(), pos_='NOUN', tag_='NN') for w in words]
+
+    def __iter__(self):
+        return iter(self._tokens)
+
+
+class FakeNlp:
+    pipe_names = ['tok2vec', 'tagger', 'parser', 'attribute_ruler', 'lemmatizer', 'ner']
+
+    def __init__(self):
+        self.calls = []
+
+    def pipe(self, texts, batch_size=1000, n_process=1, disable=()):
+        self.calls.append({'batch_size': batch_size, 'n_process': n_process, 'disable': set(disable)})
+        for text in texts:
+            yield FakeDoc(text)
+
+
+class _FakeSpacy(unittest.TestCase):
+    def setUp(self):
+        self.nlp = FakeNlp()
+        patcher = mock.patch.object(ner, 'get_model', lambda name: self.nlp)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TaggingBatchTest(_FakeSpacy):
+    def test_results_keep_input_order(self):
+        texts = [f'Ana{i} walks' for i in range(50)]
+        resp = ner.analyze_text_batch(texts, batch_size=8, n_process=2)
+        self.assertEqual(resp['data']['count'], 50)
+        self.assertEqual([r['entities'][0]['text'] for r in resp['data']['results']], [f'Ana{i}' for i in range(50)])
+        self.assertEqual(self.nlp.calls[0]['batch_size'], 8)
+        self.assertEqual(self.nlp.calls[0]['n_process'], 2)
+
+    def test_entities_only_disables_everything_else(self):
+        result = ner.analyze_text_batch(['Budi eats rice'], fields=['entities'])['data']['results'][0]
+        self.assertEqual(result, {'entities': [{'text': 'Budi', 'label': 'PERSON'}]})
+        self.assertEqual(self.nlp.calls[0]['disable'], {'tagger', 'parser', 'attribute_ruler', 'lemmatizer'})
+
+    def test_token_attributes(self):
+        result = ner.analyze_text_batch(['Budi eats'], fields=['lemma', 'tag'])['data']['results'][0]
+        self.assertEqual(result, {'tokens': [
+            {'text': 'Budi', 'lemma': 'budi', 'tag': 'NN'},
+            {'text': 'eats', 'lemma': 'eats', 'tag': 'NN'},
+        ]})
+        self.assertNotIn('tagger', self.nlp.calls[0]['disable'])
+        self.assertIn('parser', self.nlp.calls[0]['disable'])
+        self.assertIn('ner', self.nlp.calls[0]['disable'])
+
+    def test_tokens_alone_need_no_components(self):
+        result = ner.analyze_text_batch(['a b'], fields=['tokens'])['data']['results'][0]
+        self.assertEqual(result, {'tokens': [{'text': 'a'}, {'text': 'b'}]})
+        self.assertEqual(self.nlp.calls[0]['disable'], set(FakeNlp.pipe_names))
+
+    def test_every_field_has_components(self):
+        self.assertEqual(set(ner._FIELD_COMPONENTS), set(ner.TAGGING_FIELDS))
+        self.assertFalse(any('parser' in c for c in ner._FIELD_COMPONENTS.values()))
+
+    def test_unknown_field(self):
+        resp = ner.analyze_text_batch(['x'], fields=['entities', 'sentiment'])
+        self.assertEqual(resp['status'], 400)
+        self.assertIn('sentiment', resp['message'])
+        self.assertEqual(self.nlp.calls, [])
+
+
+class TaggingBatchRouteTest(_FakeSpacy):
+    def setUp(self):
+        super().setUp()
+        self.client = create_app(Config).test_client()
+
+    def post(self, body):
+        return self.client.post('/ner/tagging/batch', json=body)
+
+    def test_batch_route(self):
+        resp = self.post({'texts': ['Sari sings', 'Tono'], 'fields': ['entities']})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([r['entities'][0]['text'] for r in resp.get_json()['data']['results']], ['Sari', 'Tono'])
+
+    def test_limits(self):
+        cases = [
+            ({'texts': []}, 'texts'),
+            ({'texts': ['ok', None]}, 'texts'),
+            ({'texts': ['a'] * 1001}, 'Too many texts'),
+            ({'texts': ['a' * 10001]}, 'Text too long'),
+            ({'texts': ['a'], 'fields': []}, 'fields'),
+            ({'texts': ['a'], 'fields': 'entities'}, 'fields'),
+            ({'texts': ['a'], 'batch_size': 0}, 'batch_size'),
+            ({'texts': ['a'], 'batch_size': 1001}, 'batch_size'),
+            ({'texts': ['a'], 'n_process': (os.cpu_count() or 1) + 1}, 'n_process'),
+        ]
+        for body, message in cases:
+            resp = self.post(body)
+            self.assertEqual(resp.status_code, 400, body)
+            self.assertIn(message, resp.get_json()['message'])
+        self.assertEqual(self.nlp.calls, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
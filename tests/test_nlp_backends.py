@@ -0,0 +1,74 @@
+"""Parity of the optional ONNX / int8 backends against PyTorch.
+
+These tests download the real models, so they only run when torch,
+transformers and optimum are installed.
+"""
+import difflib
+import importlib.util
+import unittest
+
+try:
+    from games.libraries import ner
+except Exception:
+    from libraries import ner
+
+_HAVE_TORCH = all(importlib.util.find_spec(m) for m in ('torch', 'transformers'))
+_HAVE_ORT = _HAVE_TORCH and importlib.util.find_spec('optimum') is not None
+
+TEXT = (
+    "The city council met on Tuesday to discuss the new public transport plan. "
+    "Officials said the proposal would add three bus lines and extend the tram "
+    "network to the northern districts by next year. Residents raised concerns "
+    "about construction noise and the cost of the project."
+)
+
+
+def _outputs(backend):
+    ner.set_backend(backend)
+    summary = ner._summarize_batch([TEXT])[0]
+    generator = ner.get_model('generator')
+    inputs = generator.tokenizer('Once upon a time', return_tensors='pt')
+    ids = generator.model.generate(**inputs, do_sample=False, max_new_tokens=20,
+                                   pad_token_id=generator.tokenizer.eos_token_id)
+    return summary, generator.tokenizer.decode(ids[0], skip_special_tokens=True)
+
+
+@unittest.skipUnless(_HAVE_TORCH, 'torch/transformers not installed')
+class TestBackendParity(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.reference = _outputs('torch')
+
+    @classmethod
+    def tearDownClass(cls):
+        ner.set_backend('torch')
+
+    @unittest.skipUnless(_HAVE_ORT, 'optimum[onnxruntime] not installed')
+    def test_onnx_matches_torch(self):
+        summary, generated = _outputs('onnx')
+        self.assertEqual(summary, self.reference[0])
+        self.assertEqual(generated, self.reference[1])
+
+    def test_int8_close_to_torch(self):
+        summary, generated = _outputs('torch-int8')
+        self.assertGreater(difflib.SequenceMatcher(None, summary, self.reference[0]).ratio(), 0.6)
+        self.assertTrue(generated.startswith('Once upon a time'))
+
+
+class TestBackendSelection(unittest.TestCase):
+    def tearDown(self):
+        ner.set_backend('torch')
+
+    def test_rejects_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            ner.set_backend('cuda')
+
+    def test_switch_unloads_models(self):
+        ner._models['summarizer'] = object()
+        ner.set_backend('torch-int8')
+        self.assertFalse(ner.is_loaded('summarizer'))
+        self.assertEqual(ner.get_backend(), 'torch-int8')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+import os
+import tempfile
+import unittest
+
+from flask import Flask, jsonify
+
+try:
+    from games.middleware.rate_limit_storage import MemoryStorage, SQLiteStorage, RedisStorage, storage_from_url
+    from games.middleware import security
+except Exception:
+    from middleware.rate_limit_storage import MemoryStorage, SQLiteStorage, RedisStorage, storage_from_url
+    from middleware import security
+
+
+class FakeRedis:
+    """Minimal stand-in for the Redis commands RedisStorage uses."""
+
+    def __init__(self):
+        self.data = {}
+
+    def pipeline(self):
+        return _FakePipeline(self)
+
+    def incr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) + 1
+        return self.data[key]
+
+    def decr(self, key):
+        self.data[key] = int(self.data.get(key, 0)) - 1
+        return self.data[key]
+
+    def expire(self, key, seconds):
+        return True
+
+    def get(self, key):
+        return self.data.get(key)
+
+
+class _FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.ops = []
+
+    def __getattr__(self, name):
+        def queue(*args):
+            self.ops.append((name, args))
+        return queue
+
+    def execute(self):
+        return [getattr(self.client, name)(*args) for name, args in self.ops]
+
+
+class StorageContract:
+    def make_storage(self):
+        raise NotImplementedError
+
+    def test_limits_within_window(self):
+        storage = self.make_storage()
+        now = 1000 * 60.0
+        results = [storage.hit('client', 3, 60, now=now + i) for i in range(4)]
+        self.assertEqual([r.allowed for r in results], [True, True, True, False])
+        self.assertEqual(results[0].remaining, 2)
+        self.assertGreater(results[3].retry_after, 0)
+
+    def test_previous_window_decays(self):
+        storage = self.make_storage()
+        start = 1000 * 60.0
+        for i in range(3):
+            storage.hit('client', 3, 60, now=start + i)
+        # halfway into the next window the previous 3 hits weigh 1.5
+        self.assertTrue(storage.hit('client', 3, 60, now=start + 90).allowed)
+        self.assertFalse(storage.hit('client', 3, 60, now=start + 90).allowed)
+        # two windows later everything has expired
+        self.assertTrue(storage.hit('client', 3, 60, now=start + 200).allowed)
+
+    def test_keys_are_independent(self):
+        storage = self.make_storage()
+        self.assertTrue(storage.hit('a', 1, 60, now=60.0).allowed)
+        self.assertTrue(storage.hit('b', 1, 60, now=60.0).allowed)
+        self.assertFalse(storage.hit('a', 1, 60, now=61.0).allowed)
+
+
+class TestMemoryStorage(StorageContract, unittest.TestCase):
+    def make_storage(self):
+        return MemoryStorage()
+
+    def test_idle_keys_are_evicted(self):
+        storage = MemoryStorage(sweep_interval=10)
+        storage.hit('a', 5, 60, now=0.0)
+        storage.hit('b', 5, 60, now=200.0)
+        storage._next_sweep = 0
+        storage.hit('b', 5, 60, now=201.0)
+        self.assertEqual(len(storage), 1)
+
+
+class TestSQLiteStorage(StorageContract, unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'ratelimit.db')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_storage(self):
+        return SQLiteStorage(self.path)
+
+    def test_shared_between_instances(self):
+        first = storage_from_url(f'sqlite:///{self.path}')
+        second = storage_from_url(f'sqlite:///{self.path}')
+        self.assertTrue(first.hit('c', 1, 60, now=60.0).allowed)
+        self.assertFalse(second.hit('c', 1, 60, now=61.0).allowed)
+
+
+class TestRedisStorage(StorageContract, unittest.TestCase):
+    def make_storage(self):
+        return RedisStorage(FakeRedis())
+
+
+class TestRateLimitDecorator(unittest.TestCase):
+    def setUp(self):
+        security.set_rate_limit_storage(MemoryStorage())
+        app = Flask(__name__)
+
+        @app.route('/cheap')
+        @security.rate_limit(max_requests=3, window_seconds=3600)
+        def cheap():
+            return jsonify({'ok': True})
+
+        @app.route('/expensive')
+        @security.rate_limit(max_requests=1, window_seconds=3600)
+        def expensive():
+            return jsonify({'ok': True}), 201
+
+        self.client = app.test_client()
+
+    def tearDown(self):
+        security.set_rate_limit_storage(None)
+
+    def test_routes_have_separate_buckets(self):
+        for _ in range(3):
+            self.assertEqual(self.client.get('/cheap').status_code, 200)
+        self.assertEqual(self.client.get('/cheap').status_code, 429)
+        self.assertEqual(self.client.get('/expensive').status_code, 201)
+
+    def test_headers(self):
+        resp = self.client.get('/expensive')
+        self.assertEqual(resp.headers['X-RateLimit-Limit'], '1')
+        self.assertEqual(resp.headers['X-RateLimit-Remaining'], '0')
+        self.assertIn('X-RateLimit-Reset', resp.headers)
+        self.assertNotIn('Retry-After', resp.headers)
+        blocked = self.client.get('/expensive')
+        self.assertEqual(blocked.status_code, 429)
+        self.assertGreater(int(blocked.headers['Retry-After']), 0)
+
+    def test_clients_are_separate(self):
+        self.client.get('/expensive')
+        resp = self.client.get('/expensive', headers={'X-Forwarded-For': '10.0.0.2'})
+        self.assertEqual(resp.status_code, 201)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+try:
+    from games.libraries.result_cache import ResultCache
+except Exception:
+    from libraries.result_cache import ResultCache
+
+
+class TestResultCache(unittest.TestCase):
+    def test_memoizes_normalized_payload(self):
+        cache = ResultCache(max_entries=8)
+        calls = []
+
+        @cache.cached('test', 'model-1')
+        def work(text):
+            calls.append(text)
+            return {'status': 200, 'data': text.upper()}
+
+        self.assertEqual(work('caf\u00e9'), work('cafe\u0301'))
+        self.assertEqual(calls, ['caf\u00e9'])  # called with the normalized payload
+        work('caf\u00e9', use_cache=False)
+        self.assertEqual(len(calls), 2)
+        stats = cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['bypassed'], 1)
+
+    def test_surrounding_whitespace_is_part_of_the_key(self):
+        cache = ResultCache(max_entries=8)
+
+        @cache.cached('test', 'model-1')
+        def work(text):
+            return {'status': 200, 'data': [text]}
+
+        self.assertEqual(work(' Budi ')['data'], [' Budi '])
+        self.assertEqual(work('Budi')['data'], ['Budi'])
+
+    def test_hits_are_copies(self):
+        cache = ResultCache(max_entries=8)
+
+        @cache.cached('test', 'model-1')
+        def work(text):
+            return {'status': 200, 'data': {'entities': [text]}}
+
+        work('hello')['data']['entities'].append('first caller')
+        hit = work('hello')
+        hit['data']['entities'].append('second caller')
+        self.assertEqual(work('hello')['data']['entities'], ['hello'])
+
+    def test_lru_eviction(self):
+        cache = ResultCache(max_entries=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+
+    def test_disk_tier_shared_between_instances(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'cache.sqlite')
+            first = ResultCache(disk_path=path)
+            first.put('k', {'v': 1})
+            second = ResultCache(disk_path=path)
+            self.assertEqual(second.get('k'), {'v': 1})
+            self.assertEqual(second.stats()['disk_hits'], 1)
+
+    def test_disk_hit_keeps_stored_expiry(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'cache.sqlite')
+            with mock.patch('time.time', return_value=1000.0):
+                ResultCache(ttl_seconds=60, disk_path=path).put('k', 'v')
+            reader = ResultCache(ttl_seconds=60, disk_path=path)
+            with mock.patch('time.time', return_value=1050.0):
+                self.assertEqual(reader.get('k'), 'v')   # promoted from disk
+            with mock.patch('time.time', return_value=1061.0):
+                self.assertIsNone(reader.get('k'))   # expired at 1060, not 1110
+            self.assertEqual(reader.stats()['misses'], 1)
+
+    def test_ttl_expiry(self):
+        cache = ResultCache(ttl_seconds=-1)
+        cache.put('k', 1)
+        self.assertIsNone(cache.get('k'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import importlib.util
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+# the training script imports tensorflow at module level, helpers included
+_HAVE_TF = importlib.util.find_spec('tensorflow') is not None
+
+if _HAVE_TF:
+    try:
+        from games.scripts import train_translator as tt
+    except Exception:
+        from scripts import train_translator as tt
+
+PAIRS = [('aku', 'ꦲꦏꦸ'), ('cinta', 'ꦕꦶꦤ꧀ꦠ'), ('kamu', 'ꦏꦩꦸ'), ('rumah', 'ꦫꦸꦩꦃ'), ('ab', 'ꦲꦧ')]
+
+
+def pair_list(shard=0, shards=1):
+    return iter(PAIRS)
+
+
+@unittest.skipUnless(_HAVE_TF, 'tensorflow not installed')
+class PairHelpersTest(unittest.TestCase):
+    def test_synthetic_words_are_seeded(self):
+        words = list(tt.synthetic_words(200, seed=3))
+        self.assertEqual(len(words), 200)
+        self.assertEqual(words, list(tt.synthetic_words(200, seed=3)))
+        self.assertNotEqual(words, list(tt.synthetic_words(200, seed=4)))
+        self.assertTrue(all(w and w.isalpha() and w.islower() for w in words))
+
+    def test_sharded_splits_items_once(self):
+        converted = []
+
+        def convert(item):
+            converted.append(item)
+            return item * 10
+
+        source = tt._sharded(lambda: iter(range(10)), convert)
+        shards = [list(source(i, 3)) for i in range(3)]
+        self.assertEqual(shards, [[0, 30, 60, 90], [10, 40, 70], [20, 50, 80]])
+        # each item is converted only by the shard that owns it
+        self.assertEqual(sorted(converted), list(range(10)))
+        self.assertEqual(list(tt._sharded(lambda: iter('abc'))()), ['a', 'b', 'c'])
+
+    def test_iter_words(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'words.txt')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write('Aku cinta, KAMU!\n2024 rumah_besar\n')
+            self.assertEqual(list(tt.iter_words(path)), ['aku', 'cinta', 'kamu', 'rumah', 'besar'])
+
+    def test_scan_pairs(self):
+        toks = tt.scan_pairs(pair_list)
+        self.assertEqual(toks['count'], len(PAIRS))
+        self.assertEqual(toks['max_in'], len('cinta') + 1)
+        self.assertEqual(toks['max_out'], max(len(t) for _, t in PAIRS) + 2)
+        self.assertEqual(set(toks['inp_stoi']) - {'<s>', '</s>'}, set('akucintamurhb'))
+        self.assertNotIn(0, toks['out_stoi'].values())  # 0 is padding
+        for stoi, itos in ((toks['inp_stoi'], toks['inp_itos']), (toks['out_stoi'], toks['out_itos'])):
+            self.assertEqual({i: c for c, i in stoi.items()}, itos)
+
+    def test_scan_pairs_rejects_empty_source(self):
+        with self.assertRaises(SystemExit):
+            tt.scan_pairs(lambda shard=0, shards=1: iter(()))
+
+    def test_is_chief(self):
+        cases = [
+            (None, True),
+            ({'cluster': {'worker': ['a:1', 'b:1']}, 'task': {'type': 'worker', 'index': 0}}, True),
+            ({'cluster': {'worker': ['a:1', 'b:1']}, 'task': {'type': 'worker', 'index': 1}}, False),
+            ({'cluster': {'chief': ['c:1'], 'worker': ['a:1']}, 'task': {'type': 'chief', 'index': 0}}, True),
+            ({'cluster': {'chief': ['c:1'], 'worker': ['a:1']}, 'task': {'type': 'worker', 'index': 0}}, False),
+            ({'cluster': {'worker': ['a:1'], 'ps': ['p:1']}, 'task': {'type': 'ps', 'index': 0}}, False),
+        ]
+        for config, expected in cases:
+            env = {'TF_CONFIG': json.dumps(config)} if config else {}
+            with mock.patch.dict(os.environ, env, clear=True):
+                self.assertEqual(tt.is_chief(), expected, config)
+
+
+@unittest.skipUnless(_HAVE_TF, 'tensorflow not installed')
+class BucketedDatasetTest(unittest.TestCase):
+    def test_batches_are_padded_per_bucket(self):
+        words = ['ab'] * 40 + ['abcdefghijklmn'] * 40
+        pairs = tt._sharded(lambda: iter(words), lambda w: (w, w.upper()))
+        toks = tt.scan_pairs(pairs)
+        ds = tt.make_dataset(pairs, toks, batch_size=8, shards=2, shuffle_buffer=16)
+        seen = 0
+        for (enc, dec_in), dec_out in ds:
+            self.assertEqual(enc.shape[0], dec_in.shape[0])
+            self.assertEqual(dec_in.shape, dec_out.shape)
+            # a short word and a long one never share a batch
+            self.assertIn(dec_in.shape[1], (len('ab') + 1, len('abcdefghijklmn') + 1))
+            self.assertTrue((dec_in[:, 0] == toks['out_stoi']['<s>']).numpy().all())
+            seen += int(enc.shape[0])
+        self.assertEqual(seen, len(words))
+
+    def test_dataset_feeds_the_model(self):
+        pairs = tt._sharded(pair_list)
+        toks = tt.scan_pairs(pairs)
+        model = tt.make_model(len(toks['inp_stoi']), len(toks['out_stoi']), embed=8, latent=16)
+        ds = tt.make_dataset(pairs, toks, batch_size=2, shards=1)
+        (enc, dec_in), dec_out = next(iter(ds))
+        out = model((enc, dec_in))
+        self.assertEqual(tuple(out.shape), (dec_in.shape[0], dec_in.shape[1], len(toks['out_stoi']) + 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
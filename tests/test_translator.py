@@ -28,5 +28,49 @@ class TestTranslator(unittest.TestCase):
             self.assertIsInstance(out, str)
 
 
+class _FakeEntryPoint:
+    def __init__(self, name, obj):
+        self.name = name
+        self.obj = obj
+
+    def load(self):
+        return self.obj
+
+
+class TestScriptRegistry(unittest.TestCase):
+    def setUp(self):
+        self._orig_entry_points = translator._entry_points
+
+    def tearDown(self):
+        translator._entry_points = self._orig_entry_points
+        for name in ('shout', 'broken'):
+            translator._REGISTRY.pop(name, None)
+
+    def test_builtins_listed(self):
+        names = translator.available_scripts()
+        for name in ('bali', 'jawa', 'sunda', 'morse', 'batak'):
+            self.assertIn(name, names)
+        info = {s['name']: s for s in translator.script_info()}
+        self.assertTrue(info['jawa']['reversible'])
+        self.assertFalse(info['batak']['reversible'])
+
+    def test_converter_is_resolved_once(self):
+        self.assertIs(translator.get_converter('jawa'), translator.get_converter('JAWA'))
+        self.assertIsNone(translator.get_converter('klingon'))
+
+    def test_plugin_discovery(self):
+        def boom():
+            raise ImportError('missing dependency')
+        broken = _FakeEntryPoint('broken', None)
+        broken.load = boom
+        translator._entry_points = lambda: [
+            _FakeEntryPoint('shout', str.upper), broken, _FakeEntryPoint('jawa', str.upper)]
+        translator.load_scripts()
+        self.assertEqual(translator.translate_to_script('shout', 'rumah'), 'RUMAH')
+        self.assertNotIn('broken', translator.available_scripts())
+        # plugins never shadow built-in scripts
+        self.assertEqual(translator.get_converter('jawa').source, 'builtin')
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,75 @@
+import io
+import json
+import tempfile
+import unittest
+from unittest import mock
+
+try:
+    from games.ai import create_app
+    from games.middleware import security
+    from games.middleware.rate_limit_storage import MemoryStorage
+except Exception:
+    from ai import create_app
+    from middleware import security
+    from middleware.rate_limit_storage import MemoryStorage
+
+
+def _records(resp):
+    return [json.loads(line) for line in resp.get_data(as_text=True).splitlines() if line]
+
+
+class TestTranslatorBatch(unittest.TestCase):
+    def setUp(self):
+        security.set_rate_limit_storage(MemoryStorage())
+        self.client = create_app().test_client()
+
+    def tearDown(self):
+        security.set_rate_limit_storage(None)
+
+    def test_json_array(self):
+        resp = self.client.post('/translator/batch', json={'target': 'jawa', 'texts': ['rumah', 5, 'x' * 6000]})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.mimetype, 'application/x-ndjson')
+        records = _records(resp)
+        self.assertEqual([r['index'] for r in records], [0, 1, 2])
+        self.assertEqual(records[0]['input'], 'rumah')
+        self.assertTrue(records[0]['output'])
+        self.assertIn('error', records[1])
+        self.assertIn('error', records[2])
+
+    def test_csv_upload(self):
+        data = {'target': 'sunda', 'file': (io.BytesIO(b'id,text\n1,rumah\n2,batu\n'), 'texts.csv')}
+        resp = self.client.post('/translator/batch', data=data, content_type='multipart/form-data')
+        self.assertEqual([r['input'] for r in _records(resp)], ['rumah', 'batu'])
+
+    def test_ndjson_upload(self):
+        data = {'target': 'bali', 'file': (io.BytesIO(b'"rumah"\n\n{"text": "api"}\n'), 'texts.ndjson')}
+        resp = self.client.post('/translator/batch', data=data, content_type='multipart/form-data')
+        self.assertEqual([r['input'] for r in _records(resp)], ['rumah', 'api'])
+
+    def test_invalid_requests(self):
+        self.assertEqual(self.client.post('/translator/batch', json={'target': '../x', 'texts': []}).status_code, 400)
+        self.assertEqual(self.client.post('/translator/batch', json={'target': 'jawa', 'texts': 'rumah'}).status_code, 400)
+
+    def test_invalid_target_upload_is_not_spooled(self):
+        data = {'target': '../x', 'file': (io.BytesIO(b'rumah\n'), 'texts.txt')}
+        with mock.patch.object(tempfile, 'SpooledTemporaryFile') as spool:
+            resp = self.client.post('/translator/batch', data=data, content_type='multipart/form-data')
+        self.assertEqual(resp.status_code, 400)
+        spool.assert_not_called()
+
+
+    def test_scripts(self):
+        names = [s['name'] for s in self.client.get('/translator/scripts').get_json()['data']]
+        self.assertIn('jawa', names)
+
+    def test_reverse(self):
+        resp = self.client.post('/translator/reverse', json={'script': 'jawa', 'texts': ['ꦄꦏꦸ ꦕꦶꦤ꧀ꦠ', 'ꦏꦩꦸ']})
+        self.assertEqual([r['output'] for r in resp.get_json()['data']], ['aku cinta', 'kamu'])
+        resp = self.client.post('/translator/reverse', json={'script': 'sunda', 'text': 'ᮛᮥᮙᮠ᮪'})
+        self.assertEqual(resp.get_json()['output'], 'rumah')
+        self.assertEqual(self.client.post('/translator/reverse', json={'script': 'sunda'}).status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import importlib.util
+import unittest
+
+_HAVE_TF = importlib.util.find_spec('tensorflow') is not None
+
+if _HAVE_TF:
+    import numpy as np
+    import tensorflow as tf
+    try:
+        from games.scripts.infer_translator import Seq2SeqDecoder
+        from games.scripts.train_translator import make_model, scan_pairs
+    except Exception:
+        from scripts.infer_translator import Seq2SeqDecoder
+        from scripts.train_translator import make_model, scan_pairs
+
+PAIRS = [('aku', 'ꦲꦏꦸ'), ('cinta', 'ꦕꦶꦤ꧀ꦠ'), ('kamu', 'ꦏꦩꦸ'), ('rumah', 'ꦫꦸꦩꦃ')]
+TEXTS = ['aku', 'kamu', 'cinta', 'rumah', 'a', 'xyz']
+
+
+@unittest.skipUnless(_HAVE_TF, 'tensorflow not installed')
+class Seq2SeqDecoderTest(unittest.TestCase):
+    def setUp(self):
+        tf.random.set_seed(0)
+        self.toks = scan_pairs(lambda shard=0, shards=1: iter(PAIRS))
+        # untrained, randomly initialised weights: only the decoding mechanics are under test
+        model = make_model(len(self.toks['inp_stoi']), len(self.toks['out_stoi']), embed=8, latent=16)
+        self.decoder = Seq2SeqDecoder(model, self.toks)
+
+    def count_steps(self):
+        calls = []
+        step = self.decoder.step
+
+        def counting(tokens, h, c):
+            calls.append(len(tokens))
+            return step(tokens, h, c)
+
+        self.decoder.step = counting
+        return calls
+
+    def force_end_token(self):
+        bias = np.zeros(self.decoder.dense.bias.shape, dtype='float32')
+        bias[self.decoder.end_id] = 100.0
+        self.decoder.dense.bias.assign(bias)
+
+    def test_beam_width_one_matches_greedy(self):
+        self.assertEqual(self.decoder.beam(TEXTS, beam_width=1), self.decoder.greedy(TEXTS))
+        self.assertEqual(self.decoder.decode(TEXTS, beam_width=1), self.decoder.greedy(TEXTS))
+
+    def test_outputs_use_the_target_vocabulary(self):
+        chars = set(''.join(t for _, t in PAIRS))
+        for out in self.decoder.decode(TEXTS, beam_width=3):
+            self.assertLessEqual(len(out), self.toks['max_out'])
+            self.assertTrue(set(out) <= chars, out)
+
+    def test_batching_does_not_change_results(self):
+        single = [self.decoder.greedy([t])[0] for t in TEXTS]
+        self.assertEqual(self.decoder.decode(TEXTS, batch_size=4), single)
+
+    def test_greedy_stops_at_end_token(self):
+        self.force_end_token()
+        calls = self.count_steps()
+        self.assertEqual(self.decoder.greedy(TEXTS), [''] * len(TEXTS))
+        self.assertEqual(calls, [len(TEXTS)])
+
+    def test_beam_stops_at_end_token(self):
+        self.force_end_token()
+        calls = self.count_steps()
+        self.assertEqual(self.decoder.beam(TEXTS, beam_width=3), [''] * len(TEXTS))
+        self.assertEqual(calls, [len(TEXTS) * 3])
+
+    def test_text_is_cut_at_end_token(self):
+        stoi = self.toks['out_stoi']
+        ids = [stoi['ꦲ'], stoi['ꦏ'], self.decoder.end_id, stoi['ꦸ']]
+        self.assertEqual(self.decoder._to_text(ids), 'ꦲꦏ')
+
+
+if __name__ == '__main__':
+    unittest.main()
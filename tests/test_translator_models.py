@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+
+try:
+    from games.libraries import translator_models
+except Exception:
+    from libraries import translator_models
+
+
+class TestTranslatorModelCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.loads = []
+        self._orig_dir = translator_models.MODELS_DIR
+        self._orig_loader = translator_models._load_resources
+        translator_models.MODELS_DIR = self.tmp.name
+        translator_models._load_resources = lambda m, t: (self.loads.append(m) or ('model:' + os.path.basename(m), {}))
+        translator_models.clear()
+
+    def tearDown(self):
+        translator_models.MODELS_DIR = self._orig_dir
+        translator_models._load_resources = self._orig_loader
+        translator_models.clear()
+        self.tmp.cleanup()
+
+    def _touch(self, name, mtime=None):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, 'w') as f:
+            f.write('x')
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+
+    def test_no_model(self):
+        self.assertIsNone(translator_models.get_resources('jawa'))
+
+    def test_loads_once_and_shares_default(self):
+        self._touch('translator.h5')
+        self._touch('tokenizers.vocab')
+        translator_models.get_resources('jawa')
+        translator_models.get_resources('sunda')
+        self.assertEqual(len(self.loads), 1)
+
+    def test_per_target_models(self):
+        for name in ('translator.h5', 'tokenizers.vocab', 'translator_bali.h5', 'tokenizers_bali.vocab'):
+            self._touch(name)
+        self.assertEqual(translator_models.get_resources('bali')[0], 'model:translator_bali.h5')
+        self.assertEqual(translator_models.get_resources('jawa')[0], 'model:translator.h5')
+        self.assertEqual(translator_models.get_resources('../bali')[0], 'model:translator.h5')
+
+    def test_prefers_vocab_over_legacy_pickle(self):
+        self._touch('translator.h5')
+        self._touch('tokenizers.pkl')
+        self.assertTrue(translator_models.model_paths('jawa')[1].endswith('tokenizers.pkl'))
+        self._touch('tokenizers.vocab')
+        self.assertTrue(translator_models.model_paths('jawa')[1].endswith('tokenizers.vocab'))
+
+    def test_hot_reload_on_change(self):
+        self._touch('translator.h5', mtime=1000)
+        self._touch('tokenizers.vocab', mtime=1000)
+        translator_models.get_resources('jawa')
+        self._touch('translator.h5', mtime=2000)
+        translator_models.get_resources('jawa')
+        self.assertEqual(len(self.loads), 2)
+        self.assertEqual(translator_models.cache_stats()['translator.h5']['reloads'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+
+try:
+    from games.libraries.translator_vocab import VocabError, load_vocab, save_vocab
+except Exception:
+    from libraries.translator_vocab import VocabError, load_vocab, save_vocab
+
+
+def _toks():
+    inp = {c: i + 1 for i, c in enumerate('adhiꦏ')}
+    inp.update({'<s>': 6, '</s>': 7})
+    out = {c: i + 1 for i, c in enumerate('ꦲꦢꦶ')}
+    out.update({'<s>': 4, '</s>': 5})
+    return {'inp_stoi': inp, 'inp_itos': {i: c for c, i in inp.items()},
+            'out_stoi': out, 'out_itos': {i: c for c, i in out.items()}, 'max_in': 6, 'max_out': 7}
+
+
+class Embedding:
+    def __init__(self, input_dim):
+        self.input_dim = input_dim
+
+
+class Dense:
+    def __init__(self, units):
+        self.units = units
+
+
+class TimeDistributed:
+    def __init__(self, layer):
+        self.layer = layer
+
+
+class _Model:
+    """Just the layer attributes check_model looks at."""
+
+    def __init__(self, inp_dim, out_dim, units):
+        self.layers = [Embedding(inp_dim), Embedding(out_dim), TimeDistributed(Dense(units))]
+
+
+class TestVocabFile(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'tokenizers.vocab')
+        self.model_path = os.path.join(self.tmp.name, 'translator.h5')
+        with open(self.model_path, 'wb') as f:
+            f.write(b'weights')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        toks = _toks()
+        save_vocab(self.path, toks, self.model_path)
+        loaded = load_vocab(self.path, self.model_path)
+        for key in toks:
+            self.assertEqual(loaded[key], toks[key])
+        self.assertEqual(loaded.inp.encode('hadiz').tolist(), [3, 1, 2, 4, 0])
+        self.assertEqual(loaded.out.decode([4, 1, 2, 3, 5, 0]), 'ꦲꦢꦶ')
+
+    def test_rejects_other_files(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'\x80\x04not a vocab file')
+        with self.assertRaises(VocabError):
+            load_vocab(self.path)
+
+    def test_rejects_different_model(self):
+        save_vocab(self.path, _toks(), self.model_path)
+        with open(self.model_path, 'wb') as f:
+            f.write(b'retrained weights')
+        with self.assertRaises(VocabError):
+            load_vocab(self.path, self.model_path)
+
+    def test_check_model(self):
+        save_vocab(self.path, _toks(), None)
+        vocab = load_vocab(self.path)
+        vocab.check_model(_Model(8, 6, 6))
+        with self.assertRaises(VocabError):
+            vocab.check_model(_Model(8, 9, 9))
+
+
+if __name__ == '__main__':
+    unittest.main()
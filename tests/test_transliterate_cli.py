@@ -0,0 +1,36 @@
+import io
+import unittest
+
+try:
+    from games.scripts.transliterate import transliterate_stream
+except Exception:
+    from scripts.transliterate import transliterate_stream
+
+
+class TestTransliterateStream(unittest.TestCase):
+    TEXT = ''.join(f'aku cinta kamu {i}\n' for i in range(50))
+
+    def run_stream(self, text, **kwargs):
+        dst = io.StringIO()
+        n = transliterate_stream('jawa', io.StringIO(text), dst, **kwargs)
+        return n, dst.getvalue()
+
+    def test_in_process(self):
+        n, out = self.run_stream(self.TEXT, workers=1, chunk_lines=7)
+        self.assertEqual(n, 50)
+        self.assertEqual(out.splitlines()[3], 'ꦄꦏꦸ ꦕꦶꦤ꧀ꦠ ꦏꦩꦸ 3')
+
+    def test_pool_preserves_order(self):
+        _, expected = self.run_stream(self.TEXT, workers=1)
+        _, out = self.run_stream(self.TEXT, workers=2, chunk_lines=3)
+        self.assertEqual(out, expected)
+
+    def test_reverse(self):
+        _, script = self.run_stream('aku cinta\n', workers=1)
+        dst = io.StringIO()
+        transliterate_stream('jawa', io.StringIO(script), dst, reverse=True, workers=1)
+        self.assertEqual(dst.getvalue(), 'aku cinta\n')
+
+
+if __name__ == '__main__':
+    unittest.main()